@@ -0,0 +1,446 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+import filter_index
+import ingest
+import partitions
+import rate_stats
+import regional_index
+import vehicle_dim
+
+# ===== 대시보드 지표 계산 (Streamlit 없이 사용 가능) =====
+# project.py 가 보여주는 모든 수치를 계산하는 함수들과, 야간 배치용 명령행 진입점.
+# 사용법: python analysis.py --out 출력폴더 [--format json|parquet] [--partition-by 시도 연도]
+#                           [--years 2022 2023] [--subcause 담배꽁초 ...] [--status 주차 ...]
+#                           [--partitions 파티션폴더]
+
+# Tab3 해외 비교의 한국 전기차 1만대당 화재 기본값 (연도별 표가 없을 때만 쓴다)
+KOREA_EV_FIRE_PER_10K = {2021: 1.04, 2022: 1.1, 2023: 1.32}
+
+
+# ==============================
+# 데이터 읽기
+# ==============================
+def load_frames(data_dir=".", extra_total_columns=()):
+    # 파티션 폴더(EV_PARTITION_DIR)가 있으면 data_dir 에 합친 CSV 를 먼저 맞춘다.
+    partitions.sync(data_dir)
+    path = lambda name: os.path.join(data_dir, name)
+    total_columns = list(dict.fromkeys([*data_loader.VEHICLE_COLUMNS, *extra_total_columns]))
+    return {
+        "fire_total": data_loader.load_vehicle_fires(path(data_loader.fire_total), columns=total_columns),
+        "fire_EV": data_loader.load_csv(path(data_loader.fire_EV)),
+        "car_info": data_loader.load_csv(path(data_loader.car_info)),
+        "car_maker": data_loader.load_csv(path(data_loader.car_maker)),
+        "foreign_fire": data_loader.load_csv(path(data_loader.foreign_fire)),
+        "manufac_fire": data_loader.load_csv(path(data_loader.manufac_fire)),
+        # 선택 파일
+        "region_registrations": (data_loader.load_csv(path(data_loader.region_registrations))
+                                 if os.path.exists(path(data_loader.region_registrations)) else None),
+    }
+
+
+def load_quality_reports(data_dir="."):
+    # 있는 입력 파일마다 품질 검사 요약 (data_loader.load_quality_report)
+    paths = [os.path.join(data_dir, name) for name in [*data_loader.DATA_FILES, data_loader.region_registrations]]
+    return {os.path.basename(path): data_loader.load_quality_report(path) for path in paths if os.path.exists(path)}
+
+
+# ==============================
+# Tab1: 화재/등록 KPI, 1만대당 화재
+# ==============================
+def fire_summary(counts, df_car_info):
+    # counts: ingest 큐브의 (연도, 차종, 전기차) 화재건수
+    total_fire_count = int(counts.loc[~counts["전기차"], "화재건수"].sum())
+    ev_fire_count = int(counts.loc[counts["전기차"], "화재건수"].sum())
+    yearly = yearly_rates(ingest.yearly_table(counts, df_car_info))
+    return {
+        "total_fire_count": total_fire_count,
+        "ev_fire_count": ev_fire_count,
+        "ev_fire_ratio": round(ev_fire_count / total_fire_count * 100, 2) if total_fire_count else None,
+        "yearly": yearly,
+        "trend": rate_trends(yearly),
+    }
+
+
+def with_interval(table, col, counts, exposure, per):
+    # table[col] (per 대당 화재) 옆에 95% 신뢰구간 <col>_하한 / <col>_상한 을 붙인다.
+    _, lower, upper = rate_stats.rate_ci(counts, exposure, per)
+    table[f"{col}_하한"] = lower.round(2)
+    table[f"{col}_상한"] = upper.round(2)
+    return table
+
+
+def with_ratio(table, col, ratio):
+    # rate_stats.rate_ratio 결과 (비, 하한, 상한, p) 를 <col>, <col>_하한, <col>_상한, <col>_p 로 붙인다.
+    value, lower, upper, pvalue = ratio
+    table[col] = value.round(3)
+    table[f"{col}_하한"] = lower.round(3)
+    table[f"{col}_상한"] = upper.round(3)
+    table[f"{col}_p"] = pvalue.round(4)
+    return table
+
+
+def yearly_rates(df_yearly):
+    # 1만대당 화재의 신뢰구간, 연도별 전기차/내연기관 화재율 비, 바로 앞 연도 대비 화재율 비
+    table = df_yearly.copy()
+    groups = [("EV", "EV", "전기차등록대수"), ("내연기관", "비EV", "내연기관등록대수")]
+    for label, fires, registered in groups:
+        with_interval(table, f"{label}_1만대당", table[fires], table[registered], 10000)
+    with_ratio(table, "화재율비(EV/내연기관)", rate_stats.rate_ratio(
+        table["EV"], table["전기차등록대수"], table["비EV"], table["내연기관등록대수"]))
+    for label, fires, registered in groups:
+        yoy = rate_stats.year_over_year(table[fires], table[registered])
+        with_ratio(table, f"{label}_전년대비", tuple(np.concatenate([[np.nan], values])[:len(table)] for values in yoy))
+    return table
+
+
+def rate_trends(df_yearly):
+    # 전기차/내연기관 1만대당 화재의 연간 변화율 (두 그룹을 한 번에 계산)
+    result = rate_stats.trend_test(
+        df_yearly[["EV", "비EV"]].to_numpy(dtype=float),
+        df_yearly[["전기차등록대수", "내연기관등록대수"]].to_numpy(dtype=float),
+        df_yearly.index.to_numpy(),
+    )
+    return trend_table(["전기차", "내연기관"], result)
+
+
+def trend_table(groups, result):
+    return pd.DataFrame({
+        "구분": groups,
+        "연간변화율(%)": (result["annual_change"] * 100).round(1),
+        "하한(%)": (result["lower"] * 100).round(1),
+        "상한(%)": (result["upper"] * 100).round(1),
+        "p값": result["p"].round(4),
+    })
+
+
+def registration_summary(df_car_info):
+    df_car_info = df_car_info.copy()
+    df_car_info["전기차비율(%)"] = (df_car_info["전기차등록대수"] / df_car_info["전체차량등록대수"] * 100).round(2)
+    df_car_info["비EV등록대수"] = df_car_info["전체차량등록대수"] - df_car_info["전기차등록대수"]
+
+    latest_year = df_car_info["연도"].max()
+    latest_data = df_car_info[df_car_info["연도"] == latest_year].iloc[0]
+    return {
+        "latest_year": int(latest_year),
+        "total_registered": int(latest_data["전체차량등록대수"]),
+        "ev_registered": int(latest_data["전기차등록대수"]),
+        "ev_registered_ratio": float(latest_data["전기차비율(%)"]),
+        "registrations": df_car_info,
+    }
+
+
+# ==============================
+# Tab2: 필터 적용 발화요인/차량상태
+# ==============================
+def filtered_breakdown(index, year_filter, subcause_filter=(), status_filter=()):
+    return with_filter_ratio(filter_index.tab2_summary(index, year_filter, subcause_filter, status_filter))
+
+
+def with_filter_ratio(result):
+    total = result["total_count"]
+    return {**result, "filter_ratio": round(result["filtered_count"] / total * 100, 2) if total else None}
+
+
+# ==============================
+# Tab3: 제조사/최초발화점/해외 비교
+# ==============================
+def maker_summary(index):
+    # index: vehicle_dim.VehicleIndex. 제조사는 별칭을 모은 대표 이름, 건수는 정수 키/코드 배열의 bincount
+    total_counts = index.n_rows
+    battery_not_collision = index.is_value("최초발화점", ["고전압배터리"]) & ~index.is_value("상황", ["주행중(충돌)"])
+    filter_count = int(battery_not_collision.sum())
+    makers = index.maker_table()
+    # 차종별 화재를 점유율 표의 판매대수로 나눈 제조사별 10만대당 화재 (판매 자료가 있는 제조사만)
+    with_interval(makers, "화재_10만대당", makers["화재건수"].where(makers["누적판매"].notna()), makers["누적판매"],
+                  100000)
+    manufacturer_counts = makers.set_index("제조사")["화재건수"].rename("count")
+    return {
+        "total_count": total_counts,
+        "battery_not_collision_count": filter_count,
+        "battery_not_collision_ratio": round(filter_count / total_counts * 100, 2) if total_counts else None,
+        "manufacturer_counts": manufacturer_counts[manufacturer_counts > 0].sort_values(ascending=False, kind="stable"),
+        "fire_origin_counts": index.counts("최초발화점"),
+        "situation_counts": index.counts("상황"),
+        "maker_origin": index.crosstab("최초발화점"),
+        "maker_situation": index.crosstab("상황"),
+        "makers": makers,
+        "models": index.model_table(),
+    }
+
+
+def manufacturer_rates(df_manufac_fire):
+    # 제조사별 10만대당 화재(전기차/배터리)의 신뢰구간과, 나머지 제조사 합계 대비 화재율 비
+    table = df_manufac_fire.copy()
+    sales = table["누적판매"]
+    with_interval(table, "전기차10만대당", table["전기차화재"], sales, 100000)
+    with_interval(table, "배터리10만대당", table["배터리발화화재"], sales, 100000)
+    fires = table["전기차화재"]
+    return with_ratio(table, "화재율비(타사 대비)", rate_stats.rate_ratio(
+        fires, sales, fires.sum() - fires, sales.sum() - sales))
+
+
+def foreign_comparison(df_foreign_fire, korea=KOREA_EV_FIRE_PER_10K, df_yearly=None):
+    # df_yearly (Tab1 연도별 표) 를 주면 한국 값을 그 화재건수/등록대수로 다시 계산하고 (점과 구간이 같은 수에서 나오도록)
+    # 신뢰구간과 국가별 한국 대비 화재율 비를 붙인다. 없으면 korea 기본값만 표시한다.
+    # 해외 자료는 전기차화재/전기차등록수가 있는 (0 이 아닌) 행만 구간을 계산한다.
+    df_selected = df_foreign_fire.dropna(subset=["전기차(만대당)"])[["연도", "국가", "전기차(만대당)"]]
+    if df_yearly is None:
+        df_korea = pd.DataFrame({"연도": list(korea), "국가": "한국", "전기차(만대당)": list(korea.values())})
+    else:
+        yearly = df_yearly[df_yearly["EV"].notna() & (df_yearly["전기차등록대수"] > 0)]
+        df_korea = pd.DataFrame({"연도": yearly.index.astype(int), "국가": "한국",
+                                 "전기차화재": yearly["EV"].to_numpy(), "전기차등록수": yearly["전기차등록대수"].to_numpy()})
+        df_korea["전기차(만대당)"] = (df_korea["전기차화재"] / df_korea["전기차등록수"] * 10000).round(2)
+    df_selected = pd.concat([df_selected.astype({"국가": object}), df_korea[["연도", "국가", "전기차(만대당)"]]],
+                            ignore_index=True)
+    df_selected["연도"] = df_selected["연도"].astype(int)
+    df_selected = df_selected.sort_values(by="연도", ascending=True, kind="stable").reset_index(drop=True)
+    if df_yearly is None:
+        return df_selected
+
+    foreign = df_foreign_fire.dropna(subset=["전기차(만대당)"]).astype({"국가": object, "연도": int})
+    counts = pd.concat([foreign[["연도", "국가", "전기차화재", "전기차등록수"]],
+                        df_korea[["연도", "국가", "전기차화재", "전기차등록수"]]]).drop_duplicates(["연도", "국가"])
+    table = df_selected.merge(counts, on=["연도", "국가"], how="left")
+    with_interval(table, "전기차(만대당)", table["전기차화재"], table["전기차등록수"], 10000)
+    korea_counts = table["연도"].map(counts[counts["국가"] == "한국"].set_index("연도")["전기차화재"])
+    korea_registered = table["연도"].map(counts[counts["국가"] == "한국"].set_index("연도")["전기차등록수"])
+    is_korea = (table["국가"] == "한국").to_numpy()
+    ratio = rate_stats.rate_ratio(table["전기차화재"], table["전기차등록수"], korea_counts, korea_registered)
+    return with_ratio(table, "화재율비(한국 대비)", tuple(np.where(is_korea, np.nan, values) for values in ratio))
+
+
+# ==============================
+# 지역별: 전국 → 시도 → 시군구 드릴다운
+# ==============================
+def region_filters(year_filter=None, subcause_filter=(), status_filter=()):
+    # 사이드바 선택을 지역 인덱스 조회 조건으로 바꾼다 (빈 발화요인/차량상태 선택 = 전체).
+    return {"연도": None if year_filter is None else list(year_filter),
+            "차량상태": list(status_filter) or None,
+            "발화요인소분류": list(subcause_filter) or None}
+
+
+def region_registrations(df_region_reg, sido=None, year_filter=None):
+    # 선택 연도 등록대수 합을 한 단계 아래 지역별로 (전국이면 시도별, 시도면 시군구별)
+    reg = df_region_reg
+    if year_filter is not None:
+        reg = reg[reg["연도"].isin(list(year_filter))]
+    if sido is None or sido == regional_index.NATION:
+        return reg.groupby("시도", observed=True)["전기차등록대수"].sum()
+    if "시군구" not in reg.columns:
+        return pd.Series(dtype="int64")
+    reg = reg[reg["시도"] == sido]
+    return reg.groupby("시군구", observed=True)["전기차등록대수"].sum()
+
+
+def region_registrations_by_year(df_region_reg, sido=None):
+    reg = df_region_reg
+    if sido is not None and sido != regional_index.NATION:
+        reg = reg[reg["시도"] == sido]
+    return reg.groupby("연도")["전기차등록대수"].sum()
+
+
+def region_summary(index, sido=None, year_filter=None, subcause_filter=(), status_filter=(), df_region_reg=None):
+    filters = region_filters(year_filter, subcause_filter, status_filter)
+    fire_count = index.count(sido, **filters)
+    nation_count = index.count(**filters)
+    table = index.breakdown(sido, **filters)
+    ev_registered = fire_per_10k = fire_per_10k_ci = None
+    if df_region_reg is not None:
+        registered = region_registrations(df_region_reg, sido, year_filter)
+        table["전기차등록대수"] = table["지역"].map(registered)
+        table["EV_1만대당"] = (table["화재건수"] / table["전기차등록대수"] * 10000).round(2)
+        if sido is None or sido == regional_index.NATION:
+            ev_registered = int(registered.sum())
+        else:
+            ev_registered = int(region_registrations(df_region_reg, None, year_filter).get(sido, 0))
+        if ev_registered:
+            fire_per_10k = round(fire_count / ev_registered * 10000, 2)
+            _, lower, upper = rate_stats.rate_ci(fire_count, ev_registered, 10000)
+            fire_per_10k_ci = (round(float(lower), 2), round(float(upper), 2))
+        # 지역마다 신뢰구간과, 함께 표시되는 나머지 지역 합계 대비 화재율 비 (모든 지역을 한 번에)
+        regional = table["전기차등록대수"]
+        fires = table["화재건수"].where(regional.notna())
+        with_interval(table, "EV_1만대당", fires, regional, 10000)
+        with_ratio(table, "화재율비(나머지 지역 대비)", rate_stats.rate_ratio(
+            fires, regional, fires.sum() - fires, regional.sum() - regional))
+
+    # 연도별 추세: 등록대수 자료가 있으면 1만대당 화재, 없으면 화재 건수의 연간 변화율
+    by_year = index.by_year(sido, **filters)
+    exposure = 1.0
+    if df_region_reg is not None:
+        exposure = by_year.index.map(region_registrations_by_year(df_region_reg, sido)).to_numpy(dtype=float)
+    lower, upper = rate_stats.poisson_ci(by_year.to_numpy())
+    trend = rate_stats.trend_test(by_year.to_numpy(dtype=float), exposure, by_year.index.to_numpy(dtype=float))
+    return {
+        "region": sido or regional_index.NATION,
+        "fire_count": fire_count,
+        "national_share": round(fire_count / nation_count * 100, 2) if nation_count else None,
+        "ev_registered": ev_registered,
+        "fire_per_10k": fire_per_10k,
+        "fire_per_10k_ci": fire_per_10k_ci,
+        "regions": table.sort_values("화재건수", ascending=False, kind="stable").reset_index(drop=True),
+        "by_year": by_year,
+        "by_year_ci": pd.DataFrame({"하한": lower, "상한": upper}, index=by_year.index),
+        "trend": trend_table(["1만대당 화재" if df_region_reg is not None else "화재 건수"],
+                             {key: np.atleast_1d(value) for key, value in trend.items()}),
+    }
+
+
+# ==============================
+# 시기별: 기간 필터 + 월/요일/시간대 분포
+# ==============================
+def temporal_summary(index, start=None, end=None, year_filter=None, filters=None):
+    # index: time_index.TimeIndex. 기간/연도는 정렬된 날짜의 이진 탐색, 분포는 구간 조각에서만 센다.
+    result = index.summary(start, end, year_filter, filters)
+    count = result["count"]
+    weekday, hour = result["weekday"], result["hour"]
+    return {
+        **result,
+        "share": round(count / index.n_rows * 100, 2) if index.n_rows else None,
+        "peak_weekday": weekday.idxmax() if count else None,
+        "peak_hour": int(hour.idxmax()) if count and hour is not None else None,
+        "peak_month": int(result["month_of_year"].idxmax()) if count else None,
+    }
+
+
+# ==============================
+# 파티션(시도/연도) 단위 지표
+# ==============================
+def partition_metrics(df_ev, df_total, keys, df_car_info=None):
+    # 파티션마다 반복하지 않고 파티션 키로 한 번씩 groupby 해서 모든 파티션을 동시에 계산한다.
+    ev = df_ev.groupby(keys, observed=True).size().rename("전기차화재")
+    total = df_total.groupby(keys, observed=True).size().rename("차량화재")
+    table = pd.concat([total, ev], axis=1).fillna(0).astype("int64")
+    table["전기차화재비율(%)"] = (table["전기차화재"] / table["차량화재"] * 100).round(2)
+    if df_car_info is not None and list(keys) == ["연도"]:
+        registered = df_car_info.set_index("연도")
+        table = table.join(registered[["전체차량등록대수", "전기차등록대수"]])
+        table["EV_1만대당"] = (table["전기차화재"] / table["전기차등록대수"] * 10000).round(2)
+        ice_fires = table["차량화재"] - table["전기차화재"]
+        table["내연기관_1만대당"] = (ice_fires / (table["전체차량등록대수"] - table["전기차등록대수"]) * 10000).round(2)
+
+    breakdowns = {
+        f"{col}_by_partition": df_ev.groupby([*keys, col], observed=True).size().rename("건수").reset_index()
+        for col in ["발화요인대분류", "발화요인소분류", "차량상태"]
+    }
+    return {"partitions": table.reset_index(), **breakdowns}
+
+
+# ==============================
+# 데이터 품질 검사
+# ==============================
+def quality_summary(reports):
+    # reports: {파일: validation 요약}. 한 행이 여러 규칙에 걸리면 사유별 건수에는 각각 센다.
+    # 경고(허용값 목록 밖 값 등)는 격리하지 않고 집계에 남긴 행이다.
+    files = pd.DataFrame([
+        {"파일": name, "검사 행": r["rows"], "통과": r["passed"], "격리": r["quarantined"],
+         "격리 비율(%)": round(r["quarantined"] / r["rows"] * 100, 3) if r["rows"] else 0.0,
+         "경고": r["warned"], "격리 파일": r["quarantine_file"]}
+        for name, r in reports.items()
+    ], columns=["파일", "검사 행", "통과", "격리", "격리 비율(%)", "경고", "격리 파일"])
+    reasons = pd.DataFrame([{"파일": name, "사유": reason, "건수": count}
+                            for name, r in reports.items() for reason, count in r["reasons"].items()],
+                           columns=["파일", "사유", "건수"])
+    warnings = pd.DataFrame([{"파일": name, "사유": reason, "건수": count,
+                              "값 (일부)": ", ".join(r["warning_values"].get(reason, []))}
+                             for name, r in reports.items() for reason, count in r["warnings"].items()],
+                            columns=["파일", "사유", "건수", "값 (일부)"])
+    rows = int(files["검사 행"].sum())
+    quarantined = int(files["격리"].sum())
+    return {
+        "rows": rows,
+        "quarantined": quarantined,
+        "quarantined_ratio": round(quarantined / rows * 100, 3) if rows else 0.0,
+        "warned": int(files["경고"].sum()),
+        "files": files,
+        "reasons": reasons,
+        "warnings": warnings,
+    }
+
+
+# ==============================
+# 전체 지표
+# ==============================
+def compute_metrics(frames, year_filter=None, subcause_filter=(), status_filter=(), partition_by=()):
+    df_ev = frames["fire_EV"]
+    counts = ingest.merge_counts(
+        ingest.count_fires(frames["fire_total"], is_ev=False),
+        ingest.count_fires(df_ev, is_ev=True),
+    )
+    if year_filter is None:
+        year_filter = sorted(df_ev["연도"].dropna().unique())
+
+    metrics = {
+        "fire": fire_summary(counts, frames["car_info"]),
+        "registration": registration_summary(frames["car_info"]),
+        "filtered": filtered_breakdown(filter_index.BitmapIndex(df_ev), year_filter, subcause_filter, status_filter),
+        "maker": maker_summary(vehicle_dim.VehicleIndex(frames["car_maker"], frames["manufac_fire"])),
+        "foreign": {"ev_fire_per_10k": foreign_comparison(frames["foreign_fire"])},
+        "manufacturer_share": {"table": frames["manufac_fire"]},
+        "region": region_summary(regional_index.RegionalIndex(df_ev), None, year_filter, subcause_filter,
+                                 status_filter, frames.get("region_registrations")),
+    }
+    if partition_by:
+        metrics["partition"] = partition_metrics(df_ev, frames["fire_total"], list(partition_by), frames["car_info"])
+    return metrics
+
+
+def to_records(value):
+    if isinstance(value, pd.Series):
+        value = value.rename_axis(value.index.name or "index").reset_index()
+    if isinstance(value, pd.DataFrame):
+        if not isinstance(value.index, pd.RangeIndex):
+            value = value.reset_index()
+        return json.loads(value.to_json(orient="records", force_ascii=False, date_format="iso"))
+    return value
+
+
+def write_outputs(metrics, out_dir, fmt="json"):
+    # json    : metrics.json 하나에 스칼라와 표(records)를 모두 기록
+    # parquet : 표는 <그룹>__<이름>.parquet, 스칼라는 metrics.json
+    os.makedirs(out_dir, exist_ok=True)
+    summary = {}
+    for group, values in metrics.items():
+        summary[group] = {}
+        for name, value in values.items():
+            if isinstance(value, (pd.DataFrame, pd.Series)) and fmt == "parquet":
+                table = value.to_frame() if isinstance(value, pd.Series) else value
+                if not isinstance(table.index, pd.RangeIndex):
+                    table = table.reset_index()
+                table.to_parquet(os.path.join(out_dir, f"{group}__{name}.parquet"), index=False)
+            else:
+                summary[group][name] = to_records(value)
+    with open(os.path.join(out_dir, "metrics.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전기차 화재 대시보드 지표를 JSON/Parquet 으로 내보낸다.")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--format", choices=["json", "parquet"], default="json")
+    parser.add_argument("--partition-by", nargs="*", default=[], choices=["시도", "연도"])
+    parser.add_argument("--years", nargs="*", type=int)
+    parser.add_argument("--subcause", nargs="*", default=[])
+    parser.add_argument("--status", nargs="*", default=[])
+    parser.add_argument("--partitions", metavar="ROOT", help="시도/연도별 파티션 폴더 (data-dir 에 합쳐서 읽는다)")
+    args = parser.parse_args(argv)
+
+    if args.partitions:
+        partitions.materialize(args.partitions, args.data_dir)
+    frames = load_frames(args.data_dir, extra_total_columns=args.partition_by)
+    metrics = compute_metrics(frames, args.years, args.subcause, args.status, args.partition_by)
+    metrics["quality"] = quality_summary(load_quality_reports(args.data_dir))
+    write_outputs(metrics, args.out, args.format)
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
@@ -0,0 +1,256 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import tornado.web
+
+import analysis
+import data_loader
+import filter_cache
+import filter_index
+import partitions
+import query_backend
+import regional_index
+import vehicle_dim
+
+# ===== 집계 JSON API (asyncio) =====
+# 대시보드를 띄우지 않고도 다른 도구가 같은 수치를 받아 갈 수 있도록, project.py 와 같은 데이터 계층
+# (data_loader 프로세스 캐시, 비트맵/지역 인덱스, 적재 저장소, 집계 백엔드)을 쓰는 로컬 HTTP 서비스.
+# Streamlit 과 함께 설치되는 tornado 가 asyncio 이벤트 루프 위에서 요청을 받는다.
+#   GET /api                 엔드포인트, 사이드바 선택값 목록, 캐시 통계
+#   GET /api/yearly          연도별 전체/전기차 화재, 1만대당 화재(신뢰구간), 추세, 등록대수 KPI (Tab1)
+#   GET /api/filtered        발화요인/차량상태 필터 전·후 건수 (Tab2)
+#   GET /api/manufacturers   제조사별 10만대당 화재와 화재율 비, 제조사별 최초발화점/상황, 차명별 건수 (Tab3)
+#   GET /api/regions         전국/시도별 화재 건수와 1만대당 화재 (지역별)
+# 필터 파라미터는 사이드바와 같다: years (없으면 전체 연도, 빈 값이면 0건), subcause, status (없으면 전체).
+# 여러 값은 쉼표로 잇거나 파라미터를 반복한다. 예) /api/filtered?years=2022,2023&status=주차&status=충전중
+# 응답은 (엔드포인트, 정규화한 파라미터) 별로 본문과 ETag 를 LRU 캐시에 두고, 입력 파일이 바뀌면 비운다.
+# 캐시에 있으면 이벤트 루프에서 바로 돌려주고, 없을 때만 계산을 스레드 풀로 넘겨 다른 요청을 막지 않는다.
+# If-None-Match 가 ETag 와 같으면 304 로 본문 없이 응답한다.
+# 사용법: python api.py [--port 8502] [--address 127.0.0.1] [--data-dir .]
+PORT = int(os.environ.get("EV_API_PORT", 8502))
+CACHE_MB = float(os.environ.get("EV_API_CACHE_MB", 32))
+
+# 응답이 의존하는 입력 파일 (하나라도 바뀌면 응답 캐시 전체를 비운다)
+INPUT_FILES = [
+    data_loader.fire_total, data_loader.fire_EV, data_loader.car_info, data_loader.car_maker,
+    data_loader.manufac_fire, data_loader.region_registrations,
+]
+
+response_cache = filter_cache.FilterCache(CACHE_MB)
+
+
+def data_version():
+    # 입력 파일 시그니처 (없는 선택 파일은 None). 파티션 폴더가 있으면 합친 CSV 를 먼저 맞춘다.
+    partitions.sync()
+    return tuple(data_loader.file_signature(path) if os.path.exists(path) else None for path in INPUT_FILES)
+
+
+def ev_frame():
+    # 사이드바와 같은 전기차 화재 컬럼 (선택값 목록)
+    return data_loader.load_csv(data_loader.fire_EV, filter_index.FILTER_COLUMNS)
+
+
+def filter_options():
+    # 요청마다 쓰이므로 전기차 데이터가 바뀔 때만 다시 만든다.
+    def compute():
+        df = ev_frame()
+        return {
+            "years": sorted(int(y) for y in df["연도"].dropna().unique()),
+            "subcause": df["발화요인소분류"].dropna().unique().tolist(),
+            "status": df["차량상태"].dropna().unique().tolist(),
+        }
+
+    signature = data_loader.file_signature(data_loader.fire_EV)
+    return data_loader.memoized((signature[0], "api_filter_options"), signature, compute)
+
+
+def to_json(value):
+    # 표(DataFrame/Series)는 레코드 목록, numpy 스칼라는 파이썬 값, NaN 은 null
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return analysis.to_records(value)
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def render(result):
+    body = json.dumps(to_json(result), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return {"body": body, "etag": '"' + hashlib.sha1(body).hexdigest() + '"'}
+
+
+# ==============================
+# 엔드포인트별 계산
+# ==============================
+def yearly():
+    backend = query_backend.get_backend()
+    df_car_info = data_loader.load_csv(data_loader.car_info)
+    return {**analysis.fire_summary(query_backend.fire_counts(backend), df_car_info),
+            **analysis.registration_summary(df_car_info)}
+
+
+def filtered(year_filter, subcause_filter, status_filter):
+    backend = query_backend.get_backend()
+    return backend.filtered_breakdown(list(year_filter), list(subcause_filter), list(status_filter))
+
+
+def manufacturers():
+    return {"rates": analysis.manufacturer_rates(data_loader.load_csv(data_loader.manufac_fire)),
+            **analysis.maker_summary(vehicle_dim.load_index())}
+
+
+def regions(sido, year_filter, subcause_filter, status_filter):
+    df_region_reg = None
+    if os.path.exists(data_loader.region_registrations):
+        df_region_reg = data_loader.load_csv(data_loader.region_registrations)
+    return analysis.region_summary(regional_index.load_index(), sido, list(year_filter), subcause_filter,
+                                   status_filter, df_region_reg)
+
+
+def sido_names():
+    def compute():
+        index = regional_index.load_index()
+        return index.nodes.loc[index.nodes["단계"] == "시도", "시도"].tolist()
+
+    signature = data_loader.file_signature(data_loader.fire_EV)
+    return data_loader.memoized((signature[0], "api_sido_names"), signature, compute)
+
+
+# ==============================
+# HTTP 처리
+# ==============================
+class JSONHandler(tornado.web.RequestHandler):
+    def set_default_headers(self):
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+
+    def write_error(self, status_code, **kwargs):
+        error = kwargs.get("exc_info", (None, None, None))[1]
+        message = error.log_message % error.args if getattr(error, "log_message", None) else self._reason
+        self.finish(json.dumps({"error": message}, ensure_ascii=False))
+
+    def values(self, name):
+        # 쉼표로 이은 값과 반복 파라미터를 모두 받는다. 파라미터가 없으면 None
+        if name not in self.request.arguments:
+            return None
+        return [v.strip() for arg in self.get_arguments(name) for v in arg.split(",") if v.strip()]
+
+    def selection(self):
+        # 사이드바 선택 (연도, 발화요인, 차량상태) 을 정렬한 튜플. 연도가 없으면 사이드바 기본값(전체 연도)
+        years = self.values("years")
+        try:
+            year_filter = filter_options()["years"] if years is None else [int(y) for y in years]
+        except ValueError:
+            raise tornado.web.HTTPError(400, "years 는 정수 연도여야 합니다: %s", ",".join(years))
+        return filter_cache.selection_key(sorted(set(year_filter)), self.values("subcause") or [],
+                                          self.values("status") or [])
+
+
+class AggregateHandler(JSONHandler):
+    # params(handler) -> 정규화한 파라미터 튜플, compute(*params) -> 결과 dict
+    def initialize(self, name, compute, params=lambda handler: ()):
+        self.name = name
+        self.compute = compute
+        self.params = params
+        self.etag = None
+
+    async def get(self):
+        params = self.params(self)
+        dataset = data_version()
+        key = (self.name, params)
+        response = response_cache.peek(dataset, key)
+        if response is None:
+            response = await asyncio.get_running_loop().run_in_executor(
+                None, response_cache.get, dataset, key, lambda: render(self.compute(*params)))
+        self.etag = response["etag"]
+        self.set_header("Cache-Control", "no-cache")
+        self.write(response["body"])
+
+    def compute_etag(self):
+        # 본문 해시는 캐시에 넣을 때 한 번만 계산한다. finish() 가 If-None-Match 와 비교해 304 로 바꾼다.
+        return self.etag
+
+
+class IndexHandler(JSONHandler):
+    def get(self):
+        self.write(json.dumps(to_json({
+            "endpoints": ENDPOINTS,
+            "backend": query_backend.get_backend().name,
+            "filters": filter_options(),
+            "sido": sido_names(),
+            "cache": response_cache.stats(),
+        }), ensure_ascii=False))
+
+
+def selection_params(handler):
+    return handler.selection()
+
+
+def region_params(handler):
+    sido = handler.get_argument("sido", regional_index.NATION)
+    if sido != regional_index.NATION and sido not in sido_names():
+        raise tornado.web.HTTPError(400, "없는 시도입니다: %s", sido)
+    return (sido, *handler.selection())
+
+
+# 엔드포인트 -> 받는 파라미터
+ENDPOINTS = {
+    "/api/yearly": [],
+    "/api/filtered": ["years", "subcause", "status"],
+    "/api/manufacturers": [],
+    "/api/regions": ["sido", "years", "subcause", "status"],
+}
+ROUTES = [
+    (r"/api/?", IndexHandler, {}),
+    (r"/api/yearly", AggregateHandler, {"name": "yearly", "compute": yearly}),
+    (r"/api/filtered", AggregateHandler, {"name": "filtered", "compute": filtered, "params": selection_params}),
+    (r"/api/manufacturers", AggregateHandler, {"name": "manufacturers", "compute": manufacturers}),
+    (r"/api/regions", AggregateHandler, {"name": "regions", "compute": regions, "params": region_params}),
+]
+
+
+def make_app():
+    return tornado.web.Application(ROUTES)
+
+
+def warm_up():
+    # 인덱스/적재 저장소를 올리고 사이드바 기본 선택의 응답을 미리 만들어 둔다.
+    dataset = data_version()
+    years = tuple(filter_options()["years"])
+    for name, compute, params in [("yearly", yearly, ()), ("filtered", filtered, (years, (), ())),
+                                  ("manufacturers", manufacturers, ()),
+                                  ("regions", regions, (regional_index.NATION, years, (), ()))]:
+        response_cache.get(dataset, (name, params), lambda: render(compute(*params)))
+
+
+async def serve(port, address):
+    make_app().listen(port, address)
+    print(f"http://{address}:{port}/api", flush=True)
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 집계를 JSON 으로 제공하는 로컬 API")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--data-dir", default=".", help="입력 CSV 폴더 (대시보드와 같은 상대 경로로 읽는다)")
+    args = parser.parse_args(argv)
+
+    os.chdir(args.data_dir)
+    warm_up()
+    asyncio.run(serve(args.port, args.address))
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
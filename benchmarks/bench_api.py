@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+
+import numpy as np
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+# ===== 집계 API 부하 테스트 =====
+# api.py 를 별도 프로세스로 띄우고, 동시 연결 C 개로 요청 N 개를 보내 처리량(req/s)과 지연(p50/p99)을 잰다.
+# 요청은 대시보드 사용 패턴을 흉내 낸 섞음: 연도별/제조사 + 사이드바 조합을 바꾼 필터/지역 조회.
+# 일부 요청은 앞서 받은 ETag 를 If-None-Match 로 보내 304 응답 비율도 함께 보고한다.
+# 클라이언트도 파이썬 한 프로세스이므로 동시 연결이 많을 때의 req/s 는 서버 한계의 하한이다.
+# --data-dir 를 주지 않으면 합성 데이터(--rows 행)를 임시 폴더에 만들어 쓴다.
+# 사용법: python benchmarks/bench_api.py [--data-dir 폴더 | --rows 1000000] [--requests 5000] [--concurrency 1 10 50]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import synthetic  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(data_dir, port):
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, "api.py"), "--port", str(port),
+                               "--data-dir", data_dir], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    # 준비(인덱스 생성 + 기본 응답 미리 계산)가 끝나면 주소를 출력한다.
+    line = server.stdout.readline().decode()
+    if not line.startswith("http"):
+        server.kill()
+        raise SystemExit(f"API 서버 시작 실패: {line}{server.stdout.read().decode()}")
+    return server
+
+
+def make_urls(base, options, n, rng):
+    # 사이드바 조합 n 개 (연도 부분집합 + 발화요인/차량상태 0~2개)
+    urls = [f"{base}/api/yearly", f"{base}/api/manufacturers"]
+    for _ in range(n):
+        params = [("years", ",".join(map(str, sorted(rng.sample(options["years"],
+                                                                 rng.randint(1, len(options["years"])))))))]
+        params += [("subcause", v) for v in rng.sample(options["subcause"], rng.randint(0, 2))]
+        params += [("status", v) for v in rng.sample(options["status"], rng.randint(0, 2))]
+        endpoint = "regions" if rng.random() < 0.3 else "filtered"
+        if endpoint == "regions":
+            params.append(("sido", rng.choice(options["sido"])))
+        urls.append(f"{base}/api/{endpoint}?{urllib.parse.urlencode(params)}")
+    return urls
+
+
+async def load_test(urls, n_requests, concurrency, revalidate, rng):
+    client = AsyncHTTPClient(max_clients=concurrency)
+    etags = {}
+    latencies = []
+    statuses = {}
+    queue = [rng.choice(urls) for _ in range(n_requests)]
+
+    async def worker():
+        while queue:
+            url = queue.pop()
+            headers = {}
+            if url in etags and rng.random() < revalidate:
+                headers["If-None-Match"] = etags[url]
+            start = time.perf_counter()
+            try:
+                response = await client.fetch(url, headers=headers, raise_error=False)
+                code = response.code
+            except HTTPClientError as e:
+                code = e.code
+            latencies.append(time.perf_counter() - start)
+            statuses[code] = statuses.get(code, 0) + 1
+            if code == 200:
+                etags[url] = response.headers.get("Etag")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed, np.array(latencies), statuses
+
+
+async def fetch_options(base):
+    client = AsyncHTTPClient()
+    index = json.loads((await client.fetch(f"{base}/api")).body)
+    return {**index["filters"], "sido": index["sido"]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data-dir")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--ev-ratio", type=float, default=0.02)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--combinations", type=int, default=200, help="서로 다른 사이드바 조합 수")
+    parser.add_argument("--revalidate", type=float, default=0.3, help="ETag 를 다시 보내는 요청 비율")
+    args = parser.parse_args()
+
+    workdir = None
+    data_dir = args.data_dir
+    if data_dir is None:
+        workdir = data_dir = tempfile.mkdtemp()
+        synthetic.write_dataset(workdir, args.rows, max(int(args.rows * args.ev_ratio), 1))
+    port = free_port()
+    start = time.perf_counter()
+    server = start_server(data_dir, port)
+    print(f"서버 준비: {time.perf_counter() - start:.1f}s")
+    try:
+        base = f"http://127.0.0.1:{port}"
+        rng = random.Random(0)
+        options = asyncio.run(fetch_options(base))
+        urls = make_urls(base, options, args.combinations, rng)
+        print(f"{'conc':>5} {'req/s':>8} {'p50':>8} {'p99':>8} {'max':>8}  {'304':>5}  상태")
+        for concurrency in args.concurrency:
+            elapsed, latencies, statuses = asyncio.run(
+                load_test(urls, args.requests, concurrency, args.revalidate, rng))
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(f"{concurrency:>5} {len(latencies) / elapsed:>8,.0f} {p50:>6.1f}ms {p99:>6.1f}ms "
+                  f"{latencies.max() * 1000:>6.1f}ms  {statuses.get(304, 0) / len(latencies):>5.0%}  "
+                  + " ".join(f"{code}:{count}" for code, count in sorted(statuses.items())))
+    finally:
+        server.terminate()
+        server.wait()
+        if workdir:
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data_loader  # noqa: E402
+import query_backend  # noqa: E402
+import synthetic  # noqa: E402
+
+
+# ===== 집계 백엔드: pandas vs DuckDB =====
+# 합성 데이터(규모별)에서 Tab1 화재 집계 큐브와 Tab2 필터 조합들을 두 백엔드로 계산해 시간과 결과를 비교한다.
+#   cold : 프로세스 캐시를 비운 상태 (pandas 는 Parquet 사이드카 읽기 + 인덱스 생성 포함)
+#   warm : 같은 프로세스에서 다시 (pandas 는 캐시된 프레임/비트맵 인덱스, DuckDB 는 매번 파일을 질의)
+# Parquet 사이드카 변환은 두 백엔드가 함께 쓰므로 측정 전에 미리 만들어 둔다.
+# 사용법: python benchmarks/bench_backends.py [--sizes 1000000 5000000] [--ev-ratio 0.02]
+def selections(years):
+    return [
+        (years, [], []),
+        (years[-1:], [], ["주차"]),
+        (years[-3:], ["담배꽁초", "미상"], ["충전중", "주차"]),
+        (years[:2], ["접촉불량에 의한 단락"], []),
+    ]
+
+
+def run(backend, years):
+    counts = backend.fire_counts()
+    results = [backend.filtered_breakdown(*selection) for selection in selections(years)]
+    return counts, results
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--ev-ratio", type=float, default=0.02)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'backend':>8} {'cold':>9} {'warm':>9}  same")
+    for rows in args.sizes:
+        workdir = tempfile.mkdtemp()
+        try:
+            synthetic.write_dataset(workdir, rows, max(int(rows * args.ev_ratio), 1))
+            for name in [data_loader.fire_total, data_loader.fire_EV]:
+                data_loader.ensure_parquet(os.path.join(workdir, name))
+            years = list(range(2019, 2025))
+            outputs = {}
+            for name, backend_class in query_backend.BACKENDS.items():
+                data_loader.clear_cache()
+                backend = backend_class(workdir)
+                cold, outputs[name] = timed(lambda: run(backend, years))
+                warm, _ = timed(lambda: run(backend, years))
+                same = ""
+                if name != "pandas":
+                    reference_counts, reference = outputs["pandas"]
+                    counts, results = outputs[name]
+                    same = (reference_counts.reset_index(drop=True).astype({"연도": "int64"})
+                            .equals(counts.astype({"연도": "int64"}))
+                            and all(query_backend.same_breakdown(a, b) for a, b in zip(reference, results)))
+                print(f"{rows:>10,} {name:>8} {cold * 1000:>7.0f}ms {warm * 1000:>7.0f}ms  {same}")
+        finally:
+            data_loader.clear_cache()
+            shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
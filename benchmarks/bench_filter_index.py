@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data_loader  # noqa: E402
+import filter_index  # noqa: E402
+import synthetic  # noqa: E402
+
+# ===== Tab2 필터: isin 경로 vs 비트맵 인덱스 =====
+# 사용법: python benchmarks/bench_filter_index.py [--sizes 10000 100000 1000000] [--repeat 20]
+def make_ev_frame(rows, seed=0):
+    df = data_loader.apply_schema(synthetic.fire_ev_frame(rows, seed=seed), data_loader.schema_for(data_loader.fire_EV))
+    return df[filter_index.FILTER_COLUMNS].astype({"차량상태": "category", "발화요인소분류": "category"})
+
+
+def isin_path(df, year_filter, subcause_filter, status_filter):
+    # project.py 의 기존 구현
+    df_ev_filtered = df[df["연도"].isin(year_filter)].copy()
+    if status_filter:
+        df_ev_filtered = df_ev_filtered[df_ev_filtered["차량상태"].isin(status_filter)]
+    if subcause_filter:
+        df_ev_filtered = df_ev_filtered[df_ev_filtered["발화요인소분류"].isin(subcause_filter)]
+    subcause = df_ev_filtered["발화요인소분류"].value_counts().loc[lambda s: s > 0].sort_values(ascending=True)
+    status = df_ev_filtered["차량상태"].value_counts().loc[lambda s: s > 0]
+    total_by_year = df["연도"].value_counts().sort_index()
+    filtered_by_year = df_ev_filtered["연도"].value_counts().sort_index()
+    compare_df = pd.DataFrame({
+        "연도": total_by_year.index,
+        "필터 전": total_by_year.values,
+        "필터 후": filtered_by_year.reindex(total_by_year.index, fill_value=0).values,
+    })
+    return {"filtered_count": len(df_ev_filtered), "subcause_counts": subcause,
+            "status_counts": status, "compare_df": compare_df}
+
+
+def same_result(a, b):
+    return (
+        a["filtered_count"] == b["filtered_count"]
+        and a["subcause_counts"].sort_index().to_dict() == b["subcause_counts"].sort_index().to_dict()
+        and a["status_counts"].sort_index().to_dict() == b["status_counts"].sort_index().to_dict()
+        and (a["compare_df"].to_numpy() == b["compare_df"].to_numpy()).all()
+    )
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    selections = [
+        ([2021, 2022, 2023], [], []),
+        ([2019, 2020, 2021, 2022, 2023, 2024], ["담배꽁초", "미상"], []),
+        ([2022, 2023], ["교통사고", "자연발화", "방화"], ["주차", "충전중"]),
+    ]
+    print(f"{'rows':>10} {'build':>9} {'isin':>10} {'bitmap':>10} {'speedup':>8}")
+    for rows in args.sizes:
+        df = make_ev_frame(rows)
+        build_time, index = timed(lambda: filter_index.BitmapIndex(df), 1)
+        isin_total = bitmap_total = 0.0
+        for year_filter, subcause_filter, status_filter in selections:
+            t_isin, expected = timed(lambda: isin_path(df, year_filter, subcause_filter, status_filter), args.repeat)
+            t_bitmap, actual = timed(
+                lambda: filter_index.tab2_summary(index, year_filter, subcause_filter, status_filter), args.repeat)
+            if not same_result(expected, actual):
+                sys.exit(f"결과 불일치: rows={rows}, 선택={year_filter, subcause_filter, status_filter}")
+            isin_total += t_isin
+            bitmap_total += t_bitmap
+        n = len(selections)
+        print(f"{rows:>10,} {build_time * 1000:>7.1f}ms {isin_total / n * 1000:>8.2f}ms "
+              f"{bitmap_total / n * 1000:>8.2f}ms {isin_total / bitmap_total:>7.1f}x")
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
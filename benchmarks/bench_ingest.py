@@ -0,0 +1,57 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import data_loader  # noqa: E402
+import ingest  # noqa: E402
+import synthetic  # noqa: E402
+
+# ===== 추가분 적재 vs 전체 재집계 =====
+# 기존 로그를 적재해 둔 뒤 새 행을 덧붙이고, ingest 의 추가분 반영 시간과 처음부터 다시 집계하는
+# 시간을 비교한다. 마지막에 누적 집계가 전체 재집계와 같은지 확인한다.
+# 사용법: python benchmarks/bench_ingest.py [--rows 1000000] [--append 100 1000 10000]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000, help="합성 통합_화재_통계.csv 행 수")
+    parser.add_argument("--ev-ratio", type=float, default=0.01)
+    parser.add_argument("--append", type=int, nargs="+", default=[100, 1_000, 10_000])
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        synthetic.write_dataset(data_dir, args.rows, max(int(args.rows * args.ev_ratio), 1), reference_dir=ROOT)
+        store = ingest.IngestStore(os.path.join(data_dir, ".ingest"), data_dir)
+        start = time.perf_counter()
+        store.update(rebuild=True)
+        rebuild = time.perf_counter() - start
+        print(f"전체 재집계: {args.rows:,}행 {rebuild:.2f}초")
+
+        print(f"{'append':>8} {'seconds':>9} {'vs rebuild':>11}")
+        for i, rows in enumerate(args.append, start=1):
+            # 기존 기간 뒤에 이어지는 새 행 (시드를 바꿔 다른 행을 만든다)
+            new = synthetic.fire_total_frame(rows, start="2025-01-01", end="2025-01-31", seed=i)
+            new.to_csv(os.path.join(data_dir, data_loader.fire_total), mode="a", header=False, index=False)
+            start = time.perf_counter()
+            report = store.update()
+            elapsed = time.perf_counter() - start
+            assert report[data_loader.fire_total]["mode"] == "append", report
+            print(f"{rows:>8,} {elapsed:>8.3f}s {rebuild / elapsed:>10.0f}x")
+
+        mismatches = store.check()
+        if any(not table.empty for table in mismatches.values()):
+            sys.exit("누적 집계가 전체 재집계와 다릅니다.")
+        print("일관성 검사: 일치")
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# ===== CSV vs Parquet 콜드 스타트 벤치마크 =====
+# 매 측정마다 새 파이썬 프로세스를 띄워 import + 로딩 시간을 잰다 (프로세스 내 캐시 영향 없음).
+# 사용법: python benchmarks/bench_parquet.py [--rows 1000000] [--repeat 3] [--csv 통합_화재_통계.csv]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CSV_SNIPPET = """
+import data_loader
+data_loader.parse_csv({path!r})
+"""
+
+PARQUET_SNIPPET = """
+import data_loader
+data_loader.load_parquet({path!r}, {columns!r})
+"""
+
+
+def time_snippet(snippet, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--csv", help="기존 통합_화재_통계.csv 경로 (없으면 합성 데이터 생성)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    import data_loader
+    import parquet_store
+    import synthetic
+
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, data_loader.fire_total)
+        if args.csv:
+            shutil.copy(args.csv, path)
+        else:
+            synthetic.write_csv(synthetic.fire_total_frame(args.rows), path)
+
+        start = time.perf_counter()
+        data_loader.convert_parquet(path)
+        convert_time = time.perf_counter() - start
+        start = time.perf_counter()
+        data_loader.convert_parquet(path)
+        skip_time = time.perf_counter() - start
+
+        csv_time = time_snippet(CSV_SNIPPET.format(path=path), args.repeat)
+        parquet_time = time_snippet(PARQUET_SNIPPET.format(path=path, columns=None), args.repeat)
+        subset_time = time_snippet(PARQUET_SNIPPET.format(path=path, columns=["장소소분류", "연도"]), args.repeat)
+
+        print(f"rows                      : {len(pd.read_parquet(parquet_store.sidecar_path(path), columns=['연도'])):,}")
+        print(f"CSV size / Parquet size   : {os.path.getsize(path) / 1e6:.1f} MB / "
+              f"{os.path.getsize(parquet_store.sidecar_path(path)) / 1e6:.1f} MB")
+        print(f"CSV -> Parquet 변환       : {convert_time:.2f} s (변경 없음 재확인 {skip_time * 1000:.1f} ms)")
+        print(f"콜드 스타트 CSV           : {csv_time:.2f} s")
+        print(f"콜드 스타트 Parquet 전체  : {parquet_time:.2f} s ({csv_time / parquet_time:.1f}x)")
+        print(f"콜드 스타트 Parquet 컬럼  : {subset_time:.2f} s ({csv_time / subset_time:.1f}x)")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ingest  # noqa: E402
+import partitions  # noqa: E402
+import synthetic  # noqa: E402
+
+# ===== 파티션 병렬 집계 처리량: 순차 vs 프로세스 풀 =====
+# 시도 x 연도 파티션 파일을 합성해 만들고, 워커 수별 처리 시간과 결과 일치 여부를 확인한다.
+# 사용법: python benchmarks/bench_partitions.py [--regions 8] [--years 4] [--rows 200000] [--workers 1 2 4]
+
+
+def make_partitions(root, regions, years, rows):
+    # 연번은 파티션 전체에서 이어지게 매긴다 (파티션 간 중복은 집계에서 걸러지므로).
+    serial = 1
+    for i, region in enumerate(list(synthetic.REGIONS)[:regions]):
+        for j, year in enumerate(range(2024 - years + 1, 2025)):
+            folder = os.path.join(root, region, str(year))
+            os.makedirs(folder, exist_ok=True)
+            span = (f"{year}-01-01", f"{year}-12-31")
+            seed = i * 100 + j
+            synthetic.write_csv(synthetic.fire_total_frame(rows, *span, seed=seed, region=region),
+                                os.path.join(folder, "통합_화재_통계.csv"))
+            synthetic.write_csv(synthetic.fire_ev_frame(rows // 100, *span, seed=seed, region=region,
+                                                        first_serial=serial),
+                                os.path.join(folder, "전기차_화재_통계.csv"))
+            serial += rows // 100
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--regions", type=int, default=8)
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=200_000, help="파티션당 통합 화재 로그 행 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count()])
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    try:
+        make_partitions(root, args.regions, args.years, args.rows)
+        baseline = None
+        print(f"{'workers':>8} {'files':>6} {'rows':>12} {'seconds':>8} {'rows/s':>12} {'speedup':>8}")
+        for workers in dict.fromkeys(args.workers):
+            counts, stats = partitions.aggregate(root, workers)
+            counts = counts.sort_values(ingest.CUBE_KEYS).reset_index(drop=True)
+            if baseline is None:
+                baseline = (counts, stats["seconds"])
+            elif not counts.equals(baseline[0]):
+                sys.exit(f"결과 불일치: workers={workers}")
+            print(f"{workers:>8} {stats['files']:>6} {stats['rows_read']:>12,} {stats['seconds']:>8.2f} "
+                  f"{stats['rows_read'] / stats['seconds']:>12,.0f} {baseline[1] / stats['seconds']:>7.1f}x")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
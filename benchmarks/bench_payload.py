@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import figures  # noqa: E402
+import render_layer  # noqa: E402
+import synthetic  # noqa: E402
+
+# ===== Figure JSON 크기: 원본 vs render_layer 축약 =====
+# 시군구 단위 막대, 시군구 도넛, 일별/시간별 화재 시계열을 만들어 브라우저로 보낼 바이트 수를 비교한다.
+# 사용법: python benchmarks/bench_payload.py [--rows 1000000] [--budget-kb 512]
+
+
+def daily_line(series, name):
+    return go.Figure(go.Scatter(x=series.index, y=series.values, mode="lines+markers", text=series.values,
+                                name=name))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000, help="합성 통합_화재_통계 행 수")
+    parser.add_argument("--budget-kb", type=float, default=render_layer.BUDGET_KB)
+    args = parser.parse_args()
+
+    df = synthetic.fire_total_frame(args.rows)
+    times = df["일시"].astype("datetime64[ns]")
+    by_sigungu = (df["시도"] + " " + df["시군구"]).value_counts().sort_values(ascending=True)
+    hourly = times.dt.floor("h").value_counts().sort_index()
+    daily = times.dt.floor("D").value_counts().sort_index()
+
+    cases = [
+        ("시군구 막대", lambda: figures.subcause_bar(by_sigungu),
+         lambda: figures.subcause_bar(render_layer.top_n(by_sigungu))),
+        ("시군구 도넛", lambda: figures.donut(by_sigungu, "시군구"),
+         lambda: figures.donut(render_layer.top_n(by_sigungu, render_layer.DONUT_TOP_N), "시군구")),
+        ("일별 시계열", lambda: daily_line(daily, "일별"),
+         lambda: daily_line(render_layer.aggregate_series(daily, 400), "일별")),
+        ("시간별 시계열", lambda: daily_line(hourly, "시간별"),
+         lambda: daily_line(hourly, "시간별")),
+    ]
+    print(f"{'figure':<10} {'points':>8} {'raw KB':>9} {'layer KB':>9} {'saved':>7} {'ms':>7}  steps")
+    for name, raw, reduced in cases:
+        raw_fig = raw()
+        start = time.perf_counter()
+        fig, payload = render_layer.fit(reduced(), args.budget_kb)
+        elapsed = time.perf_counter() - start
+        raw_bytes = render_layer.payload_bytes(raw_fig)
+        points = max(render_layer.trace_points(t) for t in raw_fig.data)
+        print(f"{name:<10} {points:>8,} {raw_bytes / 1024:>9,.1f} {payload['after_bytes'] / 1024:>9,.1f} "
+              f"{1 - payload['after_bytes'] / raw_bytes:>6.0%} {elapsed * 1000:>7.1f}  "
+              f"{', '.join(payload['steps']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
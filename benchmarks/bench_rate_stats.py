@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rate_stats  # noqa: E402
+
+
+# ===== 화재율 신뢰구간/추세: 격자 한 번에 vs 칸마다 =====
+# 연도 × 그룹(지역 × 필터 조합) 격자의 1만대당 화재율 신뢰구간, 나머지 대비 화재율 비, 연간 추세를
+# rate_stats 로 한 번에 계산한 시간과, 같은 함수를 그룹마다 따로 부른 시간을 비교하고 결과가 같은지 확인한다.
+# 사용법: python benchmarks/bench_rate_stats.py [--groups 100 1000 10000] [--years 8] [--repeat 5]
+def make_grid(years, groups, seed=0):
+    rng = np.random.default_rng(seed)
+    exposure = rng.integers(100, 200_000, size=(years, groups)).astype(float)
+    rate = rng.uniform(0.5, 3.0, size=groups) * np.exp(rng.normal(0, 0.1, size=groups) * np.arange(years)[:, None])
+    counts = rng.poisson(exposure * rate / 10000).astype(float)
+    counts[rng.random(counts.shape) < 0.01] = np.nan
+    return counts, exposure
+
+
+def grid_stats(counts, exposure, years):
+    # 그룹마다 나머지 그룹 합계 대비 화재율 비
+    rest_counts = np.nansum(counts, axis=1, keepdims=True) - counts
+    rest_exposure = exposure.sum(axis=1, keepdims=True) - exposure
+    return (rate_stats.rate_ci(counts, exposure)
+            + rate_stats.rate_ratio(counts, exposure, rest_counts, rest_exposure)
+            + tuple(rate_stats.trend_test(counts, exposure, years).values()))
+
+
+def per_group_stats(counts, exposure, years):
+    columns = []
+    rest_counts = np.nansum(counts, axis=1, keepdims=True) - counts
+    rest_exposure = exposure.sum(axis=1, keepdims=True) - exposure
+    for g in range(counts.shape[1]):
+        k, n = counts[:, g], exposure[:, g]
+        columns.append(rate_stats.rate_ci(k, n)
+                       + rate_stats.rate_ratio(k, n, rest_counts[:, g], rest_exposure[:, g])
+                       + tuple(rate_stats.trend_test(k, n, years).values()))
+    return tuple(np.stack([column[i] for column in columns], axis=-1) for i in range(len(columns[0])))
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--groups", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--years", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    years = np.arange(2024 - args.years, 2024)
+    print(f"{'groups':>8} {'grid':>10} {'per group':>10} {'speedup':>8}  same")
+    for groups in args.groups:
+        counts, exposure = make_grid(args.years, groups)
+        grid_time, grid = timed(lambda: grid_stats(counts, exposure, years), args.repeat)
+        loop_time, loop = timed(lambda: per_group_stats(counts, exposure, years), 1)
+        same = all(np.allclose(a, b, equal_nan=True) for a, b in zip(grid, loop))
+        print(f"{groups:>8} {grid_time * 1000:>8.1f}ms {loop_time * 1000:>8.1f}ms {loop_time / grid_time:>7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import glob
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+# ===== 사이드바 변경 시 rerun 시간: 모든 탭 렌더링(이전) vs 선택된 탭만(이후) =====
+# Tab2 를 보고 있는 상태에서 연도 체크박스를 반복해서 토글하며 rerun 시간을 잰다.
+# 사용법: python benchmarks/bench_rerun.py [--rows 500000] [--reruns 10]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import synthetic  # noqa: E402
+
+TAB2 = "🔥 전기차 화재 필터링 분석"
+
+
+def measure(workdir, eager, reruns):
+    os.environ["EV_DASHBOARD_EAGER_TABS"] = "1" if eager else "0"
+    at = AppTest.from_file(os.path.join(workdir, "project.py"), default_timeout=600)
+    at.run()
+    if not eager:
+        at.radio(key="active_tab").set_value(TAB2).run()
+
+    times = []
+    for i in range(reruns):
+        checkbox = at.sidebar.checkbox[i % len(at.sidebar.checkbox)]
+        checkbox.set_value(not checkbox.value)
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    if at.exception:
+        sys.exit(f"앱 실행 오류: {at.exception[0].value}")
+    return statistics.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000, help="합성 통합_화재_통계.csv 행 수")
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        for path in glob.glob(os.path.join(ROOT, "*.py")) + glob.glob(os.path.join(ROOT, "*.csv")):
+            shutil.copy(path, workdir)
+        if not os.path.exists(os.path.join(workdir, "통합_화재_통계.csv")):
+            synthetic.write_csv(synthetic.fire_total_frame(args.rows), os.path.join(workdir, "통합_화재_통계.csv"))
+        os.chdir(workdir)
+        sys.path.insert(0, workdir)
+
+        print(f"{'mode':<8} {'rerun p50':>10} {'rerun max':>10}")
+        for label, eager in [("eager", True), ("lazy", False)]:
+            median, worst = measure(workdir, eager, args.reruns)
+            print(f"{label:<8} {median * 1000:>8.1f}ms {worst * 1000:>8.1f}ms")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
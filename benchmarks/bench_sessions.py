@@ -0,0 +1,95 @@
+import argparse
+import gc
+import glob
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+# ===== 동시 세션 부하 테스트 =====
+# 한 프로세스 안에 세션 N 개(AppTest)를 동시에 띄워 두고, 돌아가며 사이드바/탭을 무작위로 바꿔 rerun 한다.
+# 실제 Streamlit 서버처럼 모듈/캐시는 프로세스에 하나이고 세션마다 스크립트만 다시 실행된다.
+# (AppTest 는 스레드 안전하지 않아 rerun 은 순서대로 실행한다. CPU 경합은 반영되지 않는다.)
+# 세션당 메모리 = (N 세션을 띄운 뒤 RSS - 세션 1개로 데이터를 올린 뒤 RSS) / N
+# 사용법: python benchmarks/bench_sessions.py [--sessions 1 5 10] [--reruns 10] [--rows 500000]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import profiling  # noqa: E402
+import synthetic  # noqa: E402
+
+TABS = ["📊 주요 분석", "🔥 전기차 화재 필터링 분석", "📍 추가 참고 분석 데이터", "🗺️ 지역별 화재 분석",
+        "⏰ 시기별 화재 분석"]
+
+
+def open_session(workdir, rng):
+    at = AppTest.from_file(os.path.join(workdir, "project.py"), default_timeout=600)
+    at.run()
+    at.radio(key="active_tab").set_value(rng.choice(TABS)).run()
+    return at
+
+
+def rerun(at, rng):
+    checkbox = rng.choice(at.sidebar.checkbox)
+    checkbox.set_value(not checkbox.value)
+    if rng.random() < 0.2:
+        at.radio(key="active_tab").set_value(rng.choice(TABS))
+    start = time.perf_counter()
+    at.run()
+    if at.exception:
+        sys.exit(f"앱 실행 오류: {at.exception[0].value}")
+    return time.perf_counter() - start
+
+
+def run_sessions(workdir, n, reruns, seed=0):
+    # 세션 n 개를 모두 띄운 상태에서 rerun 을 세션별로 번갈아 실행한다.
+    rng = random.Random(seed)
+    sessions = [open_session(workdir, rng) for _ in range(n)]
+    latencies = [rerun(at, rng) for _ in range(reruns) for at in sessions]
+    return sessions, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=500_000, help="합성 통합_화재_통계.csv 행 수")
+    parser.add_argument("--ev-ratio", type=float, default=0.02)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        synthetic.write_dataset(workdir, args.rows, max(int(args.rows * args.ev_ratio), 1), reference_dir=ROOT)
+        for path in glob.glob(os.path.join(ROOT, "*.py")):
+            shutil.copy(path, workdir)
+        os.chdir(workdir)
+        sys.path.insert(0, workdir)
+
+        # 공유 데이터를 먼저 올려 두고 (모든 탭 한 번씩), 그 뒤 RSS 를 기준으로 삼는다.
+        warmup, _ = run_sessions(workdir, 1, len(TABS))
+        del warmup
+        gc.collect()
+        baseline = profiling.rss_mb()
+        print(f"공유 데이터 적재 후 RSS: {baseline:.0f} MB")
+        print(f"{'sessions':>8} {'reruns':>7} {'p50':>9} {'p95':>9} {'max':>9} {'RSS MB':>8} {'MB/session':>11}")
+        for n in args.sessions:
+            sessions, latencies = run_sessions(workdir, n, args.reruns, seed=n)
+            rss = profiling.rss_mb()
+            p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+            print(f"{n:>8} {len(latencies):>7} {statistics.median(latencies) * 1000:>7.0f}ms "
+                  f"{p95 * 1000:>7.0f}ms {max(latencies) * 1000:>7.0f}ms {rss:>8.0f} "
+                  f"{(rss - baseline) / n:>11.1f}")
+            del sessions
+            gc.collect()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import analysis  # noqa: E402
+import data_loader  # noqa: E402
+import figures  # noqa: E402
+import filter_index  # noqa: E402
+import ingest  # noqa: E402
+import parquet_store  # noqa: E402
+import regional_index  # noqa: E402
+import synthetic  # noqa: E402
+import vehicle_dim  # noqa: E402
+
+# ===== project.py 단계별 소요 시간 (규모별) =====
+# 합성 데이터로 적재 → 로드 → 전처리 → Tab1 집계 → Tab2 필터 → Tab3 집계 → 지역별 조회 를 각각 잰다.
+# 결과는 JSON 보고서로 저장하고, --compare 로 이전 보고서와 비교해 느려졌으면 종료 코드 1 을 낸다.
+# 사용법: python benchmarks/bench_stages.py [--scales 100000 1000000] [--ev-ratio 0.01] [--repeat 3]
+#                                          [--out report.json] [--compare baseline.json] [--threshold 0.2]
+STAGES = ["ingest", "load", "preprocess", "tab1", "tab2", "tab3", "regions"]
+
+SELECTIONS = [
+    ([2021, 2022, 2023], [], []),
+    ([2019, 2020, 2021, 2022, 2023, 2024], ["담배꽁초", "미상"], []),
+    ([2022, 2023], ["교통사고", "자연발화", "방화"], ["주차", "충전중"]),
+]
+
+
+def ingest(data_dir):
+    # CSV → Parquet 사이드카 변환 (처음 배포하거나 원본이 바뀐 경우)
+    for name in [data_loader.fire_total, data_loader.fire_EV]:
+        path = os.path.join(data_dir, name)
+        if os.path.exists(parquet_store.sidecar_path(path)):
+            os.remove(parquet_store.sidecar_path(path))
+        data_loader.convert_parquet(path)
+
+
+def load(data_dir):
+    data_loader.clear_cache()
+    return analysis.load_frames(data_dir)
+
+
+def preprocess(frames):
+    counts = ingest.merge_counts(
+        ingest.count_fires(frames["fire_total"], is_ev=False),
+        ingest.count_fires(frames["fire_EV"], is_ev=True),
+    )
+    return (counts, filter_index.BitmapIndex(frames["fire_EV"][filter_index.FILTER_COLUMNS]),
+            regional_index.RegionalIndex(frames["fire_EV"]))
+
+
+def tab1(counts, frames):
+    fire = analysis.fire_summary(counts, frames["car_info"])
+    registration = analysis.registration_summary(frames["car_info"])
+    df_yearly = fire["yearly"]
+    return [
+        figures.fire_compare(df_yearly[df_yearly["전체"].notna()].reset_index()),
+        figures.car_compare(registration["registrations"]),
+        figures.registered_vs_rate(df_yearly["전기차등록대수"].dropna(), df_yearly["EV_1만대당"],
+                                   "전기차", "royalblue", "tomato"),
+        figures.registered_vs_rate(df_yearly["내연기관등록대수"].dropna(), df_yearly["내연기관_1만대당"],
+                                   "내연기관", "seagreen", "orange"),
+    ]
+
+
+def tab2(index):
+    result = []
+    for year_filter, subcause_filter, status_filter in SELECTIONS:
+        summary = analysis.filtered_breakdown(index, year_filter, subcause_filter, status_filter)
+        result += [
+            figures.subcause_bar(summary["subcause_counts"]),
+            figures.donut(summary["status_counts"], "차량상태별 비율 (필터 적용)"),
+            figures.filter_compare(summary["compare_df"]),
+        ]
+    return result
+
+
+def tab3(frames):
+    maker = analysis.maker_summary(vehicle_dim.VehicleIndex(frames["car_maker"], frames["manufac_fire"]))
+    return [
+        figures.manufacturer_bar(maker["manufacturer_counts"]),
+        figures.manufacturer_compare(frames["manufac_fire"]),
+        figures.donut(maker["fire_origin_counts"], "최초발화점"),
+        figures.donut(maker["situation_counts"], "상황"),
+        figures.foreign_bar(analysis.foreign_comparison(frames["foreign_fire"])),
+    ]
+
+
+def regions(index, frames):
+    result = []
+    for sido in [regional_index.NATION, "경기도"]:
+        for year_filter, subcause_filter, status_filter in SELECTIONS:
+            summary = analysis.region_summary(index, sido, year_filter, subcause_filter, status_filter,
+                                              frames["region_registrations"])
+            result += [figures.region_bar(summary["regions"], sido),
+                       figures.region_trend(summary["by_year"], sido)]
+    return result
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run_scale(data_dir, repeat):
+    times = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        elapsed, _ = timed(lambda: ingest(data_dir))
+        times["ingest"].append(elapsed)
+        elapsed, frames = timed(lambda: load(data_dir))
+        times["load"].append(elapsed)
+        elapsed, (counts, index, region_index) = timed(lambda: preprocess(frames))
+        times["preprocess"].append(elapsed)
+        times["tab1"].append(timed(lambda: tab1(counts, frames))[0])
+        times["tab2"].append(timed(lambda: tab2(index))[0])
+        times["tab3"].append(timed(lambda: tab3(frames))[0])
+        times["regions"].append(timed(lambda: regions(region_index, frames))[0])
+    return {stage: statistics.median(values) for stage, values in times.items()}
+
+
+def environment():
+    import numpy
+    import plotly
+    import pyarrow
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": numpy.__version__,
+        "pyarrow": pyarrow.__version__,
+        "plotly": plotly.__version__,
+    }
+
+
+def compare(report, baseline, threshold):
+    # 두 보고서에 모두 있는 (규모, 단계) 만 비교한다. 느려진 항목 수를 돌려준다.
+    regressions = 0
+    print(f"\n{'rows':>10} {'stage':<11} {'baseline':>10} {'current':>10} {'delta':>8}")
+    for scale, stages in report["scales"].items():
+        for stage, seconds in stages.items():
+            before = baseline.get("scales", {}).get(scale, {}).get(stage)
+            if not before:
+                continue
+            delta = seconds / before - 1
+            flag = " ← 느려짐" if delta > threshold else ""
+            regressions += bool(flag)
+            print(f"{int(scale):>10,} {stage:<11} {before * 1000:>8.1f}ms {seconds * 1000:>8.1f}ms "
+                  f"{delta * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="합성 통합_화재_통계.csv 행 수")
+    parser.add_argument("--ev-ratio", type=float, default=0.01, help="전체 화재 대비 전기차 화재 행 비율")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="보고서 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 보고서 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.2, help="이 비율보다 느려지면 실패 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    report = {"environment": environment(), "repeat": args.repeat, "seed": args.seed,
+              "ev_ratio": args.ev_ratio, "scales": {}}
+    print(f"{'rows':>10} " + " ".join(f"{stage:>10}" for stage in STAGES))
+    for rows in args.scales:
+        data_dir = tempfile.mkdtemp()
+        try:
+            synthetic.write_dataset(data_dir, rows, max(int(rows * args.ev_ratio), 1), seed=args.seed,
+                                    reference_dir=ROOT)
+            result = run_scale(data_dir, args.repeat)
+        finally:
+            data_loader.clear_cache()
+            shutil.rmtree(data_dir)
+        report["scales"][str(rows)] = result
+        print(f"{rows:>10,} " + " ".join(f"{result[stage] * 1000:>8.1f}ms" for stage in STAGES))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            sys.exit(f"{regressions}개 단계가 기준보다 {args.threshold * 100:.0f}% 넘게 느려졌습니다.")
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
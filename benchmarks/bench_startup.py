@@ -0,0 +1,125 @@
+import argparse
+import ast
+import glob
+import importlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# ===== 시작 시간 예산 =====
+# 새 프로세스(워커/컨테이너 콜드 스타트)에서 대시보드 첫 화면까지 걸리는 시간을 재고, 예산을 넘으면 종료 코드 1.
+#   import : streamlit 과 project.py 가 맨 위에서 import 하는 모듈
+#   render : 첫 실행 (사이드바 + 첫 탭, AppTest)
+# 첫 화면에 필요 없는 무거운 라이브러리(DEFERRED)가 첫 실행 뒤 올라와 있어도 실패로 본다.
+# Parquet 사이드카와 적재 상태(.ingest)는 준비 실행에서 미리 만들어 두고, 프로세스 콜드 스타트만 잰다.
+# 예산은 EV_STARTUP_IMPORT_BUDGET_S / EV_STARTUP_RENDER_BUDGET_S 또는 인자로 바꾼다.
+# 사용법: python benchmarks/bench_startup.py [--data-dir 폴더 | --rows 200000] [--repeat 3]
+#                                           [--import-budget 2.0] [--render-budget 3.0]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_S = float(os.environ.get("EV_STARTUP_IMPORT_BUDGET_S", 2.0))
+RENDER_BUDGET_S = float(os.environ.get("EV_STARTUP_RENDER_BUDGET_S", 3.0))
+# 첫 화면(기본 설정: pandas 백엔드, SQL 패널 꺼짐)에서 불러오면 안 되는 모듈
+DEFERRED = ["matplotlib", "seaborn", "scipy.stats", "plotly.express", "duckdb"]
+
+
+def app_imports(path):
+    # project.py 의 맨 위 import 모듈 이름
+    names = []
+    for node in ast.parse(open(path, encoding="utf-8").read()).body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return names
+
+
+def child(workdir):
+    # 새 프로세스 안에서 실행: 결과를 JSON 한 줄로 출력
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(workdir)
+    sys.path.insert(0, workdir)
+    for name in app_imports("project.py"):
+        importlib.import_module(name)
+    imported = time.perf_counter()
+    at = AppTest.from_file("project.py", default_timeout=600)
+    at.run()
+    rendered = time.perf_counter()
+    print(json.dumps({
+        "import_s": imported - start,
+        "render_s": rendered - imported,
+        "error": str(at.exception[0].value) if at.exception else None,
+        "loaded": [name for name in DEFERRED if name in sys.modules],
+    }))
+
+
+def measure(workdir):
+    env = {k: v for k, v in os.environ.items() if k not in ("EV_QUERY_BACKEND", "EV_SQL_PANEL")}
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", workdir], env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data-dir")
+    parser.add_argument("--rows", type=int, default=200_000, help="합성 통합_화재_통계.csv 행 수")
+    parser.add_argument("--ev-ratio", type=float, default=0.02)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_S)
+    parser.add_argument("--render-budget", type=float, default=RENDER_BUDGET_S)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    sys.path.insert(0, ROOT)
+    import synthetic
+
+    workdir = tempfile.mkdtemp()
+    try:
+        if args.data_dir:
+            for path in glob.glob(os.path.join(args.data_dir, "*.csv")):
+                shutil.copy(path, workdir)
+        else:
+            synthetic.write_dataset(workdir, args.rows, max(int(args.rows * args.ev_ratio), 1), reference_dir=ROOT)
+        for path in glob.glob(os.path.join(ROOT, "*.py")):
+            shutil.copy(path, workdir)
+
+        prepare = measure(workdir)
+        if prepare["error"]:
+            raise SystemExit(f"앱 실행 오류: {prepare['error']}")
+        print(f"준비 실행 (사이드카/적재 상태 생성): import {prepare['import_s']:.2f}s, "
+              f"첫 화면 {prepare['render_s']:.2f}s")
+        runs = [measure(workdir) for _ in range(args.repeat)]
+        import_s = statistics.median(run["import_s"] for run in runs)
+        render_s = statistics.median(run["render_s"] for run in runs)
+        loaded = sorted({name for run in runs for name in run["loaded"]})
+        print(f"{'':>8} {'median':>8} {'budget':>8}")
+        print(f"{'import':>8} {import_s:>7.2f}s {args.import_budget:>7.2f}s")
+        print(f"{'render':>8} {render_s:>7.2f}s {args.render_budget:>7.2f}s")
+        print(f"{'total':>8} {import_s + render_s:>7.2f}s")
+        failures = []
+        if import_s > args.import_budget:
+            failures.append(f"import {import_s:.2f}s > {args.import_budget:.2f}s")
+        if render_s > args.render_budget:
+            failures.append(f"첫 화면 {render_s:.2f}s > {args.render_budget:.2f}s")
+        if loaded:
+            failures.append(f"첫 화면에 불필요한 모듈: {', '.join(loaded)}")
+        if failures:
+            print("예산 초과: " + " · ".join(failures))
+            raise SystemExit(1)
+        print("예산 이내")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
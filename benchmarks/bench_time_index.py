@@ -0,0 +1,96 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import compaction  # noqa: E402
+import data_loader  # noqa: E402
+import synthetic  # noqa: E402
+import time_index  # noqa: E402
+
+
+# ===== 시기별 분포: 전체 스캔 vs 날짜 정렬 인덱스 =====
+# 임의 기간(+ 장소소분류 조건)의 월별/요일/시간대 건수를, datetime 컬럼 전체에 비교 마스크를 씌우는 pandas 경로와
+# time_index.TimeIndex(정렬된 날짜의 이진 탐색 + 구간 조각 bincount) 로 계산해 시간과 결과를 비교한다.
+# 사용법: python benchmarks/bench_time_index.py [--sizes 1000000 5000000] [--queries 20]
+def make_total_frame(rows, seed=0):
+    # 통합 화재 로그의 차량 화재 프레임 (로더가 캐시에 올리는 압축 형태: 일시는 분 단위 int32)
+    rng = np.random.default_rng(seed)
+    places = np.asarray(data_loader.VEHICLE_PLACES, dtype=object)[rng.integers(0, len(data_loader.VEHICLE_PLACES), rows)]
+    df = pd.DataFrame({
+        "일시": synthetic.random_times(rng, rows, "2019-01-01", "2024-12-31"),
+        "장소소분류": pd.Categorical(places),
+    })
+    return compaction.compact(df, data_loader.schema_for(data_loader.fire_total))
+
+
+def random_queries(n, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2019-01-01", "2024-12-31", freq="D")
+    queries = []
+    for _ in range(n):
+        a, b = np.sort(rng.integers(0, len(days), 2))
+        place = [data_loader.VEHICLE_PLACES[rng.integers(0, len(data_loader.VEHICLE_PLACES))]]
+        queries.append((days[a], days[b], {"장소소분류": place} if rng.random() < 0.5 else None))
+    return queries
+
+
+def scan_path(df, start, end, filters):
+    # 매번 datetime 으로 되돌린 컬럼 전체를 비교한다 (인덱스 없이 필요한 최소 작업)
+    stamps = df["일시_dt"]
+    mask = (stamps >= start) & (stamps < end + pd.Timedelta(days=1))
+    if filters:
+        mask &= df["장소소분류"].isin(filters["장소소분류"])
+    selected = stamps[mask]
+    return {
+        "count": int(mask.sum()),
+        "monthly": selected.dt.to_period("M").value_counts().sort_index(),
+        "weekday": np.bincount(selected.dt.dayofweek, minlength=7),
+        "hour": np.bincount(selected.dt.hour, minlength=24),
+    }
+
+
+def same_result(scan, indexed):
+    monthly = indexed["monthly"][indexed["monthly"] > 0]
+    return (
+        scan["count"] == indexed["count"]
+        and (scan["monthly"].to_numpy() == monthly.to_numpy()).all()
+        and (scan["weekday"] == indexed["weekday"].to_numpy()).all()
+        and (scan["hour"] == indexed["hour"].to_numpy()).all()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    queries = random_queries(args.queries)
+    print(f"{'rows':>10} {'build':>8} {'index MB':>9} {'scan/q':>9} {'index/q':>9} {'speedup':>8}  same")
+    for rows in args.sizes:
+        df = make_total_frame(rows)
+        df["일시_dt"] = compaction.to_datetime(df["일시"])
+        start = time.perf_counter()
+        index = time_index.TimeIndex(df, "일시", ["장소소분류"])
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scans = [scan_path(df, *q) for q in queries]
+        scan_time = (time.perf_counter() - start) / len(queries)
+        start = time.perf_counter()
+        results = [index.summary(q[0], q[1], filters=q[2]) for q in queries]
+        index_time = (time.perf_counter() - start) / len(queries)
+
+        same = all(same_result(s, r) for s, r in zip(scans, results))
+        print(f"{rows:>10,} {build:>7.2f}s {index.nbytes / 1024 / 1024:>9.1f} {scan_time * 1000:>7.1f}ms "
+              f"{index_time * 1000:>7.1f}ms {scan_time / index_time:>7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data_loader  # noqa: E402
+import synthetic  # noqa: E402
+import validation  # noqa: E402
+
+
+# ===== 데이터 품질 검사 비용 =====
+# 합성 화재 로그(--rows 행)에 오류 행(--bad-ratio)을 섞어 CSV 로 쓰고, 청크 단위로 읽으면서
+#   parse : CSV 파싱 + 스키마 적용만 (검사 전 로더)
+#   read  : data_loader.iter_csv_chunks (같은 파싱 + 검사/격리)
+#   check : 파싱해 둔 청크에 validation.Quarantine.split 만 (검사 자체의 비용)
+# 을 비교한다. 격리/경고 건수가 넣은 오류 행 수와 같은지도 확인한다.
+#   통합 화재 로그 : 날짜 형식 오류 (격리)
+#   전기차 화재 로그: 날짜 형식 오류 / 연번 중복 / 연번 없음 (격리)
+#                    차량상태 오타 / 발화요인소분류 오타 / 대분류와 맞지 않는 소분류 (경고, 집계에 남음)
+# 사용법: python benchmarks/bench_validation.py [--rows 1000000 3000000] [--bad-ratio 0.001] [--repeat 3]
+def corrupt(df, bad_ratio, is_ev, seed=0):
+    # 홀수 위치에서만 골라 한 행에 오류 하나씩 (연번 중복은 바로 앞 행의 연번을 복사)
+    # 반환: (프레임, 격리될 행 수, 경고만 받을 행 수)
+    rng = np.random.default_rng(seed)
+    n_bad = max(int(len(df) * bad_ratio), 1)
+    rows = rng.choice(len(df) // 2, n_bad, replace=False) * 2 + 1
+    kind = rng.integers(0, 6 if is_ev else 1, n_bad)
+    date_col = "화재발생일" if is_ev else "일시"
+    df[date_col] = df[date_col].astype(object)
+    df.iloc[rows[kind == 0], df.columns.get_loc(date_col)] = "2023-02-30"
+    if not is_ev:
+        return df, n_bad, 0
+    serial = df.columns.get_loc("연번")
+    df.iloc[rows[kind == 1], serial] = df.iloc[rows[kind == 1] - 1, serial].to_numpy()
+    df[df.columns[serial]] = df.iloc[:, serial].astype(object)
+    df.iloc[rows[kind == 2], serial] = None
+    df.iloc[rows[kind == 3], df.columns.get_loc("차량상태")] = "충전 중"
+    df.iloc[rows[kind == 4], df.columns.get_loc("발화요인소분류")] = "담배꽁쵸"
+    df.iloc[rows[kind == 5], df.columns.get_loc("발화요인대분류")] = "방화"
+    df.iloc[rows[kind == 5], df.columns.get_loc("발화요인소분류")] = "담배꽁초"
+    return df, int((kind < 3).sum()), int((kind >= 3).sum())
+
+
+def parse_chunks(path):
+    # 검사 전 로더와 같은 파싱 (청크마다 파싱 전 날짜 문자열도 함께)
+    schema = data_loader.schema_for(path)
+    for chunk in pd.read_csv(path, encoding="utf-8-sig", dtype=data_loader.read_dtype(schema),
+                             chunksize=data_loader.CHUNK_ROWS):
+        raw = chunk[[c for c in [*schema.get("dates", []), *schema.get("numbers", {})] if c in chunk.columns]]
+        yield data_loader.apply_schema(chunk, schema), raw
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def run(path, repeat):
+    schema = data_loader.schema_for(path)
+
+    def read():
+        quarantine = validation.Quarantine(path, schema)
+        rows = sum(len(chunk) for chunk in data_loader.iter_csv_chunks(path, quarantine=quarantine))
+        return rows, quarantine
+
+    def check():
+        quarantine = validation.Quarantine(path, schema)
+        for chunk, raw in chunks:
+            quarantine.split(chunk, raw)
+        return quarantine
+
+    parse_time, _ = timed(lambda: sum(len(chunk) for chunk, _ in parse_chunks(path)), repeat)
+    read_time, (kept, quarantine) = timed(read, repeat)
+    chunks = list(parse_chunks(path))
+    check_time, _ = timed(check, repeat)
+    return parse_time, read_time, check_time, kept, quarantine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 3_000_000])
+    parser.add_argument("--bad-ratio", type=float, default=0.001)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        print(f"{'file':>8} {'rows':>10} {'parse':>8} {'read':>8} {'check':>8} {'overhead':>9} "
+              f"{'bad':>6} {'quarantined':>11} {'warn':>6} {'warned':>7}  same")
+        for n in args.rows:
+            # 합성 데이터에 원래 섞는 목록 밖 값(synthetic.UNSEEN)은 빼고 넣은 오류만 센다.
+            make_ev = lambda rows: synthetic.fire_ev_frame(rows, unseen_ratio=0)
+            for name, make, is_ev in [(data_loader.fire_total, synthetic.fire_total_frame, False),
+                                      (data_loader.fire_EV, make_ev, True)]:
+                path = os.path.join(workdir, name)
+                df, n_bad, n_warn = corrupt(make(n), args.bad_ratio, is_ev)
+                synthetic.write_csv(df, path)
+                parse_time, read_time, check_time, kept, quarantine = run(path, args.repeat)
+                report = quarantine.report()
+                same = report["quarantined"] == n_bad and report["warned"] == n_warn and kept == n - n_bad
+                print(f"{'EV' if is_ev else 'total':>8} {n:>10,} {parse_time:>7.2f}s {read_time:>7.2f}s "
+                      f"{check_time:>7.2f}s {check_time / parse_time:>8.1%} {n_bad:>6,} {report['quarantined']:>11,} "
+                      f"{n_warn:>6,} {report['warned']:>7,}  {same}")
+                print(" " * 10 + ", ".join(f"{reason} {count:,}" for reason, count in report["reasons"].items()))
+                if report["warnings"]:
+                    print(" " * 10 + "경고: " + ", ".join(f"{reason} {count:,}"
+                                                         for reason, count in report["warnings"].items()))
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import synthetic  # noqa: E402
+import vehicle_dim  # noqa: E402
+
+
+# ===== 제조사/차명 차원: 행마다 이름 처리 + value_counts vs 정수 키 인덱스 조인 =====
+# 전국 차명 목록 규모의 합성 데이터(제조사/차명마다 표기 변형과 별칭)에서 제조사별 최초발화점/상황 건수와
+# 판매 10만대당 화재를 두 방식으로 계산해 시간과 결과를 비교한다.
+#   rows  : 행마다 이름을 정규화/별칭 치환한 뒤 제조사마다 value_counts, 판매표와 이름으로 merge
+#   index : vehicle_dim.VehicleIndex (고유 이름만 정규화 -> 정수 키, bincount 한 번 + 제조사키 배열 조인)
+# 사용법: python benchmarks/bench_vehicle_dim.py [--rows 100000 1000000] [--makers 300] [--models 50000]
+def make_catalog(n_makers, n_models, seed=0):
+    # 제조사마다 대표 이름, 별칭 하나, 표기 변형 / 차명마다 표기 변형 두 개
+    rng = np.random.default_rng(seed)
+    makers = [f"제조사{i}" for i in range(n_makers)]
+    aliases = {f"{i}번자동차": f"제조사{i}" for i in range(n_makers)}
+    maker_spellings = [[name, f"제조사 {i}", alias] for (i, name), alias in zip(enumerate(makers), aliases)]
+    model_maker = rng.integers(0, n_makers, n_models)
+    model_spellings = [[f"모델{j} EV", f"모델{j}ev", f"모델 {j}-EV"] for j in range(n_models)]
+    sales = pd.DataFrame({"제조사": makers, "누적판매": rng.integers(1000, 300000, n_makers),
+                          "전기차화재": rng.integers(0, 60, n_makers)})
+    return aliases, maker_spellings, model_maker, model_spellings, sales
+
+
+def make_incidents(rows, catalog, seed=0):
+    _, maker_spellings, model_maker, model_spellings, _ = catalog
+    rng = np.random.default_rng(seed + 1)
+    model = rng.integers(0, len(model_maker), rows)
+    variant = rng.integers(0, 3, rows)
+    maker_names = np.array([name for names in maker_spellings for name in names], dtype=object)
+    model_names = np.array([name for names in model_spellings for name in names], dtype=object)
+    return pd.DataFrame({
+        # 로더가 범주형으로 읽는 컬럼
+        "제조사": pd.Categorical(maker_names[model_maker[model] * 3 + variant]),
+        "차명": pd.Categorical(model_names[model * 3 + rng.integers(0, 3, rows)]),
+        "최초발화점": pd.Categorical(synthetic.weighted_choice(rng, synthetic.MAKER_CATEGORIES["최초발화점"], rows)),
+        "상황": pd.Categorical(synthetic.weighted_choice(rng, synthetic.MAKER_CATEGORIES["상황"], rows)),
+    })
+
+
+def rows_path(df, sales, aliases):
+    # 행마다 이름을 정규화하고 별칭을 대표 이름으로 바꾼 뒤 제조사마다 value_counts
+    alias_keys = dict(zip(vehicle_dim.match_keys(list(aliases)), vehicle_dim.match_keys(list(aliases.values()))))
+    names = dict(zip(vehicle_dim.match_keys(sales["제조사"]), sales["제조사"]))
+    keys = vehicle_dim.match_keys(df["제조사"].astype(object))
+    keys = keys.map(alias_keys).fillna(keys)
+    df = df.assign(maker=keys.map(names).to_numpy())
+    result = {}
+    for col in vehicle_dim.CATEGORY_COLUMNS:
+        result[col] = pd.DataFrame({maker: group[col].value_counts() for maker, group in df.groupby("maker")}).T
+    fires = df["maker"].value_counts().rename("화재건수")
+    table = sales.merge(fires, left_on="제조사", right_index=True, how="left").fillna({"화재건수": 0})
+    table["화재_10만대당"] = (table["화재건수"] / table["누적판매"] * 100000).round(2)
+    return result, table.set_index("제조사")
+
+
+def index_path(df, sales, aliases):
+    index = vehicle_dim.VehicleIndex(df, sales, vehicle_dim.VehicleDim(aliases, vehicle_dim.MODEL_ALIASES))
+    return index, {col: index.crosstab(col) for col in vehicle_dim.CATEGORY_COLUMNS}, index.maker_table()
+
+
+def same_result(rows, indexed):
+    crosstabs, table = rows
+    _, index_crosstabs, index_table = indexed
+    index_table = index_table.set_index("제조사")
+    for col, crosstab in crosstabs.items():
+        other = index_crosstabs[col].loc[crosstab.index, crosstab.columns]
+        if not (crosstab.fillna(0).to_numpy() == other.to_numpy()).all():
+            return False
+    return (table["화재건수"] == index_table.loc[table.index, "화재건수"]).all() and np.allclose(
+        table["화재_10만대당"], index_table.loc[table.index, "화재_10만대당"])
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--makers", type=int, default=300)
+    parser.add_argument("--models", type=int, default=50_000)
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.makers, args.models)
+    aliases, sales = catalog[0], catalog[-1]
+    print(f"{'rows':>10} {'rows path':>10} {'index':>9} {'build':>9} {'speedup':>8} {'makers':>7} {'models':>7}  same")
+    for n in args.rows:
+        df = make_incidents(n, catalog)
+        rows_time, rows = timed(lambda: rows_path(df, sales, aliases))
+        index_time, indexed = timed(lambda: index_path(df, sales, aliases))
+        build_time, index = timed(lambda: vehicle_dim.VehicleIndex(df, sales, vehicle_dim.VehicleDim(aliases)))
+        print(f"{n:>10,} {rows_time * 1000:>8.0f}ms {index_time * 1000:>7.0f}ms {build_time * 1000:>7.0f}ms "
+              f"{rows_time / index_time:>7.1f}x {index.n_makers:>7,} {index.n_models:>7,}  {same_result(rows, indexed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+# ===== 메모리 압축 표현 =====
+# 로더가 프로세스 캐시에 올리는 프레임을 스키마대로 줄인다.
+# - category 컬럼 : 같은 데이터 폴더의 파일들이 컬럼 이름별 어휘(Vocabularies)를 함께 쓴다.
+#                   전기차/통합 로그의 같은 이름 컬럼(시도, 발화요인소분류 ...)은 같은 범주 목록을 써서
+#                   코드가 프레임 사이에서 그대로 통한다. 새 값은 어휘 끝에 덧붙이기만 하므로
+#                   이미 만든 코드는 바뀌지 않는다. 어휘는 로더가 폴더별로 만들어 넘기고 캐시와 함께 비우므로
+#                   다른 데이터셋의 값은 섞이지 않는다. 허용값 목록(enums) 밖의 값도 (검사 경고일 뿐) 그대로 받는다.
+#                   어휘를 넘기지 않으면 프레임에 실제로 나온 값만 범주로 둔다.
+#                   어휘를 같이 쓰는 프레임에는 그 프레임에 없는 범주도 있으므로 category 컬럼의
+#                   groupby 는 observed=True 로, value_counts 는 0건을 빼고 쓴다.
+# - 날짜 컬럼     : 1970-01-01 기준 정수 (DATE_UNITS: 날짜는 일 단위, 시각이 있는 컬럼은 분 단위)
+#                   int32 로 저장하고 결측(NaT)이 있으면 nullable Int32. 되돌릴 때는 to_datetime().
+# - 연도          : int16 (결측이 있으면 nullable Int16)
+# 사용법: python compaction.py [데이터폴더]   # 컬럼별 메모리 전/후 보고
+DATE_UNITS = {"화재발생일": "D", "일시": "m"}
+YEAR_COLUMN = "연도"
+
+
+def frame_dtype(values):
+    # None/NaN 을 뺀 값을 처음 나온 순서대로 (value_counts 동률 순서가 예전과 같도록)
+    return pd.CategoricalDtype([v for v in dict.fromkeys(values) if not pd.isna(v)])
+
+
+class Vocabularies:
+    def __init__(self):
+        self.dtypes = {}
+        self.lock = threading.Lock()
+
+    def dtype(self, col, values):
+        # 어휘에 없던 값만 처음 나온 순서대로 끝에 붙인다. 같은 어휘면 같은 CategoricalDtype 객체를 돌려준다.
+        with self.lock:
+            dtype = self.dtypes.get(col)
+            known = set() if dtype is None else set(dtype.categories)
+            new = [v for v in frame_dtype(values).categories if v not in known]
+            if dtype is None or new:
+                categories = new if dtype is None else [*dtype.categories, *new]
+                dtype = self.dtypes[col] = pd.CategoricalDtype(categories)
+            return dtype
+
+
+def encode_category(series, vocabularies=None):
+    # 범주 순서까지 같아야 코드가 같다 (순서 없는 CategoricalDtype 의 == 는 순서를 보지 않는다)
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        values = series.unique()
+        return series.astype(frame_dtype(values) if vocabularies is None else vocabularies.dtype(series.name, values))
+    series = series.cat.remove_unused_categories()
+    if vocabularies is None:
+        return series
+    dtype = vocabularies.dtype(series.name, series.cat.categories)
+    if series.cat.categories.equals(dtype.categories):
+        return series
+    # astype 는 순서만 다른 범주를 같은 dtype 으로 보고 그대로 두므로 set_categories 로 코드를 다시 매긴다.
+    return series.cat.set_categories(dtype.categories)
+
+
+def small_int(series, dtype):
+    # 결측이 없으면 numpy 정수, 있으면 pandas nullable 정수
+    if series.isna().any():
+        return series.astype(dtype.capitalize())
+    return series.astype(dtype)
+
+
+def to_numbers(series, unit):
+    values = pd.to_datetime(series, errors="coerce").to_numpy(dtype="datetime64[ns]")
+    missing = np.isnat(values)
+    numbers = values.astype(f"datetime64[{unit}]").astype(np.int64)
+    numbers[missing] = 0
+    if len(numbers) and (numbers.min() < np.iinfo(np.int32).min or numbers.max() > np.iinfo(np.int32).max):
+        raise ValueError(f"{series.name}: int32 범위를 넘는 날짜가 있습니다")
+    if missing.any():
+        return pd.Series(pd.arrays.IntegerArray(numbers.astype(np.int32), missing),
+                         index=series.index, name=series.name)
+    return pd.Series(numbers.astype(np.int32), index=series.index, name=series.name)
+
+
+def to_datetime(series, unit=None):
+    # 압축된 날짜 컬럼을 datetime64 로 되돌린다.
+    unit = unit or DATE_UNITS[series.name]
+    return pd.to_datetime(series.astype("Int64"), unit=unit)
+
+
+def compact(df, schema, vocabularies=None):
+    columns = {}
+    for col, kind in schema.get("dtype", {}).items():
+        if kind == "category" and col in df.columns:
+            columns[col] = encode_category(df[col], vocabularies)
+    for col in schema.get("dates", []):
+        if col in df.columns:
+            columns[col] = to_numbers(df[col], DATE_UNITS.get(col, "D"))
+    if YEAR_COLUMN in df.columns and pd.api.types.is_numeric_dtype(df[YEAR_COLUMN]):
+        columns[YEAR_COLUMN] = small_int(df[YEAR_COLUMN], "int16")
+    if not columns:
+        return df
+    return df.assign(**columns)
+
+
+def memory_report(frames):
+    # frames: {"단계 이름": DataFrame}. 컬럼별 dtype 과 MB, 마지막 단계의 첫 단계 대비 비율
+    stages = list(frames)
+    columns = list(dict.fromkeys(col for df in frames.values() for col in df.columns))
+    rows = []
+    for col in columns:
+        row = {"컬럼": col}
+        for stage in stages:
+            df = frames[stage]
+            if col in df.columns:
+                row[f"{stage} dtype"] = str(df[col].dtype)
+                row[f"{stage} MB"] = df[col].memory_usage(index=False, deep=True) / 1024 / 1024
+        rows.append(row)
+    table = pd.DataFrame(rows)
+    total = {"컬럼": "합계"}
+    for stage in stages:
+        total[f"{stage} dtype"] = ""
+        total[f"{stage} MB"] = table[f"{stage} MB"].sum()
+    table = pd.concat([table, pd.DataFrame([total])], ignore_index=True)
+    first, last = f"{stages[0]} MB", f"{stages[-1]} MB"
+    table["비율"] = (table[last] / table[first]).round(3)
+    return table
+
+
+def main():
+    import data_loader
+
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "."
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_columns", 20)
+    for name in [data_loader.fire_EV, data_loader.fire_total]:
+        path = os.path.join(data_dir, name)
+        if not os.path.exists(path):
+            print(f"\n[{name}] 파일 없음")
+            continue
+        schema = data_loader.schema_for(path)
+        # 문자열 그대로 → 파일 스키마 적용 → 공유 어휘/정수 날짜로 압축
+        raw = data_loader.apply_schema(pd.read_csv(path, encoding="utf-8-sig"), schema)
+        typed = data_loader.parse_csv(path)
+        compacted = compact(typed, schema, data_loader.vocabularies_for(path))
+        report = memory_report({"원본": raw, "스키마": typed, "압축": compacted})
+        print(f"\n[{name}] {len(raw):,}행")
+        print(report.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
+if __name__ == "__main__":
+    main()
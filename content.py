@@ -0,0 +1,283 @@
+import pandas as pd
+
+import analysis
+import figures
+import rate_stats
+import regional_index
+import render_layer
+
+# ===== 탭별 표시 내용 (KPI 카드 + Figure) =====
+# project.py (Streamlit) 와 snapshot.py (정적 내보내기) 가 같은 카드/그래프를 보여주도록 한 곳에서 만든다.
+# 차트는 (figures 생성 함수, 인자) 로 돌려준다. project.py 는 그리는 시간을 계측하면서 만들고,
+# snapshot.py 는 바로 만들어 저장한다.
+
+# ===== KPI 카드 스타일 =====
+KPI_STYLE = """
+<style>
+.kpi-card {
+    padding: 20px;
+    border-radius: 15px;
+    color: white;
+    text-align: center;
+    box-shadow: 2px 2px 12px rgba(0,0,0,0.15);
+    margin: 10px;
+}
+.kpi-title {
+    font-size: 16px;
+    font-weight: 600;
+    margin-bottom: 8px;
+}
+.kpi-value {
+    font-size: 28px;
+    font-weight: bold;
+}
+.kpi-1 { background: linear-gradient(135deg, #6a11cb, #2575fc); }
+.kpi-2 { background: linear-gradient(135deg, #fff176, #dd2476); }
+.kpi-3 { background: linear-gradient(135deg, #11998e, #38ef7d); }
+</style>
+"""
+
+
+def kpi_card_html(i, title, value):
+    return f"""
+            <div class="kpi-card kpi-{i}">
+                <div class="kpi-title">{title}</div>
+                <div class="kpi-value">{value}</div>
+            </div>
+            """
+
+
+def top_donut(counts):
+    return render_layer.top_n(counts, render_layer.DONUT_TOP_N)
+
+
+# ===== 신뢰구간/추세 문구 =====
+# 그래프의 오차 막대는 95% 신뢰구간 (정확 포아송), 비교는 화재율 비와 p값으로 적는다 (rate_stats).
+INTERVAL_NOTE = "오차 막대: 95% 신뢰구간 (정확 포아송)"
+
+
+def ratio_text(row, col):
+    return (f"{rate_stats.format_interval(row[col], row[f'{col}_하한'], row[f'{col}_상한'], unit='배')}, "
+            f"{rate_stats.format_p(row[f'{col}_p'])}")
+
+
+def trend_text(row):
+    change = rate_stats.format_interval(row["연간변화율(%)"], row["하한(%)"], row["상한(%)"], digits=1, unit="%",
+                                        signed=True)
+    return f"{row['구분']} {change}, {rate_stats.format_p(row['p값'])}"
+
+
+def trend_notes(trend):
+    # 연도별 포아송 추세 (연간 변화율) 한 줄
+    return "연간 변화율 (포아송 추세): " + " · ".join(trend_text(row) for row in trend.to_dict("records"))
+
+
+# ==============================
+# Tab1: 전체 데이터 KPI
+# ==============================
+def tab1(counts, df_car_info):
+    # counts: ingest 큐브의 (연도, 차종, 전기차) 화재건수
+    fire = analysis.fire_summary(counts, df_car_info)
+    registration = analysis.registration_summary(df_car_info)
+
+    # ===== 연도별 화재 데이터 준비 =====
+    df_yearly = fire["yearly"]
+    df_fire_count = df_yearly[df_yearly["전체"].notna()].reset_index()
+
+    # 연도별 등록대수 & 1만대당 화재건수 (집계 큐브) + 95% 신뢰구간
+    ev_registered = df_yearly["전기차등록대수"].dropna()
+    ice_registered = df_yearly["내연기관등록대수"].dropna()
+    ev_fire_per_100k = df_yearly["EV_1만대당"]
+    ice_fire_per_100k = df_yearly["내연기관_1만대당"]
+    ev_interval = (df_yearly["EV_1만대당_하한"], df_yearly["EV_1만대당_상한"])
+    ice_interval = (df_yearly["내연기관_1만대당_하한"], df_yearly["내연기관_1만대당_상한"])
+
+    return {
+        "fire_kpis": [
+            ("전체 차량 화재 건수", f"{fire['total_fire_count']:,} 건"),
+            ("전기차 화재 건수", f"{fire['ev_fire_count']:,} 건"),
+            ("전기차 화재 비율", f"{fire['ev_fire_ratio']}%"),
+        ],
+        "car_kpis": [
+            ("전체 차량 등록대수", f"{registration['total_registered']:,} 대"),
+            ("전기차 등록대수", f"{registration['ev_registered']:,} 대"),
+            ("전기차 등록 비율", f"{registration['ev_registered_ratio']}%"),
+        ],
+        "fig_fire": figures.fire_compare(df_fire_count),
+        "fig_car": figures.car_compare(registration["registrations"]),
+        "fig_ev": figures.registered_vs_rate(ev_registered, ev_fire_per_100k, "전기차", "royalblue", "tomato",
+                                             ev_interval),
+        "fig_ice": figures.registered_vs_rate(ice_registered, ice_fire_per_100k, "내연기관", "seagreen", "orange",
+                                              ice_interval),
+        "rate_notes": tab1_notes(df_yearly, fire["trend"]),
+    }
+
+
+def tab1_notes(df_yearly, trend):
+    # 마지막 비교 가능 연도의 전기차/내연기관 화재율 비와 전년 대비, 전체 기간 추세
+    notes = [INTERVAL_NOTE]
+    known = df_yearly.dropna(subset=["화재율비(EV/내연기관)"])
+    if not known.empty:
+        year, row = known.index[-1], known.iloc[-1]
+        notes.append(f"{year}년 전기차/내연기관 1만대당 화재 비: {ratio_text(row, '화재율비(EV/내연기관)')}")
+        yoy = [f"{label} {ratio_text(row, f'{key}_전년대비')}"
+               for label, key in [("전기차", "EV"), ("내연기관", "내연기관")] if pd.notna(row[f"{key}_전년대비"])]
+        if yoy:
+            notes.append(f"{year}년 전년 대비 1만대당 화재 비: " + " · ".join(yoy))
+    notes.append(trend_notes(trend))
+    return notes
+
+
+# ==============================
+# Tab2: 필터 적용 분석
+# ==============================
+def tab2_kpis(result):
+    return [
+        ("전기차 총 화재 건수", f"{result['total_count']:,} 건"),
+        ("필터 적용 후 건수", f"{result['filtered_count']:,} 건"),
+        ("필터데이터/전체 비율", f"{result['filter_ratio']}%"),
+    ]
+
+
+def tab2_charts(result):
+    # 발화요인 차트는 선택된 필터에 해당하는 데이터가 없으면 None
+    subcause = result["subcause_counts"]
+    return {
+        "subcause": (figures.subcause_bar, render_layer.top_n(subcause)) if not subcause.empty else None,
+        "status": (figures.donut, top_donut(result["status_counts"]), "차량상태별 비율 (필터 적용)"),
+        "filter_compare": (figures.filter_compare, result["compare_df"]),
+    }
+
+
+# ==============================
+# Tab3: 제조사별 화재, 최초발화점, 해외 비교
+# ==============================
+def tab3(vehicles, df_foreign_fire, df_manufac_fire, df_yearly=None):
+    # vehicles: vehicle_dim.VehicleIndex (차종별 화재 + 점유율 표를 제조사키로 이은 인덱스)
+    # df_yearly (Tab1 연도별 표) 가 있으면 해외 비교에 한국 대비 화재율 비와 신뢰구간을 붙인다.
+    maker = analysis.maker_summary(vehicles)
+    df_selected = analysis.foreign_comparison(df_foreign_fire, df_yearly=df_yearly)
+    df_manufac_rates = analysis.manufacturer_rates(df_manufac_fire)
+
+    return {
+        "safety_kpis": [
+            ("총 화재 건수", f"{maker['total_count']:,} 건"),
+            ("고전압배터리 중 주행중(충돌)이 아닌 것", f"{maker['battery_not_collision_count']:,} 건"),
+            ("비율", f"{maker['battery_not_collision_ratio']}%"),
+        ],
+        "fig_manufacturer": figures.manufacturer_bar(render_layer.top_n(maker["manufacturer_counts"])),
+        "fig_manufacturer_compare": figures.manufacturer_compare(df_manufac_rates),
+        "rate_notes": manufacturer_notes(df_manufac_rates),
+        "fig_origin": figures.donut(top_donut(maker["fire_origin_counts"]), "최초발화점"),
+        "fig_situation": figures.donut(top_donut(maker["situation_counts"]), "상황"),
+        "fig_maker_origin": figures.maker_breakdown(top_makers(maker["maker_origin"]), "제조사별 최초발화점"),
+        "fig_maker_situation": figures.maker_breakdown(top_makers(maker["maker_situation"]), "제조사별 상황"),
+        "maker_notes": maker_notes(maker),
+        "fig_foreign": figures.foreign_bar(df_selected),
+    }
+
+
+def top_makers(crosstab):
+    # 화재가 있는 제조사만, 건수가 많은 순으로 상위 TOP_N 개
+    totals = crosstab.sum(axis=1)
+    return crosstab.loc[totals[totals > 0].sort_values(ascending=False, kind="stable").index[:render_layer.TOP_N]]
+
+
+def maker_notes(maker):
+    # 차종별 화재와 점유율 표(판매대수)가 제조사키로 이어진 정도와, 판매 10만대당 화재가 높은 제조사
+    makers = maker["makers"]
+    joined = makers[makers["누적판매"].notna() & (makers["화재건수"] > 0)]
+    notes = [f"차종별 화재 {maker['total_count']:,}건 중 {int(joined['화재건수'].sum()):,}건이 "
+             f"점유율 표의 판매대수와 연결됩니다 (제조사 {len(joined)}곳, 별칭은 대표 이름으로 합침)."]
+    if len(joined):
+        col = "화재_10만대당"
+        top = joined.sort_values(col, ascending=False, kind="stable").head(3)
+        notes.append("판매 10만대당 화재 (차종별 화재 기준) 상위: " + " · ".join(
+            f"{row['제조사']} {rate_stats.format_interval(row[col], row[f'{col}_하한'], row[f'{col}_상한'], unit=' 건')}"
+            for row in top.to_dict("records")))
+    return notes
+
+
+def manufacturer_notes(df_manufac_rates, alpha=rate_stats.ALPHA):
+    col = "화재율비(타사 대비)"
+    significant = df_manufac_rates[df_manufac_rates[f"{col}_p"] < alpha]
+    if significant.empty:
+        return [INTERVAL_NOTE, f"나머지 제조사 대비 전기차 화재율이 유의하게(p<{alpha}) 다른 제조사는 없습니다."]
+    return [INTERVAL_NOTE, f"나머지 제조사 대비 전기차 화재율이 유의하게(p<{alpha}) 다른 제조사: "
+            + " · ".join(f"{row['제조사']} {ratio_text(row, col)}" for row in significant.to_dict("records"))]
+
+
+# ==============================
+# 지역별: 전국 → 시도 → 시군구 드릴다운
+# ==============================
+def region_level(sido):
+    return "시도" if sido is None or sido == regional_index.NATION else "시군구"
+
+
+def region_kpis(summary):
+    return [
+        (f"{summary['region']} 화재 건수 (필터 적용)", f"{summary['fire_count']:,} 건"),
+        ("전국 대비 비율", f"{summary['national_share']}%"),
+        ("전기차 1만대당 화재",
+         f"{summary['fire_per_10k']} 건" if summary["fire_per_10k"] is not None else "등록대수 자료 없음"),
+    ]
+
+
+def region_charts(summary, sido):
+    level = region_level(sido)
+    return {
+        "breakdown": (figures.region_bar, summary["regions"].head(render_layer.TOP_N),
+                      f"{summary['region']} {level}별 전기차 화재"),
+        "trend": (figures.region_trend, summary["by_year"], summary["region"],
+                  (summary["by_year_ci"]["하한"], summary["by_year_ci"]["상한"])),
+    }
+
+
+def region_notes(summary):
+    notes = [INTERVAL_NOTE]
+    if summary["fire_per_10k_ci"] is not None:
+        rate = rate_stats.format_interval(summary["fire_per_10k"], *summary["fire_per_10k_ci"], unit=" 건")
+        notes.append(f"{summary['region']} 전기차 1만대당 화재 {rate}")
+    notes.append(trend_notes(summary["trend"]))
+    return notes
+
+
+# ==============================
+# 시기별: 기간 필터 + 월/요일/시간대 분포
+# ==============================
+def temporal_kpis(summary):
+    peak = "-"
+    if summary["peak_weekday"] is not None:
+        peak = f"{summary['peak_weekday']}요일"
+        if summary["peak_hour"] is not None:
+            peak += f" · {summary['peak_hour']}시"
+    return [
+        ("기간 내 화재 건수", f"{summary['count']:,} 건"),
+        ("전체 대비 비율", f"{summary['share']}%"),
+        ("가장 많은 요일/시간대", peak),
+    ]
+
+
+def temporal_charts(summary, label):
+    # 시간대 분포는 시각이 있는 로그(통합 화재 로그 일시)만. 선택 구간에 데이터가 없으면 None
+    if not summary["count"]:
+        return None
+    hour = summary["hour"]
+    return {
+        "monthly": (figures.monthly_trend, summary["monthly"], f"{label} 월별 화재 건수"),
+        "month_of_year": (figures.period_bar, summary["month_of_year"], f"{label} 월별 분포", "월", "orange"),
+        "weekday": (figures.period_bar, summary["weekday"], f"{label} 요일별 분포", "요일", "royalblue"),
+        "hour": ((figures.period_bar, hour, f"{label} 시간대별 분포", "시", "seagreen")
+                 if hour is not None else None),
+    }
+
+
+# ==============================
+# 데이터 품질 검사
+# ==============================
+def quality_kpis(summary):
+    return [
+        ("검사한 행", f"{summary['rows']:,} 행"),
+        ("격리한 행", f"{summary['quarantined']:,} 행"),
+        ("격리 비율", f"{summary['quarantined_ratio']}%"),
+    ]
@@ -0,0 +1,455 @@
+import io
+import os
+import sys
+import threading
+
+import pandas as pd
+
+import compaction
+import parquet_store
+import validation
+
+# ===== 파일 경로 =====
+fire_total = "통합_화재_통계.csv"
+fire_EV    = "전기차_화재_통계.csv"
+car_info   = "자동차_등록_대수_현황.csv"
+car_maker  = "차종별_전기차_화재.csv"
+foreign_fire = "해외_전기차_화재.csv"
+manufac_fire = "전기차_제조사_점유율_화재.csv"
+# 선택 파일: 시도(/시군구)별 전기차 등록대수. 있으면 지역별 1만대당 화재를 계산한다.
+region_registrations = "지역별_전기차_등록_현황.csv"
+
+DATA_FILES = [fire_total, fire_EV, car_info, car_maker, foreign_fire, manufac_fire]
+
+# 통합 화재 로그에서 대시보드가 쓰는 차량 화재 장소와 컬럼
+VEHICLE_PLACES  = ["승용자동차", "화물자동차", "버스"]
+VEHICLE_COLUMNS = ["장소소분류", "연도"]
+
+# 청크 단위로 읽을 때 한 번에 파싱하는 행 수 (최대 메모리 사용량을 결정)
+CHUNK_ROWS = 200_000
+
+# ===== 허용값 (데이터 품질 검사) =====
+# 전기차 화재 로그의 발화요인 대분류 -> 소분류, 차량상태. 배포된 데이터에 나온 값만 모은 목록이라 실제 코드표보다 좁다.
+# 목록에 없는 값이나 대분류와 맞지 않는 소분류는 경고로만 세고 행은 집계에 남긴다 (새 코드인지 오타인지 보고 목록을 고친다).
+FIRE_CAUSES = {
+    "미상": ["미상"],
+    "전기적 요인": ["접촉불량에 의한 단락", "기타(전기적요인)", "미확인단락", "과부하/과전류", "절연열화에 의한 단락",
+                "압착,손상에 의한 단락", "반단선", "트래킹에 의한 단락"],
+    "부주의": ["담배꽁초", "용접, 절단, 연마", "불씨,불꽃,화원방치", "쓰레기 소각", "기기(전기, 기계 등) 사용.설치부주의",
+            "가연물 근접방치"],
+    "교통사고": ["교통사고"],
+    "기타": ["기타"],
+    "기계적 요인": ["자동제어 실패", "과열, 과부하", "기타(기계적요인)"],
+    "제품결함": ["기타(제품결함)", "제조상결함", "설계상결함"],
+    "화학적 요인": ["자연발화", "화학적 폭발"],
+    "방화": ["방화"],
+}
+VEHICLE_STATES = ["운행중", "주차", "충전중", "정차", "견인중"]
+
+# ===== 파일별 스키마 =====
+# dtype     : 명시적 컬럼 타입 (저카디널리티 문자열은 category)
+# dates     : 미리 파싱해 둘 날짜 컬럼 (잘못된 값은 NaT -> 격리)
+# numbers   : 숫자로 파싱할 키 컬럼과 타입 (비었거나 숫자가 아니면 격리)
+# year_from : 연도 컬럼을 만들 날짜 컬럼
+# unique / ranges / at_most : 데이터 품질 검사 규칙 (validation.py). 어긋난 행은 집계 전에 격리한다.
+# enums / pairs             : 허용값 목록, 대분류-소분류 짝. 어긋나도 경고만 하고 행은 남긴다.
+SCHEMAS = {
+    fire_total: {
+        "dtype": {
+            "시도": "category",
+            "시군구": "category",
+            "장소대분류": "category",
+            "장소중분류": "category",
+            "장소소분류": "category",
+            "발화요인대분류": "category",
+            "발화요인소분류": "category",
+        },
+        "dates": ["일시"],
+        "year_from": "일시",
+    },
+    fire_EV: {
+        "dtype": {
+            "시도": "category",
+            "시군구": "category",
+            "발화요인대분류": "category",
+            "발화요인소분류": "category",
+            "차량장소": "category",
+            "장소소분류": "category",
+            "지상_지하여부": "category",
+            "차량상태": "category",
+            "차량발화지점": "category",
+        },
+        "dates": ["화재발생일"],
+        "numbers": {"연번": "int32"},
+        "year_from": "화재발생일",
+        "enums": {
+            "발화요인대분류": list(FIRE_CAUSES),
+            "발화요인소분류": [sub for subs in FIRE_CAUSES.values() for sub in subs],
+            "차량상태": VEHICLE_STATES,
+        },
+        "pairs": {"발화요인소분류": ["발화요인대분류", FIRE_CAUSES]},
+        "unique": "연번",
+    },
+    car_info: {
+        "dtype": {
+            "연도": "int16",
+            "전체차량등록대수": "int64",
+            "전기차등록대수": "int64",
+        },
+        "unique": "연도",
+        "ranges": {"전체차량등록대수": (1, None), "전기차등록대수": (0, None)},
+        "at_most": {"전기차등록대수": "전체차량등록대수"},
+    },
+    car_maker: {
+        "dtype": {
+            "연도": "int16",
+            "제조사": "category",
+            "차명": "category",
+            "최초발화점": "category",
+            "상황": "category",
+        },
+    },
+    foreign_fire: {
+        "dtype": {
+            "국가": "category",
+            "내연기관차(만대당)": "float64",
+            "전기차(만대당)": "float64",
+            "전기차화재": "float64",
+            "전체화재": "float64",
+            "전기차등록수": "float64",
+        },
+    },
+    region_registrations: {
+        "dtype": {
+            "연도": "int16",
+            "시도": "category",
+            "시군구": "category",
+            "전기차등록대수": "int64",
+        },
+        "ranges": {"전기차등록대수": (0, None)},
+    },
+    manufac_fire: {
+        "dtype": {
+            "제조사": "string",
+            "누적판매": "int64",
+            "점유율": "int16",
+            "전기차화재": "int32",
+            "전기차10만대당": "int32",
+            "배터리발화화재": "int32",
+            "배터리10만대당": "int32",
+        },
+    },
+}
+
+# ===== 프로세스 단위 캐시 =====
+# Streamlit 은 세션마다 스크립트를 다시 실행하지만 모듈은 프로세스당 한 번만 import 된다.
+# (경로, 컬럼) 별로 (크기, 수정시각) 과 읽은 결과를 보관해 변경이 없으면 다시 읽지 않는다.
+# 캐시된 데이터는 모든 세션이 읽기 전용으로 공유한다. Copy-on-Write 가 켜져 있으면 얕은 복사본을
+# 내주므로, 세션이 받은 DataFrame 을 고쳐도 다른 세션이 보는 원본에는 영향이 없다.
+# Copy-on-Write 는 pandas 전역 설정이라 import 할 때 켜지 않고, 진입점(project.py, api.py, CLI)이
+# enable_copy_on_write() 로 켠다. 꺼져 있는 프로세스(노트북 등)에는 깊은 복사본을 내준다.
+_cache = {}
+_cache_lock = threading.Lock()
+_key_locks = {}
+# 데이터 폴더별 category 어휘 (compaction.Vocabularies). 캐시와 함께 비운다.
+_vocabularies = {}
+_convert_lock = threading.Lock()
+
+# 마지막으로 통합 화재 로그를 읽었을 때의 통계 (읽은 행, 남긴 행, 최대 RSS)
+last_read_stats = {}
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def schema_for(path):
+    # 파일 이름으로 스키마를 찾는다. 파티션 파일(통합_화재_통계_경기도_2023.csv 등)은 접두어로 찾는다.
+    name = os.path.basename(path)
+    if name in SCHEMAS:
+        return SCHEMAS[name]
+    for known, schema in SCHEMAS.items():
+        if name.startswith(os.path.splitext(known)[0]):
+            return schema
+    return {}
+
+
+def category_columns(path):
+    dtype = schema_for(path).get("dtype", {})
+    return [col for col, kind in dtype.items() if kind == "category"]
+
+
+def read_dtype(schema):
+    # 숫자 키 컬럼(numbers)은 문자열로 읽어 두고 apply_schema 에서 파싱한다 (빈 값/형식 오류 행을 격리하려고).
+    return {**schema.get("dtype", {}), **{col: str for col in schema.get("numbers", {})}}
+
+
+def apply_schema(df, schema):
+    for col in schema.get("dates", []):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    for col in schema.get("numbers", {}):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    year_from = schema.get("year_from")
+    if year_from in df.columns:
+        df["연도"] = df[year_from].dt.year
+    return df
+
+
+def parse_csv(path):
+    schema = schema_for(path)
+    df = pd.read_csv(path, encoding="utf-8-sig", dtype=read_dtype(schema))
+    return apply_schema(df, schema)
+
+
+def read_columns(path, header, columns):
+    # 요청 컬럼 + 연도를 만들 날짜 컬럼 + 품질 검사에 필요한 컬럼 (None 이면 전체)
+    if columns is None:
+        return None
+    schema = schema_for(path)
+    wanted = {*columns, *validation.rule_columns(schema)}
+    if "연도" in wanted and schema.get("year_from"):
+        wanted.add(schema["year_from"])
+    return [c for c in header if c in wanted]
+
+
+def checked(chunk, schema, quarantine):
+    # 스키마를 적용하고 품질 검사를 통과한 행만 남긴다. 날짜/숫자 키는 파싱 전 문자열을 격리 파일에 남긴다.
+    numbers = {col: kind for col, kind in schema.get("numbers", {}).items() if col in chunk.columns}
+    raw = chunk[[c for c in [*schema.get("dates", []), *numbers] if c in chunk.columns]]
+    return quarantine.split(apply_schema(chunk, schema), raw).astype(numbers)
+
+
+def iter_csv_chunks(path, columns=None, chunksize=CHUNK_ROWS, quarantine=None):
+    # 필요한 컬럼만 청크 단위로 파싱한다. 연도를 요청하면 원본 날짜 컬럼은 연도 계산 후 버린다.
+    # 청크마다 category 범주가 다르므로 합칠 때는 restore_categories 로 다시 맞춘다.
+    # 품질 검사(validation)에 어긋난 행은 내주지 않는다. 격리 내역이 필요하면 quarantine 을 넘긴다.
+    schema = schema_for(path)
+    if quarantine is None:
+        quarantine = validation.Quarantine(path, schema)
+    header = pd.read_csv(path, encoding="utf-8-sig", nrows=0).columns
+    reader = pd.read_csv(path, encoding="utf-8-sig", dtype=read_dtype(schema),
+                         usecols=read_columns(path, header, columns), chunksize=chunksize)
+    for chunk in reader:
+        chunk = checked(chunk, schema, quarantine)
+        if columns is not None:
+            chunk = chunk[[c for c in columns if c in chunk.columns]]
+        yield chunk
+
+
+def read_csv_tail(path, offset, columns=None, quarantine=None):
+    # offset 바이트 뒤에 덧붙여진 행만 읽는다. offset 은 이전에 읽은 파일 끝(줄바꿈 직후)이어야 한다.
+    # 품질 검사는 덧붙인 구간 안에서만 한다 (앞부분과 겹치는 연번은 ingest 의 워터마크가 거른다).
+    schema = schema_for(path)
+    if quarantine is None:
+        quarantine = validation.Quarantine(path, schema)
+    header = list(pd.read_csv(path, encoding="utf-8-sig", nrows=0).columns)
+    with open(path, "rb") as f:
+        if offset > 0:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                raise ValueError(f"{path}: 이전 읽기 위치가 줄 경계가 아닙니다")
+        data = f.read()
+    if not data.strip():
+        return pd.DataFrame(columns=columns or header), offset + len(data)
+    df = pd.read_csv(io.BytesIO(data), header=None, names=header, dtype=read_dtype(schema),
+                     usecols=read_columns(path, header, columns) or header)
+    df = checked(df, schema, quarantine)
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df, offset + len(data)
+
+
+def restore_categories(df, path):
+    for col in category_columns(path):
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+
+def concat_chunks(parts, path, columns):
+    if not parts:
+        return pd.read_csv(path, encoding="utf-8-sig", nrows=0, usecols=lambda c: c in columns)
+    return restore_categories(pd.concat(parts, ignore_index=True), path)
+
+
+def read_vehicle_fires_chunked(path=fire_total, places=VEHICLE_PLACES, columns=VEHICLE_COLUMNS,
+                               chunksize=CHUNK_ROWS):
+    # 장소소분류 조건과 연도 계산을 청크마다 적용해 전체 로그를 메모리에 올리지 않는다.
+    # rows_read 는 원본 CSV 행 수 (격리 행 포함), quarantined 는 품질 검사로 뺀 행 수
+    wanted_columns = list(dict.fromkeys([*columns, "장소소분류"]))
+    quarantine = validation.Quarantine(path, schema_for(path))
+    stats = {"rows_read": 0, "quarantined": 0, "rows_kept": 0}
+    parts = []
+    for chunk in iter_csv_chunks(path, wanted_columns, chunksize, quarantine):
+        chunk = chunk.loc[chunk["장소소분류"].isin(places), columns]
+        stats["rows_kept"] += len(chunk)
+        parts.append(chunk)
+    report = quarantine.report()
+    stats["rows_read"], stats["quarantined"] = report["rows"], report["quarantined"]
+    stats["peak_rss_mb"] = peak_rss_mb()
+    return concat_chunks(parts, path, columns), stats
+
+
+def read_vehicle_fires_parquet(path=fire_total, places=VEHICLE_PLACES, columns=VEHICLE_COLUMNS):
+    # Parquet 사이드카에서는 장소소분류 조건을 row group 단위로 밀어 넣어 읽는다.
+    ensure_parquet(path)
+    df = parquet_store.read(path, columns, filters=[("장소소분류", "in", list(places))],
+                            categories=category_columns(path))
+    # 사이드카에는 검사를 통과한 행만 있으므로 원본 행 수/격리 행 수는 품질 검사 요약에서 가져온다.
+    report = load_quality_report(path)
+    stats = {"rows_read": report["rows"], "quarantined": report["quarantined"], "rows_kept": len(df),
+             "peak_rss_mb": peak_rss_mb()}
+    return df, stats
+
+
+def convert_parquet(path, force=False):
+    # 품질 검사를 거친 청크로 사이드카를 만들고 격리 파일(.quarantine/)을 함께 기록한다.
+    # 변환했으면 검사 요약, 최신 상태라 건너뛰었으면 None
+    quarantine = validation.Quarantine(path, schema_for(path))
+    source = parquet_store.convert(path, lambda p: iter_csv_chunks(p, quarantine=quarantine), force,
+                                   quarantine.version)
+    if source is None:
+        return None
+    try:
+        return quarantine.save(source)
+    except OSError:
+        return {**quarantine.report(), "quarantine_file": None}
+
+
+def ensure_parquet(path, force=False):
+    # 원본(또는 검사 규칙)이 바뀌었으면 Parquet 사이드카를 다시 만들고 사이드카 경로를 돌려준다. 만들 수 없으면 OSError.
+    with _convert_lock:
+        convert_parquet(path, force)
+    return parquet_store.sidecar_path(path)
+
+
+def load_parquet(path, columns=None):
+    # 최신 Parquet 사이드카에서 필요한 컬럼만 읽는다. 사이드카를 쓸 수 없으면 CSV 로 대체.
+    try:
+        ensure_parquet(path)
+        return parquet_store.read(path, columns, categories=category_columns(path))
+    except OSError:
+        return concat_chunks(list(iter_csv_chunks(path, columns)), path, columns or [])
+
+
+def enable_copy_on_write():
+    pd.set_option("mode.copy_on_write", True)
+
+
+def share(value):
+    # Copy-on-Write 에서 얕은 복사본은 데이터를 공유하면서도, 세션이 컬럼을 추가/수정하면
+    # 그 세션 쪽에서만 복사가 일어나므로 캐시 원본은 바뀌지 않는다.
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not pd.get_option("mode.copy_on_write"))
+    return value
+
+
+def memoized(key, signature, compute):
+    # 같은 키를 여러 세션이 동시에 처음 요청해도 한 번만 계산한다 (키별 잠금).
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return share(cached[1])
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        with _cache_lock:
+            cached = _cache.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, compute())
+            with _cache_lock:
+                _cache[key] = cached
+    return share(cached[1])
+
+
+def cache_stats():
+    # 프로세스 캐시에 올라간 공유 데이터 (항목 수, DataFrame 메모리 합계 MB)
+    with _cache_lock:
+        values = [value for _, value in _cache.values()]
+    frames = [v for v in values if isinstance(v, (pd.DataFrame, pd.Series))]
+    size = sum(int(v.memory_usage(deep=True).sum()) if isinstance(v, pd.DataFrame)
+               else int(v.memory_usage(deep=True)) for v in frames)
+    size += sum(getattr(v, "nbytes", 0) for v in values if not isinstance(v, (pd.DataFrame, pd.Series)))
+    return {"entries": len(values), "mb": size / 1024 / 1024}
+
+
+def compact(df, path):
+    # 캐시에 올리는 프레임은 폴더별 공유 어휘 category / 정수 날짜 / int16 연도로 줄여 둔다 (compaction.py)
+    return compaction.compact(df, schema_for(path), vocabularies_for(path))
+
+
+def vocabularies_for(path):
+    folder = os.path.dirname(os.path.abspath(path))
+    with _cache_lock:
+        return _vocabularies.setdefault(folder, compaction.Vocabularies())
+
+
+def load_csv(path, columns=None):
+    signature = file_signature(path)
+    key = (signature[0], None if columns is None else tuple(columns))
+    return memoized(key, signature, lambda: compact(load_parquet(path, columns), path))
+
+
+def load_quality_report(path):
+    # 파일의 품질 검사 요약 (validation.Quarantine.report). 사이드카를 만들 때 기록한 요약을 읽고,
+    # 없거나 원본/규칙이 바뀌었으면 사이드카를 다시 만든다. 쓸 수 없는 폴더면 메모리에서만 검사한다.
+    def compute():
+        schema = schema_for(path)
+        report = validation.read_report(path)
+        if report is None or report["version"] != validation.rules_version(schema) \
+                or not parquet_store.matches_source(report["source"], path):
+            try:
+                with _convert_lock:
+                    report = convert_parquet(path, force=True)
+            except OSError:
+                quarantine = validation.Quarantine(path, schema)
+                for _ in iter_csv_chunks(path, quarantine.columns, quarantine=quarantine):
+                    pass
+                report = {**quarantine.report(), "quarantine_file": None}
+        return report
+
+    signature = file_signature(path)
+    return memoized((signature[0], "quality"), signature, compute)
+
+
+def load_vehicle_fires(path=fire_total, places=VEHICLE_PLACES, columns=VEHICLE_COLUMNS):
+    # 통합 화재 로그를 차량 화재(승용/화물/버스)만 남긴 축소 프레임으로 읽는다.
+    def compute():
+        try:
+            df, stats = read_vehicle_fires_parquet(path, places, columns)
+        except OSError:
+            df, stats = read_vehicle_fires_chunked(path, places, columns)
+        last_read_stats.update(stats)
+        return compact(df, path)
+
+    signature = file_signature(path)
+    key = (signature[0], "vehicle", tuple(places), tuple(columns))
+    return memoized(key, signature, compute)
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+        _vocabularies.clear()
+
+
+if __name__ == "__main__":
+    enable_copy_on_write()
+    # 사용법: python data_loader.py [통합_화재_통계.csv]  -> 청크 스트리밍 읽기 통계 출력
+    df, stats = read_vehicle_fires_chunked(sys.argv[1] if len(sys.argv) > 1 else fire_total)
+    print(f"읽은 행: {stats['rows_read']:,}")
+    print(f"격리한 행: {stats['quarantined']:,}")
+    print(f"남긴 행: {stats['rows_kept']:,}")
+    if stats["peak_rss_mb"] is not None:
+        print(f"최대 RSS: {stats['peak_rss_mb']:.1f} MB")
@@ -0,0 +1,418 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# ===== Plotly Figure 생성 =====
+# Streamlit 과 분리된 순수 Figure 생성 함수들. 데이터 준비는 호출하는 쪽에서 끝낸다.
+
+
+def error_bars(values, lower, upper, color=None):
+    # 95% 신뢰구간 (rate_stats) 을 표시값 기준 비대칭 오차 막대로. 구간이 없는 점(NaN)은 막대 없음.
+    values, lower, upper = (np.asarray(v, dtype=float) for v in (values, lower, upper))
+    return dict(type="data", symmetric=False, array=(upper - values).clip(min=0),
+                arrayminus=(values - lower).clip(min=0), thickness=1.5, width=4, color=color)
+
+
+def interval_of(df, col, color=None):
+    # df 에 <col>_하한/<col>_상한 (analysis 가 붙인 신뢰구간) 이 있으면 오차 막대
+    if f"{col}_하한" not in df.columns:
+        return None
+    return error_bars(df[col], df[f"{col}_하한"], df[f"{col}_상한"], color)
+
+
+# ==============================
+# Tab1
+# ==============================
+def fire_compare(df_fire_count):
+    # 🔥 화재 건수 시각화 (전체 건수 기준 + EV 비율 선)
+    fig_fire = go.Figure()
+    fig_fire.add_trace(go.Bar(
+        x=df_fire_count["연도"],
+        y=df_fire_count["EV"],
+        name="전기차 화재 건수 (건)",
+        marker_color="tomato"
+    ))
+    fig_fire.add_trace(go.Bar(
+        x=df_fire_count["연도"],
+        y=df_fire_count["비EV"],
+        name="전체 화재 건수 (건)",
+        marker_color="lightgray"
+    ))
+    fig_fire.add_trace(go.Scatter(
+        x=df_fire_count["연도"],
+        y=df_fire_count["EV비율(%)"],
+        name="전기차 화재 비율 (%)",
+        mode="lines+markers",
+        line=dict(color="green", width=2),
+        yaxis="y2"
+    ))
+    fig_fire.update_layout(
+        title="전체/전기차 화재 비교",
+        xaxis=dict(title="연도"),
+        yaxis=dict(title="화재 건수 (건)"),
+        yaxis2=dict(title="전기차 화재 비율 (%)", overlaying="y", side="right"),
+        barmode="stack",  # EV + 비EV 누적 표시
+        template="plotly_white",
+        height=500
+    )
+    return fig_fire
+
+
+def car_compare(df_car_info):
+    # 🚗 등록대수 시각화 (전체 등록대수 기준 + EV 등록 비율 선)
+    fig_car = go.Figure()
+    fig_car.add_trace(go.Bar(
+        x=df_car_info["연도"],
+        y=df_car_info["전기차등록대수"],
+        name="전기차 등록대수 (대)",
+        marker_color="orange"
+    ))
+    fig_car.add_trace(go.Bar(
+        x=df_car_info["연도"],
+        y=df_car_info["비EV등록대수"],
+        name="전체 차량 등록대수 (대)",
+        marker_color="lightblue"
+    ))
+    fig_car.add_trace(go.Scatter(
+        x=df_car_info["연도"],
+        y=df_car_info["전기차비율(%)"],
+        name="전기차 등록 비율 (%)",
+        mode="lines+markers",
+        line=dict(color="royalblue", width=2),
+        yaxis="y2"
+    ))
+    fig_car.update_layout(
+        title="전체/전기차 등록 비교",
+        xaxis=dict(title="연도"),
+        yaxis=dict(title="등록대수 (대)"),
+        yaxis2=dict(title="EV 등록 비율 (%)", overlaying="y", side="right"),
+        barmode="stack",
+        template="plotly_white",
+        height=500
+    )
+    return fig_car
+
+
+def registered_vs_rate(registered, fire_per_10k, label, bar_color, line_color, interval=None):
+    # 연도별 등록대수(막대) & 1만대당 화재(선), label 은 "전기차" / "내연기관"
+    # interval: (하한, 상한) 이면 1만대당 화재에 95% 신뢰구간 오차 막대
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=registered.index,
+        y=registered.values,
+        name=f"{label} 등록대수 (대)",
+        marker_color=bar_color,
+        yaxis="y1"
+    ))
+    fig.add_trace(go.Scatter(
+        x=fire_per_10k.index,
+        y=fire_per_10k.values,
+        name=f"{label} 화재 1만대당 (건)",
+        mode="lines+markers",
+        marker_color=line_color,
+        error_y=error_bars(fire_per_10k, *interval, color=line_color) if interval is not None else None,
+        yaxis="y2"
+    ))
+    fig.update_layout(
+        title=f"연도별 {label} 등록대수 & 1만대당 화재",
+        xaxis_title="연도",
+        yaxis=dict(title=f"{label} 등록대수 (대)", side="left"),
+        yaxis2=dict(title="1만대당 화재 (건)", overlaying="y", side="right"),
+        template="plotly_white"
+    )
+    return fig
+
+
+# ==============================
+# Tab2
+# ==============================
+def subcause_bar(ev_fire_subcause_filtered):
+    fig_subcause = go.Figure(go.Bar(
+        x=ev_fire_subcause_filtered.values,
+        y=ev_fire_subcause_filtered.index,
+        orientation='h',
+        text=ev_fire_subcause_filtered.values,
+        textposition='auto',
+        marker_color='orange'
+    ))
+    fig_subcause.update_layout(
+        xaxis_title="총량",
+        yaxis_title="발화요인",
+        template="plotly_white",
+        height=600
+    )
+    return fig_subcause
+
+
+def donut(counts, title):
+    fig_status = go.Figure(go.Pie(
+        labels=counts.index,
+        values=counts.values,
+        hole=0.4,  # 도넛
+        textinfo='percent+label'
+    ))
+    fig_status.update_layout(
+        title=title,
+        template="plotly_white",
+        height=400
+    )
+    return fig_status
+
+
+def filter_compare(compare_df):
+    # 비율 계산
+    ratio_by_year = (compare_df["필터 후"] / compare_df["필터 전"] * 100).round(2)
+
+    # Figure 생성
+    fig_combined = go.Figure()
+
+    # Bar - 필터 전/후
+    fig_combined.add_trace(go.Bar(
+        x=compare_df["연도"], y=compare_df["필터 전"],
+        name="필터 전 (건)",
+        marker_color="lightgray",
+        text=compare_df["필터 전"],
+        textposition='outside',
+        yaxis="y1"
+    ))
+    fig_combined.add_trace(go.Bar(
+        x=compare_df["연도"], y=compare_df["필터 후"],
+        name="필터 후 (건)",
+        marker_color="dodgerblue",
+        text=compare_df["필터 후"],
+        textposition='outside',
+        yaxis="y1"
+    ))
+    # Line - 필터 후 비율
+    fig_combined.add_trace(go.Scatter(
+        x=compare_df["연도"], y=ratio_by_year,
+        mode="lines+markers+text",
+        name="필터 후 비율 (%)",
+        text=ratio_by_year,
+        textposition="top center",
+        line=dict(color="green", width=2),
+        yaxis="y2"
+    ))
+    # Layout 설정 (2축)
+    fig_combined.update_layout(
+        title="필터 전/후 데이터 비교",
+        xaxis=dict(title="연도"),
+        yaxis=dict(title="필터 전/후 화재 (건)", side="left"),
+        yaxis2=dict(title="필터 전/후 비율 (%)", overlaying="y", side="right"),
+        barmode='group',
+        template="plotly_white"
+    )
+    return fig_combined
+
+
+# ==============================
+# Tab3
+# ==============================
+def manufacturer_bar(manufacturer_counts):
+    fig_subcause = go.Figure(go.Bar(
+        x=manufacturer_counts.index,
+        y=manufacturer_counts.values,
+        text=manufacturer_counts.values,
+        textposition='auto',
+        marker_color='orange'
+    ))
+    fig_subcause.update_layout(
+        xaxis_title="제조사",
+        yaxis_title="건수",
+        template="plotly_white",
+        height=500
+    )
+    return fig_subcause
+
+
+def maker_breakdown(crosstab, title):
+    # 제조사 × 최초발화점(또는 상황) 건수 누적 막대
+    fig = go.Figure([
+        go.Bar(x=crosstab.index, y=crosstab[col], name=str(col))
+        for col in crosstab.columns
+    ])
+    fig.update_layout(
+        title=title,
+        barmode="stack",
+        xaxis_title="제조사",
+        yaxis_title="건수",
+        template="plotly_white",
+        height=450
+    )
+    return fig
+
+
+def manufacturer_compare(df_manufac_fire):
+    fig = go.Figure()
+    # 왼쪽 y축 (10만대당 화재)
+    fig.add_trace(go.Scatter(
+        x=df_manufac_fire["제조사"],
+        y=df_manufac_fire["전기차10만대당"],
+        mode='lines+markers+text',
+        name="전기차 화재 10만대당 (건)",
+        marker=dict(size=10, color='red', symbol='circle'),
+        error_y=interval_of(df_manufac_fire, "전기차10만대당", "red"),
+        line=dict(width=2),
+        text=df_manufac_fire["전기차10만대당"],
+        textposition="top center"
+    ))
+    fig.add_trace(go.Scatter(
+        x=df_manufac_fire["제조사"],
+        y=df_manufac_fire["배터리10만대당"],
+        mode='lines+markers+text',
+        name="배터리 화재 10만대당 (건)",
+        marker=dict(size=10, color='green', symbol='triangle-up'),
+        error_y=interval_of(df_manufac_fire, "배터리10만대당", "green"),
+        line=dict(width=2),
+        text=df_manufac_fire["배터리10만대당"],
+        textposition="bottom center"
+    ))
+    # 오른쪽 y축 (점유율)
+    fig.add_trace(go.Scatter(
+        x=df_manufac_fire["제조사"],
+        y=df_manufac_fire["점유율"],
+        mode='lines+markers+text',
+        name="제조사 점유율 (%)",
+        marker=dict(size=10, color='orange', symbol='diamond'),
+        line=dict(width=3, dash='dash'),
+        text=df_manufac_fire["점유율"].apply(lambda x: f"{x}%"),
+        textposition="top right",
+        yaxis="y2"
+    ))
+    fig.update_layout(
+        title="제조사별 점유율 & 전기차/배터리 10만대당 화재 비교",
+        xaxis_title="제조사",
+        yaxis=dict(title="10만대당 화재 (건)"),
+        yaxis2=dict(title="점유율 (%)", overlaying="y", side="right"),
+        template="plotly_white",
+        height=600,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        margin=dict(t=80)
+    )
+    return fig
+
+
+def foreign_bar(df_selected):
+    # 연도별 그룹 국가별 막대그래프. plotly.express 는 이 그래프만 쓰므로 처음 그릴 때 불러온다 (시작 시간).
+    import plotly.express as px
+
+    fig_bar = px.bar(
+        df_selected,
+        x="연도",
+        y="전기차(만대당)",
+        color="국가",
+        barmode="group",          # 연도 안에서 국가별 막대 나란히
+        text="전기차(만대당)",
+        labels={"전기차(만대당)": "전기차 1만대당 (대)"},
+        title="국가별 전기차(1만대당) 화재"
+    )
+    # 화재건수/등록대수가 있는 국가는 95% 신뢰구간 (px 는 trace 를 국가별로 나누므로 trace 마다 붙인다)
+    if "전기차(만대당)_하한" in df_selected.columns:
+        for trace in fig_bar.data:
+            rows = df_selected[df_selected["국가"] == trace.name]
+            trace.error_y = interval_of(rows, "전기차(만대당)")
+    fig_bar.update_layout(
+        template="plotly_white",
+        yaxis=dict(title="전기차 1만대당 (건)"),
+        height=500
+    )
+    return fig_bar
+
+
+# ==============================
+# 지역별
+# ==============================
+def region_bar(regions, title):
+    # 지역별 화재 건수(막대) + 등록대수가 있으면 1만대당 화재(선)
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=regions["지역"],
+        y=regions["화재건수"],
+        name="전기차 화재 건수 (건)",
+        marker_color="tomato",
+        text=regions["화재건수"],
+        textposition="auto"
+    ))
+    if "EV_1만대당" in regions.columns:
+        fig.add_trace(go.Scatter(
+            x=regions["지역"],
+            y=regions["EV_1만대당"],
+            name="전기차 1만대당 화재 (건)",
+            mode="lines+markers",
+            line=dict(color="royalblue", width=2),
+            error_y=interval_of(regions, "EV_1만대당", "royalblue"),
+            yaxis="y2"
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="지역",
+        yaxis=dict(title="화재 건수 (건)"),
+        yaxis2=dict(title="1만대당 화재 (건)", overlaying="y", side="right"),
+        template="plotly_white",
+        height=500
+    )
+    return fig
+
+
+def region_trend(by_year, region, interval=None):
+    # interval: (하한, 상한) 이면 연도별 건수에 95% 포아송 신뢰구간 오차 막대
+    fig = go.Figure(go.Bar(
+        x=by_year.index,
+        y=by_year.values,
+        text=by_year.values,
+        textposition="auto",
+        marker_color="orange",
+        error_y=error_bars(by_year, *interval, color="gray") if interval is not None else None
+    ))
+    fig.update_layout(
+        title=f"{region} 연도별 전기차 화재",
+        xaxis=dict(title="연도", type="category"),
+        yaxis_title="화재 건수 (건)",
+        template="plotly_white",
+        height=400
+    )
+    return fig
+
+
+# ==============================
+# 시기별
+# ==============================
+def monthly_trend(monthly, title):
+    # 월별 화재 건수 시계열
+    fig = go.Figure(go.Scatter(
+        x=monthly.index,
+        y=monthly.values,
+        mode="lines+markers",
+        line=dict(color="tomato", width=2),
+        marker=dict(size=4)
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis=dict(title="월"),
+        yaxis_title="화재 건수 (건)",
+        template="plotly_white",
+        height=400
+    )
+    return fig
+
+
+def period_bar(counts, title, xaxis_title, color):
+    # 월(1~12) / 요일 / 시간대(0~23) 분포 막대
+    fig = go.Figure(go.Bar(
+        x=[str(v) for v in counts.index],
+        y=counts.values,
+        marker_color=color
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis=dict(title=xaxis_title, type="category"),
+        yaxis_title="화재 건수 (건)",
+        template="plotly_white",
+        height=350
+    )
+    return fig
@@ -0,0 +1,93 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# ===== Tab2 결과 캐시 (LRU) =====
+# 키      : 사이드바 선택 (연도, 발화요인, 차량상태) 를 정렬한 튜플
+# 용량    : 결과 객체의 메모리 추정치 합계가 예산을 넘으면 가장 오래 안 쓴 항목부터 제거
+# 무효화  : 전기차 화재 데이터의 시그니처(경로, 크기, 수정시각)가 바뀌면 전체 비움
+DEFAULT_BUDGET_MB = float(os.environ.get("EV_FILTER_CACHE_MB", 64))
+
+
+def selection_key(year_filter, subcause_filter, status_filter):
+    # 선택 순서와 상관없이 같은 조합이면 같은 키
+    return tuple(tuple(sorted(values, key=str)) for values in (year_filter, subcause_filter, status_filter))
+
+
+def estimate_bytes(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class FilterCache:
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.entries = OrderedDict()  # 키 -> (결과, 바이트)
+        self.used_bytes = 0
+        self.dataset = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def clear(self):
+        self.entries.clear()
+        self.used_bytes = 0
+
+    def peek(self, dataset, key):
+        # 캐시에 있으면 결과, 없으면 None (계산하지 않는다. 미스는 뒤따르는 get 이 센다)
+        with self.lock:
+            if dataset != self.dataset or key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+
+    def get(self, dataset, key, compute):
+        with self.lock:
+            if dataset != self.dataset:
+                self.clear()
+                self.dataset = dataset
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+
+        result = compute()
+        size = estimate_bytes(result)
+        with self.lock:
+            if dataset != self.dataset or size > self.budget_bytes:
+                return result
+            if key in self.entries:
+                self.used_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (result, size)
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.used_bytes -= evicted
+                self.evictions += 1
+        return result
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "used_mb": self.used_bytes / 1024 / 1024,
+            "budget_mb": self.budget_bytes / 1024 / 1024,
+        }
+
+
+# 모든 세션이 공유하는 프로세스 단위 캐시
+tab2_cache = FilterCache()
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+# ===== Tab2 사이드바 필터용 비트맵 인덱스 =====
+# 필터 가능한 컬럼의 값마다 "그 값을 가진 행" 비트맵(np.packbits)을 미리 만들어 둔다.
+# 선택 조합은 비트 OR/AND 로, 건수는 popcount 로 계산하므로 필터된 DataFrame 복사본을 만들지 않는다.
+FILTER_COLUMNS = ["연도", "차량상태", "발화요인소분류"]
+
+if hasattr(np, "bitwise_count"):
+    def popcount(bits):
+        return int(np.bitwise_count(bits).sum(dtype=np.int64))
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(bits):
+        return int(_POPCOUNT_TABLE[bits].sum(dtype=np.int64))
+
+
+class BitmapIndex:
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.all_rows = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self.no_rows = np.zeros_like(self.all_rows)
+        # 컬럼 -> {값: 비트맵}, 값 순서는 처음 등장한 순서
+        self.bitmaps = {}
+        for col in columns:
+            codes, uniques = pd.factorize(df[col], sort=False)
+            self.bitmaps[col] = {value: np.packbits(codes == code) for code, value in enumerate(uniques)}
+        # 값별 전체 건수 (필터 전)
+        self.totals = {col: {value: popcount(bits) for value, bits in maps.items()}
+                       for col, maps in self.bitmaps.items()}
+        # 세션 간 공유되므로 읽기 전용으로 고정한다.
+        for bits in [self.all_rows, self.no_rows, *(bm for maps in self.bitmaps.values() for bm in maps.values())]:
+            bits.flags.writeable = False
+
+    @property
+    def nbytes(self):
+        return sum(bm.nbytes for maps in self.bitmaps.values() for bm in maps.values()) + 2 * self.all_rows.nbytes
+
+    def select(self, col, values):
+        # values 에 해당하는 행 비트맵 (OR). 없는 값은 무시한다.
+        bits = self.no_rows.copy()
+        for value in values:
+            bm = self.bitmaps[col].get(value)
+            if bm is not None:
+                np.bitwise_or(bits, bm, out=bits)
+        return bits
+
+    def mask(self, filters):
+        # filters: {컬럼: 선택값 목록 또는 None}. None 은 조건 없음, 빈 목록은 0건 (isin 과 동일).
+        bits = self.all_rows.copy()
+        for col, values in filters.items():
+            if values is not None:
+                np.bitwise_and(bits, self.select(col, values), out=bits)
+        return bits
+
+    def count(self, bits):
+        return popcount(bits)
+
+    def histogram(self, col, bits):
+        # 선택된 행에서 col 값별 건수 (value_counts 와 같은 내림차순, 0건 제외)
+        counts = pd.Series({value: popcount(bits & bm) for value, bm in self.bitmaps[col].items()},
+                           dtype="int64")
+        counts.index.name = col
+        counts.name = "count"
+        return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+
+def tab2_summary(index, year_filter, subcause_filter, status_filter):
+    # Tab2 가 그리는 모든 값을 한 번에 계산한다.
+    bits = index.mask({
+        "연도": list(year_filter),
+        "발화요인소분류": list(subcause_filter) or None,
+        "차량상태": list(status_filter) or None,
+    })
+
+    total_by_year = pd.Series(index.totals["연도"]).sort_index()
+    filtered_by_year = pd.Series({year: popcount(bits & index.bitmaps["연도"][year])
+                                  for year in total_by_year.index}, dtype="int64")
+    compare_df = pd.DataFrame({
+        "연도": total_by_year.index,
+        "필터 전": total_by_year.values,
+        "필터 후": filtered_by_year.values,
+    })
+    return {
+        "filtered_count": index.count(bits),
+        "total_count": index.n_rows,
+        "subcause_counts": index.histogram("발화요인소분류", bits).sort_values(ascending=True),
+        "status_counts": index.histogram("차량상태", bits),
+        "compare_df": compare_df,
+    }
+
+
+def load_index(path=data_loader.fire_EV):
+    # 전기차 화재 데이터가 바뀌지 않았으면 프로세스 내에서 인덱스를 재사용한다.
+    signature = data_loader.file_signature(path)
+    return data_loader.memoized(
+        (signature[0], "bitmap_index"), signature,
+        lambda: BitmapIndex(data_loader.load_csv(path, FILTER_COLUMNS)),
+    )
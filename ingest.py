@@ -0,0 +1,406 @@
+import argparse
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+import data_loader
+import validation
+
+# ===== 추가분 적재 (append-only) =====
+# 화재 로그에 새 행이 붙을 때마다 전체 이력을 다시 집계하지 않도록, 누적 집계와 적재 위치를
+# 상태 폴더(.ingest/)에 저장해 두고 새 행만 읽어 더한다.
+#   cube        : (연도, 차종, 전기차) 화재건수 (Tab1, 아래 count_fires/merge_counts)
+#   ev_crosstab : 전기차 화재 (연도, 발화요인소분류, 차량상태) 건수 (사이드바 값 목록, Tab2 수치)
+# 새 행 판단
+#   append  : 파일이 커졌고 이전 끝 위치가 줄 경계 -> 그 뒤만 읽는다
+#   rescan  : 파일이 통째로 다시 쓰였음 -> 전체를 읽되 워터마크(연번 또는 날짜) 이후 행만 더한다
+#   rebuild : --rebuild, 상태 없음, 헤더 변경, 파일이 작아짐, 검사 규칙 변경,
+#             파일이 새로 만들어짐(inode 변경, 예: partitions.sync 가 파티션을 다시 합침) -> 처음부터 다시 집계
+# 날짜/허용값/연번 중복 검사에 어긋난 행은 로더(validation.py)가 걸러 내고, 사유별 건수를 "제외"로 보고한다.
+# 사용법: python ingest.py [--state-dir .ingest] [--rebuild] [--check]
+STATE_DIR = os.environ.get("EV_INGEST_STATE_DIR", ".ingest")
+STATE_VERSION = 3
+CROSSTAB_KEYS = ["연도", "발화요인소분류", "차량상태"]
+
+# 파일별 워터마크 컬럼과 적재에 필요한 컬럼
+SOURCES = {
+    data_loader.fire_total: {"is_ev": False, "watermark": "일시", "columns": ["일시", "연도", "장소소분류"]},
+    data_loader.fire_EV: {"is_ev": True, "watermark": "연번",
+                          "columns": ["연번", "화재발생일", "연도", "발화요인소분류", "차량상태"]},
+}
+
+
+# ===== 연도별 화재 집계 큐브 =====
+# 키: (연도, 차종, 전기차)
+#   전기차=False : 통합 화재 로그의 차량 화재 (전체 차량, 차종=장소소분류)
+#   전기차=True  : 전기차 화재 로그 (차종 정보가 없어 차종="전체")
+# 값: 화재건수
+# 적재 저장소뿐 아니라 배치(analysis.py), 스냅숏, 파티션 집계도 같은 함수로 큐브를 만든다.
+CUBE_KEYS = ["연도", "차종", "전기차"]
+
+
+def count_fires(df, is_ev):
+    vehicle = "전체" if is_ev else df["장소소분류"].astype(object)
+    counts = (
+        df.assign(차종=vehicle)
+        .groupby(["연도", "차종"], dropna=False, observed=True)
+        .size()
+        .reset_index(name="화재건수")
+    )
+    counts["전기차"] = is_ev
+    return counts[CUBE_KEYS + ["화재건수"]]
+
+
+def merge_counts(*parts):
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return pd.DataFrame({"연도": pd.Series(dtype="float64"), "차종": pd.Series(dtype=object),
+                             "전기차": pd.Series(dtype=bool), "화재건수": pd.Series(dtype="int64")})
+    return (
+        pd.concat(parts, ignore_index=True)
+        .groupby(CUBE_KEYS, dropna=False, as_index=False)["화재건수"].sum()
+    )
+
+
+def fires_by_year(counts, is_ev):
+    rows = counts[counts["전기차"] == is_ev]
+    return rows.groupby("연도")["화재건수"].sum()
+
+
+def yearly_table(counts, df_car_info):
+    # 연도별 화재건수 + 등록대수 + 1만대당 화재 (Tab1 전용 요약 테이블)
+    registered = df_car_info.set_index("연도")[["전체차량등록대수", "전기차등록대수"]]
+    table = pd.DataFrame({"전체": fires_by_year(counts, False), "EV": fires_by_year(counts, True)})
+    table = table.join(registered, how="outer")
+    table = table[table.index.notna()]
+    table.index = table.index.astype(int)
+    table.index.name = "연도"
+
+    table.loc[table["전체"].notna(), "EV"] = table["EV"].fillna(0)
+    table["비EV"] = table["전체"] - table["EV"]
+    table["EV비율(%)"] = (table["EV"] / table["전체"] * 100).round(2)
+    table["내연기관등록대수"] = table["전체차량등록대수"] - table["전기차등록대수"]
+    table["EV_1만대당"] = (table["EV"] / table["전기차등록대수"] * 10000).round(2)
+    table["내연기관_1만대당"] = (table["비EV"] / table["내연기관등록대수"] * 10000).round(2)
+    return table
+
+
+def count_crosstab(df):
+    if df.empty:
+        return empty_crosstab()
+    return (
+        df[CROSSTAB_KEYS].astype({"발화요인소분류": object, "차량상태": object})
+        .groupby(CROSSTAB_KEYS, dropna=False).size()
+        .reset_index(name="건수")
+    )
+
+
+def empty_crosstab():
+    return pd.DataFrame({"연도": pd.Series(dtype="float64"), "발화요인소분류": pd.Series(dtype=object),
+                         "차량상태": pd.Series(dtype=object), "건수": pd.Series(dtype="int64")})
+
+
+def merge_crosstab(*parts):
+    parts = [p for p in parts if not p.empty]
+    if not parts:
+        return empty_crosstab()
+    return pd.concat(parts, ignore_index=True).groupby(CROSSTAB_KEYS, dropna=False, as_index=False)["건수"].sum()
+
+
+class Watermark:
+    # 연번: 지금까지 반영한 최대 연번. 날짜: 최대 날짜와 그 날짜에 이미 반영한 행 수(동률 처리).
+    def __init__(self, column, value=None, ties=0):
+        self.column = column
+        self.value = value
+        self.ties = ties
+        self.pending = ties
+
+    def start_scan(self):
+        # 파일을 처음부터 다시 훑을 때, 건너뛸 동률 행 수를 되돌린다.
+        self.pending = self.ties
+
+    def to_json(self):
+        value = self.value.isoformat() if isinstance(self.value, pd.Timestamp) else self.value
+        return {"column": self.column, "value": value, "ties": self.ties}
+
+    @classmethod
+    def from_json(cls, data):
+        value = data["value"]
+        if data["column"] != "연번" and value is not None:
+            value = pd.Timestamp(value)
+        return cls(data["column"], value, data["ties"])
+
+    def beyond(self, df):
+        # 워터마크 이후(새) 행인지. 날짜 동률 행은 이미 반영한 개수만큼 앞에서부터 건너뛴다.
+        if self.value is None:
+            return pd.Series(True, index=df.index)
+        values = df[self.column]
+        if self.column == "연번":
+            return values > self.value
+        tie = values == self.value
+        seen = tie.cumsum() <= self.pending
+        self.pending = max(self.pending - int(tie.sum()), 0)
+        return (values > self.value) | (tie & ~seen)
+
+    def advance(self, df):
+        values = df[self.column].dropna()
+        if values.empty:
+            return
+        top = values.max()
+        if self.column == "연번":
+            self.value = int(top) if self.value is None else max(self.value, int(top))
+            return
+        if self.value is None or top > self.value:
+            self.value, self.ties = top, int((values == top).sum())
+        elif top == self.value:
+            self.ties += int((values == top).sum())
+
+
+class IngestStore:
+    def __init__(self, state_dir=STATE_DIR, data_dir="."):
+        self.state_dir = state_dir
+        self.data_dir = data_dir
+        self.counts = merge_counts()
+        self.ev_crosstab = empty_crosstab()
+        self.sources = {}
+        self.generation = 0
+        self.persisted = False
+        self.lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def state_file(self, name):
+        return os.path.join(self.state_dir, name)
+
+    # ----- 상태 파일 -----
+    def load(self):
+        try:
+            with open(self.state_file("state.json"), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get("version") != STATE_VERSION:
+            return False
+        generation = state["generation"]
+        try:
+            counts = pd.read_parquet(self.state_file(f"cube-{generation}.parquet"))
+            crosstab = pd.read_parquet(self.state_file(f"ev_crosstab-{generation}.parquet"))
+        except OSError:
+            return False
+        self.counts, self.ev_crosstab = counts, crosstab
+        self.sources = {name: {**src, "watermark": Watermark.from_json(src["watermark"])}
+                        for name, src in state["sources"].items()}
+        self.generation = generation
+        self.persisted = True
+        return True
+
+    def save(self):
+        # 세대 번호가 붙은 집계 파일을 먼저 쓰고 state.json 을 바꿔치기해서, 중간에 멈춰도
+        # state.json 이 가리키는 집계와 적재 위치는 항상 짝이 맞는다.
+        generation = self.generation + 1
+        os.makedirs(self.state_dir, exist_ok=True)
+        self.counts.to_parquet(self.state_file(f"cube-{generation}.parquet"), index=False)
+        self.ev_crosstab.to_parquet(self.state_file(f"ev_crosstab-{generation}.parquet"), index=False)
+        state = {
+            "version": STATE_VERSION,
+            "generation": generation,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "sources": {name: {**src, "watermark": src["watermark"].to_json()} for name, src in self.sources.items()},
+        }
+        tmp = self.state_file("state.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.state_file("state.json"))
+        for name in [f"cube-{self.generation}.parquet", f"ev_crosstab-{self.generation}.parquet"]:
+            if os.path.exists(self.state_file(name)):
+                os.remove(self.state_file(name))
+        self.generation = generation
+        self.persisted = True
+
+    # ----- 집계 -----
+    def fold(self, name, df):
+        # 검증을 통과한 새 행을 누적 집계에 더한다.
+        is_ev = SOURCES[name]["is_ev"]
+        if not is_ev:
+            df = df[df["장소소분류"].isin(data_loader.VEHICLE_PLACES)]
+        self.counts = merge_counts(self.counts, count_fires(df, is_ev))
+        if is_ev:
+            self.ev_crosstab = merge_crosstab(self.ev_crosstab, count_crosstab(df))
+
+    def ingest_frame(self, name, df, watermark, report, use_watermark=True):
+        # 덧붙인 구간(append)은 위치로 이미 새 행임을 알기 때문에 날짜 워터마크는 쓰지 않는다.
+        # 연번은 그래도 확인해서, 같은 행을 다시 붙인 경우를 중복으로 걸러낸다.
+        new = watermark.beyond(df) if use_watermark else pd.Series(True, index=df.index)
+        report["duplicates"] += int((~new).sum())
+        valid = df[new]
+        self.fold(name, valid)
+        watermark.advance(valid)
+        report["new_rows"] += len(valid)
+
+    def scan(self, name, watermark, report, use_watermark=True):
+        watermark.start_scan()
+        quarantine = self.quarantine(name)
+        for chunk in data_loader.iter_csv_chunks(self.path(name), SOURCES[name]["columns"], quarantine=quarantine):
+            self.ingest_frame(name, chunk, watermark, report, use_watermark)
+        add_rejected(report, quarantine)
+        return quarantine
+
+    def quarantine(self, name):
+        return validation.Quarantine(self.path(name), data_loader.schema_for(self.path(name)))
+
+    def rules(self, name):
+        return validation.rules_version(data_loader.schema_for(self.path(name)))
+
+    def header(self, name):
+        return list(pd.read_csv(self.path(name), encoding="utf-8-sig", nrows=0).columns)
+
+    def rebuild(self):
+        self.counts = merge_counts()
+        self.ev_crosstab = empty_crosstab()
+        self.sources = {}
+        return {name: self.update_source(name, "rebuild") for name in SOURCES}
+
+    def needs_rebuild(self, name):
+        src = self.sources.get(name)
+        if src is None:
+            return True
+        stat = os.stat(self.path(name))
+        return (src["header"] != self.header(name) or src.get("rules") != self.rules(name)
+                or stat.st_size < src["size"] or src.get("inode", stat.st_ino) != stat.st_ino)
+
+    def update_source(self, name, mode):
+        path = self.path(name)
+        stat = os.stat(path)
+        watermark_column = SOURCES[name]["watermark"]
+        report = {"mode": mode, "new_rows": 0, "duplicates": 0, "rejected": {}, "rows_read": 0, "quarantined": 0}
+        if mode == "rebuild":
+            src = {"header": self.header(name), "rules": self.rules(name), "rows": 0,
+                   "watermark": Watermark(watermark_column)}
+        else:
+            src = self.sources[name]
+            if (stat.st_size, stat.st_mtime_ns) == (src["size"], src["mtime_ns"]):
+                report["mode"] = "unchanged"
+                return report
+        offset = stat.st_size
+        if mode == "rebuild":
+            quarantine = self.scan(name, src["watermark"], report, use_watermark=False)
+        else:
+            try:
+                quarantine = self.quarantine(name)
+                df, offset = data_loader.read_csv_tail(path, src["offset"], SOURCES[name]["columns"], quarantine)
+                report["mode"] = "append"
+                self.ingest_frame(name, df, src["watermark"], report, use_watermark=watermark_column == "연번")
+                add_rejected(report, quarantine)
+            except ValueError:
+                report["mode"] = "rescan"
+                quarantine = self.scan(name, src["watermark"], report)
+        report["rows_read"], report["quarantined"] = quarantine.rows, quarantine.report()["quarantined"]
+        # 읽은 원본 행/격리 행은 파일 전체 기준 (덧붙인 구간만 읽었으면 이전 값에 더한다)
+        read = {"rows_read": 0, "quarantined": 0}
+        if report["mode"] == "append":
+            read = {key: src.get(key, 0) for key in read}
+        self.sources[name] = {**src, "offset": offset, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                              "inode": stat.st_ino,
+                              "rows": src["rows"] + report["new_rows"],
+                              **{key: value + report[key] for key, value in read.items()}}
+        return report
+
+    def read_stats(self, name=data_loader.fire_total):
+        # 사이드바 읽기 통계 (data_loader.read_vehicle_fires_chunked 와 같은 키). 남긴 행은 큐브의 차량 화재 수.
+        src = self.sources.get(name)
+        if src is None or "rows_read" not in src:
+            return {}
+        kept = self.counts.loc[self.counts["전기차"] == SOURCES[name]["is_ev"], "화재건수"].sum()
+        return {"rows_read": src["rows_read"], "quarantined": src["quarantined"], "rows_kept": int(kept),
+                "peak_rss_mb": data_loader.peak_rss_mb()}
+
+    def update(self, rebuild=False):
+        # 새 행만 반영하고 상태를 저장한다. 반환: 파일별 {"mode", "new_rows", "duplicates", "rejected"}
+        # 한 파일이라도 처음부터 다시 읽어야 하면 집계를 파일별로 나눌 수 없으므로 전체를 다시 만든다.
+        with self.lock:
+            if not self.sources and not rebuild:
+                self.load()
+            if rebuild or any(self.needs_rebuild(name) for name in SOURCES):
+                report = self.rebuild()
+            else:
+                report = {name: self.update_source(name, "update") for name in SOURCES}
+            if any(r["mode"] != "unchanged" for r in report.values()):
+                try:
+                    self.save()
+                except OSError:
+                    # 상태 폴더에 쓸 수 없으면 메모리 집계만 유지한다 (다음 프로세스는 다시 집계).
+                    self.persisted = False
+            return report
+
+    # ----- 일관성 검사 -----
+    def check(self):
+        # 처음부터 다시 집계한 결과와 누적 집계를 비교한다. 다른 행만 돌려준다 (비어 있으면 일치).
+        fresh = IngestStore(state_dir=self.state_dir, data_dir=self.data_dir)
+        fresh.rebuild()
+        return {
+            "cube": diff(self.counts, fresh.counts, CUBE_KEYS, "화재건수"),
+            "ev_crosstab": diff(self.ev_crosstab, fresh.ev_crosstab, CROSSTAB_KEYS, "건수"),
+        }
+
+
+def add_rejected(report, quarantine):
+    # 로더가 격리한 행 수를 사유별로 보고에 더한다.
+    for reason, count in quarantine.counts.items():
+        report["rejected"][reason] = report["rejected"].get(reason, 0) + count
+
+
+def diff(stored, fresh, keys, value):
+    fill = {col: "<NA>" for col in keys if stored[col].dtype == object or fresh[col].dtype == object}
+    merged = pd.merge(stored.fillna(fill), fresh.fillna(fill), on=keys, how="outer",
+                      suffixes=("_누적", "_재집계"))
+    merged = merged.fillna({f"{value}_누적": 0, f"{value}_재집계": 0})
+    return merged[merged[f"{value}_누적"] != merged[f"{value}_재집계"]].reset_index(drop=True)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def load_store():
+    # 프로세스당 하나의 저장소. 호출할 때마다 원본 파일의 새 행만 반영한다.
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = IngestStore()
+    _store.update()
+    # 대시보드 사이드바의 읽기 통계 (로그를 다시 읽지 않고 상태 파일에서 불러온 경우도 포함)
+    data_loader.last_read_stats.update(_store.read_stats())
+    return _store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="화재 로그의 새 행만 누적 집계에 반영한다.")
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--rebuild", action="store_true", help="상태를 버리고 처음부터 다시 집계")
+    parser.add_argument("--check", action="store_true", help="전체 재집계와 비교해 다르면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    store = IngestStore(args.state_dir, args.data_dir)
+    report = store.update(rebuild=args.rebuild)
+    for name, result in report.items():
+        rejected = ", ".join(f"{k} {v}" for k, v in result["rejected"].items()) or "없음"
+        print(f"{name}: {result['mode']} · 새 행 {result['new_rows']:,} · 중복 {result['duplicates']:,} "
+              f"· 제외 {rejected}")
+    if args.check:
+        mismatches = store.check()
+        for label, table in mismatches.items():
+            print(f"{label}: {'일치' if table.empty else f'{len(table)}개 키 불일치'}")
+            if not table.empty:
+                print(table.to_string())
+        if any(not table.empty for table in mismatches.values()):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
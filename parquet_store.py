@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ===== CSV 옆에 두는 컬럼형(Parquet) 사이드카 =====
+# 통합_화재_통계.csv -> 통합_화재_통계.parquet
+# 원본 CSV 의 해시/크기/수정시각을 Parquet 메타데이터에 기록해 두고,
+# 원본이 바뀌지 않았으면 다시 변환하지 않는다.
+# category 컬럼은 Parquet 딕셔너리 인코딩으로, 날짜 컬럼은 timestamp 로 저장된다.
+# version 은 변환 규칙(데이터 품질 검사 규칙 등)의 버전으로, 바뀌면 원본이 같아도 다시 변환한다.
+META_KEY = b"ev_fire_source"
+
+
+def sidecar_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def source_hash(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_source_meta(parquet_path):
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+    except (OSError, ValueError):
+        return None
+    raw = metadata.get(META_KEY)
+    return json.loads(raw) if raw else None
+
+
+def matches_source(meta, csv_path):
+    # 크기/수정시각이 같으면 해시 계산 없이 통과, 다르면 해시로 실제 변경 여부 확인
+    stat = os.stat(csv_path)
+    if meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    return meta["sha256"] == source_hash(csv_path)
+
+
+def is_fresh(csv_path, version=None):
+    meta = read_source_meta(sidecar_path(csv_path))
+    if meta is None or meta.get("version") != version:
+        return False
+    return matches_source(meta, csv_path)
+
+
+def to_arrow(chunk):
+    # category 는 청크마다 범주가 달라 스키마가 어긋나므로 문자열로 쓴다.
+    # Parquet 자체가 문자열 컬럼을 딕셔너리 인코딩하고, 읽을 때 read_dictionary 로 category 로 복원한다.
+    chunk = chunk.astype({col: object for col in chunk.columns
+                          if isinstance(chunk[col].dtype, pd.CategoricalDtype)})
+    return pa.Table.from_pandas(chunk, preserve_index=False)
+
+
+def convert(csv_path, iter_chunks, force=False, version=None):
+    # 청크 단위로 스트리밍 변환한다. 변환했으면 원본 메타(해시/크기/수정시각), 최신 상태라 건너뛰었으면 None
+    if not force and is_fresh(csv_path, version):
+        return None
+    stat = os.stat(csv_path)
+    meta = {"sha256": source_hash(csv_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "version": version}
+
+    tmp_path = sidecar_path(csv_path) + ".tmp"
+    writer = None
+    try:
+        for chunk in iter_chunks(csv_path):
+            table = to_arrow(chunk)
+            if writer is None:
+                schema = table.schema.with_metadata({**(table.schema.metadata or {}),
+                                                     META_KEY: json.dumps(meta).encode()})
+                writer = pq.ParquetWriter(tmp_path, schema, compression="zstd")
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        return None
+    os.replace(tmp_path, sidecar_path(csv_path))
+    return meta
+
+
+def num_rows(csv_path):
+    return pq.read_metadata(sidecar_path(csv_path)).num_rows
+
+
+def read(csv_path, columns=None, filters=None, categories=()):
+    parquet_path = sidecar_path(csv_path)
+    available = pq.read_schema(parquet_path).names
+    if columns is not None:
+        columns = [c for c in columns if c in available]
+    table = pq.read_table(parquet_path, columns=columns, filters=filters,
+                          read_dictionary=[c for c in categories if c in available and (columns is None or c in columns)])
+    return table.to_pandas()
+
+
+if __name__ == "__main__":
+    # 사용법: python parquet_store.py [--force] [CSV ...]  (인자가 없으면 기본 데이터 전체)
+    import data_loader
+
+    args = sys.argv[1:]
+    force = "--force" in args
+    paths = [a for a in args if a != "--force"] or data_loader.DATA_FILES
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"[건너뜀] {path}: 파일 없음")
+            continue
+        report = data_loader.convert_parquet(path, force=force)
+        quarantined = f" (격리 {report['quarantined']:,}행)" if report and report["quarantined"] else ""
+        print(f"[{'변환' if report else '최신'}] {path} -> {sidecar_path(path)}{quarantined}")
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import data_loader
+import ingest
+import validation
+
+# ===== 시도/연도별 파티션 파일 =====
+# 화재 데이터가 시도별·연도별 파일로 나뉘어 들어오는 경우를 위한 파이프라인.
+#   ROOT/서울특별시/2023/통합_화재_통계.csv
+#   ROOT/통합_화재_통계_경기도_2022.csv
+# 처럼 파일 이름이 통합_화재_통계 / 전기차_화재_통계 로 시작하면 모두 파티션으로 인식한다.
+# 두 가지 방식으로 쓴다.
+#   대시보드/CLI : EV_PARTITION_DIR=ROOT 이면 sync() 가 파티션을 종류별로 데이터 폴더의 CSV 하나로 합쳐 둔다.
+#                  로더, 적재 저장소, Parquet 사이드카, DuckDB 가 모두 합친 파일을 그대로 읽으므로
+#                  품질 검사(연번 중복 포함)도 파티션 사이에 걸쳐 한 번에 한다.
+#                  파티션 목록/크기/수정시각이 그대로면 다시 합치지 않는다 (.partitions.json).
+#   병렬 집계    : python partitions.py ROOT. 각 파일을 워커 프로세스에서 청크 단위로 읽어
+#                  (연도, 차종, 전기차) 화재건수로 줄이고, 부모 프로세스가 적재 큐브(ingest.merge_counts)와
+#                  같은 형태로 합친다. 전기차 로그는 (연번, 연도) 만 돌려받아 합친 뒤 연번 중복을 거른다.
+PARTITION_DIR = os.environ.get("EV_PARTITION_DIR")
+MANIFEST = ".partitions.json"
+PARTITION_KINDS = {
+    os.path.splitext(data_loader.fire_total)[0]: False,  # 전기차 아님 (전체 차량)
+    os.path.splitext(data_loader.fire_EV)[0]: True,
+}
+_sync_lock = threading.Lock()
+
+
+def discover(root, exclude=()):
+    # exclude: 건너뛸 파일 (합친 결과를 파티션 폴더 안에 쓰는 경우)
+    exclude = {os.path.abspath(path) for path in exclude}
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        # 상태/격리 폴더(.ingest, .quarantine 등)는 건너뛴다.
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in sorted(filenames):
+            if not name.endswith(".csv") or os.path.abspath(os.path.join(dirpath, name)) in exclude:
+                continue
+            for prefix, is_ev in PARTITION_KINDS.items():
+                if name.startswith(prefix):
+                    found.append((os.path.join(dirpath, name), is_ev))
+    return sorted(found)
+
+
+# ==============================
+# 합친 CSV (대시보드/CLI 로더용)
+# ==============================
+def concat_csv(paths, out):
+    # 헤더는 한 번만 쓰고 본문은 파싱 없이 바이트 그대로 잇는다. 헤더가 다른 파티션이 있으면 ValueError.
+    header = None
+    with open(out + ".tmp", "wb") as dst:
+        for path in paths:
+            with open(path, "rb") as src:
+                first = src.readline().removeprefix(b"\xef\xbb\xbf").rstrip(b"\r\n")
+                if header is None:
+                    header = first
+                    dst.write(b"\xef\xbb\xbf" + header + b"\n")
+                elif first != header:
+                    raise ValueError(f"{path}: 헤더가 다른 파티션과 다릅니다")
+                body = src.read()
+            if body.strip():
+                dst.write(body if body.endswith(b"\n") else body + b"\n")
+    os.replace(out + ".tmp", out)
+
+
+def materialize(root, data_dir="."):
+    # 파티션을 종류별로 data_dir 의 통합/전기차 화재 CSV 로 합친다. 바뀐 종류만 다시 쓰고, 쓴 파일 목록을 돌려준다.
+    outputs = {is_ev: os.path.join(data_dir, data_loader.fire_EV if is_ev else data_loader.fire_total)
+               for is_ev in PARTITION_KINDS.values()}
+    found = discover(root, exclude=outputs.values())
+    manifest_path = os.path.join(data_dir, MANIFEST)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    written = []
+    for is_ev, out in outputs.items():
+        paths = [path for path, kind in found if kind == is_ev]
+        if not paths:
+            continue
+        signature = []
+        for path in paths:
+            stat = os.stat(path)
+            signature.append([os.path.relpath(path, root), stat.st_size, stat.st_mtime_ns])
+        key = os.path.basename(out)
+        if manifest.get(key) == signature and os.path.exists(out):
+            continue
+        concat_csv(paths, out)
+        manifest[key] = signature
+        written.append(out)
+    if written:
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(manifest_path + ".tmp", manifest_path)
+    return written
+
+
+def sync(data_dir="."):
+    # EV_PARTITION_DIR 이 있으면 합친 CSV 를 최신으로 맞춘다 (대시보드 rerun, API 요청마다 호출, 변경 없으면 stat 만).
+    if not PARTITION_DIR:
+        return []
+    with _sync_lock:
+        return materialize(PARTITION_DIR, data_dir)
+
+
+# ==============================
+# 병렬 집계
+# ==============================
+def aggregate_partition(task):
+    # 워커 프로세스에서 실행된다. 반환값은 (결과, 읽은 원본 행 수) 로 작게 유지한다.
+    #   통합 로그 : (연도, 차종, 전기차) 부분 집계
+    #   전기차    : (연번, 연도) 행. 연번 중복은 부모가 모든 파티션을 합친 뒤 거른다.
+    # 읽은 행은 두 종류 모두 원본 CSV 행 수 (품질 검사 격리 행, 장소소분류로 거른 행 포함)
+    path, is_ev = task
+    if is_ev:
+        quarantine = validation.Quarantine(path, data_loader.schema_for(path))
+        parts = list(data_loader.iter_csv_chunks(path, ["연번", "연도"], quarantine=quarantine))
+        rows = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame({"연번": [], "연도": []})
+        return rows, quarantine.rows
+    df, stats = data_loader.read_vehicle_fires_chunked(path)
+    return ingest.count_fires(df, is_ev=False), stats["rows_read"]
+
+
+def aggregate(root, workers=None):
+    # workers=1 이면 현재 프로세스에서 순차 처리, None 이면 CPU 코어 수만큼
+    tasks = discover(root)
+    start = time.perf_counter()
+    if workers == 1:
+        results = [aggregate_partition(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(aggregate_partition, tasks))
+    ev = [result for result, (_, is_ev) in zip(results, tasks) if is_ev]
+    ev = pd.concat([rows for rows, _ in ev], ignore_index=True) if ev else pd.DataFrame({"연번": [], "연도": []})
+    duplicated = ev["연번"].duplicated()
+    counts = ingest.merge_counts(*[part for (part, _), (_, is_ev) in zip(results, tasks) if not is_ev],
+                                 ingest.count_fires(ev[~duplicated], is_ev=True))
+    stats = {
+        "files": len(tasks),
+        "rows_read": sum(r[1] for r in results),
+        "fires": int(counts["화재건수"].sum()),
+        "duplicates": int(duplicated.sum()),
+        "seconds": time.perf_counter() - start,
+        "workers": workers or os.cpu_count(),
+    }
+    return counts, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시도/연도별 화재 파티션 파일을 병렬로 집계한다.")
+    parser.add_argument("root")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", help="집계 결과를 저장할 Parquet 경로")
+    parser.add_argument("--car-info", help="연도별 등록대수 CSV (기본: ROOT/" + data_loader.car_info + ")")
+    parser.add_argument("--materialize", metavar="DATA_DIR",
+                        help="집계 대신 파티션을 DATA_DIR 의 통합/전기차 화재 CSV 로 합친다 (대시보드/CLI 입력)")
+    args = parser.parse_args(argv)
+    if args.materialize:
+        written = materialize(args.root, args.materialize)
+        print("\n".join(written) if written else "변경 없음")
+        return
+    car_info = args.car_info or os.path.join(args.root, data_loader.car_info)
+    if not args.out and not os.path.exists(car_info):
+        parser.error(f"등록대수 파일이 없습니다: {car_info} (--car-info 로 지정)")
+
+    counts, stats = aggregate(args.root, args.workers)
+    print(f"파일 {stats['files']}개, {stats['rows_read']:,}행 (화재 {stats['fires']:,}건, "
+          f"파티션 간 연번 중복 {stats['duplicates']:,}건), {stats['seconds']:.2f}초 (워커 {stats['workers']}개)")
+    if args.out:
+        counts.to_parquet(args.out, index=False)
+    else:
+        print(ingest.yearly_table(counts, data_loader.load_csv(car_info)).to_string())
+
+
+if __name__ == "__main__":
+    main()
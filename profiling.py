@@ -0,0 +1,129 @@
+import io
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+import data_loader
+
+# ===== 단계별 시간/메모리 계측 (선택) =====
+# EV_DASHBOARD_PROFILE=1 이거나 주소에 ?profile=1 을 붙이면 켜진다.
+# 이름 붙은 단계마다 소요 시간, 처리 행 수, RSS 변화량을 기록하고,
+# rerun 이 끝나면 한 줄에 단계 하나씩 JSON Lines 로그 파일에 덧붙인다.
+# 로그가 LOG_MAX_MB 를 넘으면 <로그>.1 로 돌리고 새로 시작한다 (이전 것 하나만 남긴다).
+# 진단 패널의 누적 요약은 로그 끝의 SUMMARY_TAIL_MB 만 읽고, 로그가 바뀌지 않았으면 다시 읽지 않는다.
+ENABLED = os.environ.get("EV_DASHBOARD_PROFILE") == "1"
+LOG_PATH = os.environ.get("EV_DASHBOARD_PROFILE_LOG", "profile_log.jsonl")
+LOG_MAX_MB = float(os.environ.get("EV_DASHBOARD_PROFILE_LOG_MAX_MB", 20))
+SUMMARY_TAIL_MB = 2
+RELEASE = os.environ.get("EV_DASHBOARD_RELEASE", "")
+_summary_cache = {}
+
+
+def rss_mb():
+    # 현재 RSS. /proc 이 없는 환경에서는 최대 RSS 로 대신한다.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        return data_loader.peak_rss_mb()
+
+
+class Profiler:
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        # with prof.stage("tab2/aggregate") as rec: ... rec["rows"] = len(df)
+        record = {"stage": name, "rows": rows}
+        if not self.enabled:
+            yield record
+            return
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            rss_after = rss_mb()
+            record["seconds"] = time.perf_counter() - start
+            record["rss_mb"] = rss_after
+            record["rss_delta_mb"] = None if rss_before is None or rss_after is None else rss_after - rss_before
+            self.records.append(record)
+
+    def table(self):
+        columns = ["stage", "seconds", "rows", "rss_delta_mb", "rss_mb", "payload_kb", "saved_kb"]
+        return pd.DataFrame(self.records, columns=columns)
+
+    def write_log(self, path=LOG_PATH):
+        if not self.records:
+            return
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        if os.path.exists(path) and os.path.getsize(path) > LOG_MAX_MB * 1024 * 1024:
+            os.replace(path, path + ".1")
+        with open(path, "a", encoding="utf-8") as f:
+            for record in self.records:
+                line = {"time": timestamp, "run": self.run_id, "release": RELEASE, **record}
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def chart_points(fig):
+    # Plotly Figure 가 브라우저로 보내는 데이터 점 개수 (x 또는 values 기준)
+    total = 0
+    for trace in fig.data:
+        values = getattr(trace, "x", None)
+        if values is None:
+            values = getattr(trace, "values", None)
+        total += len(values) if values is not None else 0
+    return total
+
+
+def read_tail(path, max_bytes):
+    # 로그 끝 max_bytes 안의 완전한 줄만 읽는다.
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(size - max_bytes, 0))
+        data = f.read()
+    if size > max_bytes:
+        data = data[data.find(b"\n") + 1:]
+    return data
+
+
+def summarize(path=LOG_PATH, last_runs=200):
+    # 로그의 최근 rerun 들에서 단계별 중앙값/p95 시간을 구한다 (느린 단계부터).
+    # 결과는 로그의 (크기, 수정시각) 이 같으면 다시 계산하지 않는다.
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return pd.DataFrame()
+    key = (os.path.abspath(path), last_runs)
+    cached = _summary_cache.get(key)
+    if cached is not None and cached[0] == (stat.st_size, stat.st_mtime_ns):
+        return cached[1]
+    budget = int(SUMMARY_TAIL_MB * 1024 * 1024)
+    data = read_tail(path, budget)
+    # 막 돌린 직후라 로그가 짧으면 이전 로그(<로그>.1)의 끝도 함께 본다.
+    if len(data) < budget and os.path.exists(path + ".1"):
+        data = read_tail(path + ".1", budget - len(data)) + data
+    summary = summarize_lines(data, last_runs)
+    _summary_cache[key] = ((stat.st_size, stat.st_mtime_ns), summary)
+    return summary
+
+
+def summarize_lines(data, last_runs):
+    if not data.strip():
+        return pd.DataFrame()
+    log = pd.read_json(io.BytesIO(data), lines=True)
+    if log.empty:
+        return log
+    log = log[log["run"].isin(log["run"].drop_duplicates().tail(last_runs))]
+    summary = log.groupby("stage")["seconds"].agg(
+        runs="count", median="median", p95=lambda s: s.quantile(0.95), max="max")
+    summary["rss_delta_mb"] = log.groupby("stage")["rss_delta_mb"].median()
+    return summary.sort_values("median", ascending=False).reset_index()
@@ -1,621 +1,432 @@
+import os
+
 import streamlit as st
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import plotly.express as px
-
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+
+import analysis
+import content
+import data_loader
+import filter_cache
+import filter_index
+import partitions
+import profiling
+import query_backend
+import regional_index
+import render_layer
+import time_index
+import validation
+import vehicle_dim
+
+# ===== 시작 경로 =====
+# 첫 화면(사이드바 + 첫 탭)에 필요한 모듈과 데이터만 올린다. 그래프는 모두 Plotly 라 matplotlib/seaborn 은 쓰지 않고,
+# 다른 탭의 데이터/인덱스는 그 탭이 처음 선택될 때, plotly.express 와 duckdb 는 쓰는 곳에서 불러온다.
+# 시작 시간 예산은 benchmarks/bench_startup.py 가 검사한다.
 st.set_page_config(layout="wide", page_title="전기차 화재 분석", page_icon="🔥")
 
+# ===== 단계별 계측 (EV_DASHBOARD_PROFILE=1 또는 ?profile=1) =====
+prof = profiling.Profiler(profiling.ENABLED or st.query_params.get("profile") == "1")
+
+# ===== 집계 백엔드 (EV_QUERY_BACKEND=pandas|duckdb) =====
+# pandas 는 로더가 캐시한 프레임/인덱스, duckdb 는 Parquet 사이드카를 직접 질의한다 (query_backend.py).
+backend = query_backend.get_backend()
+
 # ===== 데이터 불러오기 =====
-fire_total = "통합_화재_통계.csv"
-fire_EV    = "전기차_화재_통계.csv"
-car_info   = "자동차_등록_대수_현황.csv"
-car_maker  = "차종별_전기차_화재.csv"
-foreign_fire = "해외_전기차_화재.csv"
-manufac_fire = "전기차_제조사_점유율_화재.csv"
-
-df_fire_total = pd.read_csv(fire_total, encoding="utf-8-sig")
-df_fire_EV    = pd.read_csv(fire_EV, encoding="utf-8-sig")
-df_car_info   = pd.read_csv(car_info, encoding="utf-8-sig")
-df_car_maker  = pd.read_csv(car_maker, encoding="utf-8-sig")
-df_foreign_fire = pd.read_csv(foreign_fire, encoding="utf-8-sig")
-df_manufac_fire = pd.read_csv(manufac_fire, encoding="utf-8-sig")
+# 파싱 결과는 data_loader 가 (경로, 크기, 수정시각) 기준으로 프로세스 전체에 캐시한다.
+# 캐시된 DataFrame 은 모든 세션이 읽기 전용으로 공유하고 (Copy-on-Write 얕은 복사본),
+# 세션별 상태는 사이드바/탭 선택(st.session_state) 뿐이다.
+# 큰 화재 로그는 Parquet 사이드카에서 탭들이 쓰는 컬럼만 읽는다.
+# 여기서는 사이드바에 필요한 전기차 화재 데이터만 읽고, 나머지는 각 탭이 선택될 때 읽는다.
+data_loader.enable_copy_on_write()
+# 파티션 폴더(EV_PARTITION_DIR)가 있으면 종류별로 합친 CSV 를 먼저 최신으로 맞춘다 (partitions.py).
+partitions.sync()
+fire_EV_columns    = ["연도", "발화요인소분류", "차량상태"]
+
+with prof.stage("load") as rec:
+    df_fire_EV    = data_loader.load_csv(data_loader.fire_EV, fire_EV_columns)
+    rec["rows"] = len(df_fire_EV)
 
 # ===== 전처리 =====
-df_fire_total = df_fire_total[df_fire_total["장소소분류"].isin(["승용자동차", "화물자동차", "버스"])].copy()
-df_fire_total["연도"] = pd.to_datetime(df_fire_total["일시"], errors="coerce").dt.year
-df_fire_EV["연도"] = pd.to_datetime(df_fire_EV["화재발생일"], errors="coerce").dt.year
+# 일시/화재발생일 파싱, 연도 추출, 차량 화재 장소 필터는 로더에서 이미 끝났다.
+# 일시/화재발생일은 버리지 않고 정수로 압축해 두며, 시기별 탭이 날짜순으로 정렬한 인덱스(time_index)를 만든다.
 
 # ===== Sidebar 필터 =====
-st.sidebar.header("필터링 분석 옵션 (tab2)")
-
-st.sidebar.write("연도 선택")
-# 유니크 연도 가져오기
-years = sorted(df_fire_EV["연도"].dropna().unique())
+st.sidebar.header("필터링 분석 옵션 (tab2, 지역별, 시기별)")
 
-# 체크박스로 선택된 연도 모으기
-year_filter = []
-for y in years:
-    if st.sidebar.checkbox(f"{y}년", value=True):  # 기본값 True로 모두 선택
-        year_filter.append(y)
+# 통합 화재 로그 읽기 통계는 로그를 읽는 탭(Tab1 의 적재 저장소, 파일 로더)이 실행된 뒤에 채운다.
+read_stats_slot = st.sidebar.empty()
 
-# 선택된 연도로 데이터 필터링
-df_ev_filtered = df_fire_EV[df_fire_EV["연도"].isin(year_filter)].copy()
+if backend.name != "pandas":
+    st.sidebar.caption(f"집계 백엔드: {backend.name}")
 
-subcause_filter = st.sidebar.multiselect("발화요인 선택", df_fire_EV["발화요인소분류"].dropna().unique())
-status_filter = st.sidebar.multiselect("차량상태 선택", df_fire_EV["차량상태"].dropna().unique())
+# 사이드바 값 목록에서 빠진(격리된) 전기차 화재 행. 요약은 사이드카를 만들 때 함께 기록된다.
+ev_quality = data_loader.load_quality_report(data_loader.fire_EV)
+if ev_quality["quarantined"]:
+    st.sidebar.caption(f"데이터 검사: 전기차 화재 {ev_quality['quarantined']:,}행 격리 (🧪 데이터 품질 검사 탭)")
+if ev_quality["warned"]:
+    st.sidebar.caption(f"데이터 검사: 허용값 목록 밖 값 {ev_quality['warned']:,}행 (집계 포함, 🧪 데이터 품질 검사 탭)")
 
-# ===== 필터 적용 데이터 =====
-df_ev_filtered = df_fire_EV[df_fire_EV["연도"].isin(year_filter)].copy()
-if status_filter:
-    df_ev_filtered = df_ev_filtered[df_ev_filtered["차량상태"].isin(status_filter)]
-if subcause_filter:
-    df_ev_filtered = df_ev_filtered[df_ev_filtered["발화요인소분류"].isin(subcause_filter)]
+with prof.stage("sidebar_filter", rows=len(df_fire_EV)):
+    st.sidebar.write("연도 선택")
+    # 유니크 연도 가져오기
+    years = sorted(df_fire_EV["연도"].dropna().unique())
 
-df_total_filtered = df_fire_total[df_fire_total["연도"].isin(year_filter)].copy()
+    # 체크박스로 선택된 연도 모으기
+    year_filter = []
+    for y in years:
+        if st.sidebar.checkbox(f"{y}년", value=True):  # 기본값 True로 모두 선택
+            year_filter.append(y)
 
-# ===== 발화요인/차량상태 데이터 =====
-ev_fire_cause_all = df_fire_EV["발화요인대분류"].value_counts()
-ev_vehicle_status_all = df_fire_EV["차량상태"].value_counts()
-
-# ===== 탭 구조 =====
-tab1, tab2, tab3 = st.tabs(["📊 주요 분석", "🔥 전기차 화재 필터링 분석", "📍 추가 참고 분석 데이터"])
+    subcause_filter = st.sidebar.multiselect("발화요인 선택", df_fire_EV["발화요인소분류"].dropna().unique())
+    status_filter = st.sidebar.multiselect("차량상태 선택", df_fire_EV["차량상태"].dropna().unique())
 
 # ===== KPI 카드 스타일 =====
-kpi_style = """
-<style>
-.kpi-card {
-    padding: 20px;
-    border-radius: 15px;
-    color: white;
-    text-align: center;
-    box-shadow: 2px 2px 12px rgba(0,0,0,0.15);
-    margin: 10px;
-}
-.kpi-title {
-    font-size: 16px;
-    font-weight: 600;
-    margin-bottom: 8px;
-}
-.kpi-value {
-    font-size: 28px;
-    font-weight: bold;
-}
-.kpi-1 { background: linear-gradient(135deg, #6a11cb, #2575fc); }
-.kpi-2 { background: linear-gradient(135deg, #fff176, #dd2476); }
-.kpi-3 { background: linear-gradient(135deg, #11998e, #38ef7d); }
-</style>
-"""
+st.markdown(content.KPI_STYLE, unsafe_allow_html=True)
 
-# ==============================
-# Tab1: 전체 데이터 KPI + Plotly 시각화
-# ==============================
-with tab1:
-    st.markdown("### 🔥 전기차 화재 분석")
 
-    st.markdown(kpi_style, unsafe_allow_html=True)
+def kpi_cards(cards):
+    # cards: [(제목, 표시값), ...] -> kpi-1, kpi-2, kpi-3 순서로 한 줄에 표시
+    for i, (col, (title, value)) in enumerate(zip(st.columns(len(cards)), cards), start=1):
+        with col:
+            st.markdown(content.kpi_card_html(i, title, value), unsafe_allow_html=True)
 
-    # ===== KPI 값 =====
-    total_fire_count = len(df_fire_total)
-    ev_fire_count = len(df_fire_EV)
-    ev_fire_ratio = round(ev_fire_count / total_fire_count * 100, 2)
 
-    # ===== KPI 카드 표시 =====
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown(f"""
-        <div class="kpi-card kpi-1">
-            <div class="kpi-title">전체 차량 화재 건수</div>
-            <div class="kpi-value">{total_fire_count:,} 건</div>
-        </div>
-        """, unsafe_allow_html=True)
+def data_version(*paths):
+    # 입력 파일 시그니처. 사이드바와 무관한 Figure 캐시의 키로 쓴다.
+    return tuple(data_loader.file_signature(path) for path in paths)
 
-    with col2:
-        st.markdown(f"""
-        <div class="kpi-card kpi-2">
-            <div class="kpi-title">전기차 화재 건수</div>
-            <div class="kpi-value">{ev_fire_count:,} 건</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div class="kpi-card kpi-3">
-            <div class="kpi-title">전기차 화재 비율</div>
-            <div class="kpi-value">{ev_fire_ratio}%</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    # ===== 연도별 화재 데이터 준비 =====
-    df_fire_count = (
-        df_fire_total.groupby("연도").size().reset_index(name="전체")
-        .merge(df_fire_EV.groupby("연도").size().reset_index(name="EV"), on="연도", how="left")
-    )
-    df_fire_count["EV"] = df_fire_count["EV"].fillna(0).astype(int)
-    df_fire_count["비EV"] = df_fire_count["전체"] - df_fire_count["EV"]
-    df_fire_count["EV비율(%)"] = (df_fire_count["EV"] / df_fire_count["전체"] * 100).round(2)
-
-    # 🔥 화재 건수 시각화 (전체 건수 기준 + EV 비율 선)
-    fig_fire = go.Figure()
-    fig_fire.add_trace(go.Bar(
-        x=df_fire_count["연도"],
-        y=df_fire_count["EV"],
-        name="전기차 화재 건수 (건)",
-        marker_color="tomato"
-    ))
-    fig_fire.add_trace(go.Bar(
-        x=df_fire_count["연도"],
-        y=df_fire_count["비EV"],
-        name="전체 화재 건수 (건)",
-        marker_color="lightgray"
-    ))
-    fig_fire.add_trace(go.Scatter(
-        x=df_fire_count["연도"],
-        y=df_fire_count["EV비율(%)"],
-        name="전기차 화재 비율 (%)",
-        mode="lines+markers",
-        line=dict(color="green", width=2),
-        yaxis="y2"
-    ))
-    fig_fire.update_layout(
-        title="전체/전기차 화재 비교",
-        xaxis=dict(title="연도"),
-        yaxis=dict(title="화재 건수 (건)"),
-        yaxis2=dict(title="전기차 화재 비율 (%)", overlaying="y", side="right"),
-        barmode="stack",  # EV + 비EV 누적 표시
-        template="plotly_white",
-        height=500
-    )
-    st.plotly_chart(fig_fire, use_container_width=True)
 
+def plotly_chart(stage, fig, *args, budget_kb=render_layer.BUDGET_KB):
+    # fig 는 Figure 또는 figures 모듈의 생성 함수(+인자). 계측 모드에서는 Figure 생성과
+    # st.plotly_chart 의 JSON 직렬화 시간을 합쳐 기록하고, 데이터 점 개수를 행 수로 남긴다.
+    # 보내기 전에 render_layer 가 Figure 크기를 예산(KB) 안으로 줄인다.
+    with prof.stage(f"{stage}/chart") as rec:
+        if callable(fig):
+            fig = fig(*args)
+        fig, payload = render_layer.fit(fig, budget_kb)
+        st.plotly_chart(fig, width="stretch")
+        if payload["saved_bytes"] > 0:
+            st.caption(f"표시 데이터 축약: {payload['before_bytes'] / 1024:,.0f} KB → "
+                       f"{payload['after_bytes'] / 1024:,.0f} KB ({', '.join(payload['steps'])})")
+        if prof.enabled:
+            rec["rows"] = profiling.chart_points(fig)
+            rec["payload_kb"] = payload["after_bytes"] / 1024
+            rec["saved_kb"] = payload["saved_bytes"] / 1024
 
-    # ===== 자동차 등록 대수 분석 =====
-    st.markdown("### 🚗 자동차 등록 대수 분석")
-    df_car_info["전기차비율(%)"] = (df_car_info["전기차등록대수"] / df_car_info["전체차량등록대수"] * 100).round(2)
-    df_car_info["비EV등록대수"] = df_car_info["전체차량등록대수"] - df_car_info["전기차등록대수"]
 
-    latest_year = df_car_info["연도"].max()
-    latest_data = df_car_info[df_car_info["연도"] == latest_year].iloc[0]
+# ==============================
+# Tab1: 전체 데이터 KPI + Plotly 시각화
+# ==============================
+@st.cache_resource(show_spinner=False, max_entries=4)
+def tab1_content(version):
+    # 사이드바와 무관하므로 입력 파일이 바뀔 때만 다시 만든다 (세션 간 공유).
+    # Tab1 의 모든 수치는 원시 로그가 아닌 연도별 집계 큐브에서 계산한다.
+    # 큐브는 ingest 가 .ingest/ 에 누적 저장하므로, 로그에 행이 덧붙으면 새 행만 읽어 더한다.
+    df_car_info = data_loader.load_csv(data_loader.car_info)
+    with prof.stage(f"preprocess/{'ingest' if backend.name == 'pandas' else backend.name}") as rec:
+        counts = query_backend.fire_counts(backend)
+        rec["rows"] = int(counts["화재건수"].sum())
+    return content.tab1(counts, df_car_info)
+
+
+def render_tab1():
+    with prof.stage("tab1/aggregate"):
+        tab1 = tab1_content(data_version(data_loader.fire_total, data_loader.fire_EV, data_loader.car_info))
 
-    # ===== 자동차 등록대수 KPI 카드 표시 =====
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown(f"""
-        <div class="kpi-card kpi-1">
-            <div class="kpi-title">전체 차량 등록대수</div>
-            <div class="kpi-value">{latest_data['전체차량등록대수']:,} 대</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown("### 🔥 전기차 화재 분석")
+    kpi_cards(tab1["fire_kpis"])
+    plotly_chart("tab1/fire", tab1["fig_fire"])
 
-    with col2:
-        st.markdown(f"""
-        <div class="kpi-card kpi-2">
-            <div class="kpi-title">전기차 등록대수</div>
-            <div class="kpi-value">{latest_data['전기차등록대수']:,} 대</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div class="kpi-card kpi-3">
-            <div class="kpi-title">전기차 등록 비율</div>
-            <div class="kpi-value">{latest_data['전기차비율(%)']}%</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    # 🚗 등록대수 시각화 (전체 등록대수 기준 + EV 등록 비율 선)
-    fig_car = go.Figure()
-    fig_car.add_trace(go.Bar(
-        x=df_car_info["연도"],
-        y=df_car_info["전기차등록대수"],
-        name="전기차 등록대수 (대)",
-        marker_color="orange"
-    ))
-    fig_car.add_trace(go.Bar(
-        x=df_car_info["연도"],
-        y=df_car_info["비EV등록대수"],
-        name="전체 차량 등록대수 (대)",
-        marker_color="lightblue"
-    ))
-    fig_car.add_trace(go.Scatter(
-        x=df_car_info["연도"],
-        y=df_car_info["전기차비율(%)"],
-        name="전기차 등록 비율 (%)",
-        mode="lines+markers",
-        line=dict(color="royalblue", width=2),
-        yaxis="y2"
-    ))
-    fig_car.update_layout(
-        title="전체/전기차 등록 비교",
-        xaxis=dict(title="연도"),
-        yaxis=dict(title="등록대수 (대)"),
-        yaxis2=dict(title="EV 등록 비율 (%)", overlaying="y", side="right"),
-        barmode="stack",
-        template="plotly_white",
-        height=500
-    )
-    st.plotly_chart(fig_car, use_container_width=True)
+    st.markdown("### 🚗 자동차 등록 대수 분석")
+    kpi_cards(tab1["car_kpis"])
+    plotly_chart("tab1/car", tab1["fig_car"])
 
     st.markdown("### 🔥 1만대당 화재 건수 비교")
-
-    # 연도별 등록대수, 화재건수
-    df_car_info = df_car_info.set_index("연도")
-
-    # 전기차 등록대수 & 화재건수
-    ev_registered = df_car_info["전기차등록대수"]
-    ev_fire_by_year = df_fire_EV.groupby("연도").size()
-
-    # 내연기관 등록대수 & 화재건수
-    ice_registered = df_car_info["전체차량등록대수"] - ev_registered
-    ice_fire_by_year = df_fire_total.groupby("연도").size() - ev_fire_by_year
-
-    # 10만대당 화재 건수 계산
-    ev_fire_per_100k = (ev_fire_by_year / ev_registered * 10000).round(2)
-    ice_fire_per_100k = (ice_fire_by_year / ice_registered * 10000).round(2)
-
-    # 전기차 시각화
-    fig_ev = go.Figure()
-    fig_ev.add_trace(go.Bar(
-        x=ev_registered.index,
-        y=ev_registered.values,
-        name="전기차 등록대수 (대)",
-        marker_color="royalblue",
-        yaxis="y1"
-    ))
-    fig_ev.add_trace(go.Scatter(
-        x=ev_fire_per_100k.index,
-        y=ev_fire_per_100k.values,
-        name="전기차 화재 1만대당 (건)",
-        mode="lines+markers",
-        marker_color="tomato",
-        yaxis="y2"
-    ))
-    fig_ev.update_layout(
-        title="연도별 전기차 등록대수 & 1만대당 화재",
-        xaxis_title="연도",
-        yaxis=dict(title="전기차 등록대수 (대)", side="left"),
-        yaxis2=dict(title="1만대당 화재 (건)", overlaying="y", side="right"),
-        template="plotly_white"
-    )
-    st.plotly_chart(fig_ev, use_container_width=True)
-
-    # 내연기관 시각화
-    fig_ice = go.Figure()
-    fig_ice.add_trace(go.Bar(
-        x=ice_registered.index,
-        y=ice_registered.values,
-        name="내연기관 등록대수 (대)",
-        marker_color="seagreen",
-        yaxis="y1"
-    ))
-    fig_ice.add_trace(go.Scatter(
-        x=ice_fire_per_100k.index,
-        y=ice_fire_per_100k.values,
-        name="내연기관 화재 1만대당 (건)",
-        mode="lines+markers",
-        marker_color="orange",
-        yaxis="y2"
-    ))
-    fig_ice.update_layout(
-        title="연도별 내연기관 등록대수 & 1만대당 화재",
-        xaxis_title="연도",
-        yaxis=dict(title="내연기관 등록대수 (대)", side="left"),
-        yaxis2=dict(title="1만대당 화재 (건)", overlaying="y", side="right"),
-        template="plotly_white"
-    )
-    st.plotly_chart(fig_ice, use_container_width=True)
+    plotly_chart("tab1/ev", tab1["fig_ev"])
+    plotly_chart("tab1/ice", tab1["fig_ice"])
+    for note in tab1["rate_notes"]:
+        st.caption(note)
 
     # Tab1 분석 인사이트
     st.markdown("### 📌 분석 인사이트")
 
+
 # ==============================
 # Tab2: 필터 적용 분석
 # ==============================
-with tab2:
-    st.markdown("### 🔥 전기차 화재 필터링 분석")
-
- # ===== KPI 카드 =====
-    filtered_count = len(df_ev_filtered)
-    total_count = len(df_fire_EV)
-    filter_ratio = round(filtered_count / total_count * 100, 2)
+def render_tab2():
+    # ===== 필터 적용 데이터 =====
+    # pandas: 필터된 DataFrame 을 만들지 않고 값별 비트맵의 AND/popcount 로 Tab2 수치를 계산한다.
+    # duckdb: 전기차 로그 한 번의 GROUPING SETS 질의로 계산한다.
+    # 같은 선택 조합의 결과는 LRU 캐시에서 재사용하고, 전기차 데이터가 바뀌면 캐시를 비운다.
+    if backend.name == "pandas":
+        with prof.stage("preprocess/filter_index") as rec:
+            rec["rows"] = filter_index.load_index().n_rows
+    with prof.stage("tab2/aggregate", rows=len(df_fire_EV)):
+        tab2_result = filter_cache.tab2_cache.get(
+            data_loader.file_signature(data_loader.fire_EV),
+            filter_cache.selection_key(year_filter, subcause_filter, status_filter),
+            lambda: backend.filtered_breakdown(year_filter, subcause_filter, status_filter),
+        )
+    cache_stats = filter_cache.tab2_cache.stats()
+    st.sidebar.caption(
+        f"필터 캐시: 적중 {cache_stats['hits']:,} · 미스 {cache_stats['misses']:,} "
+        f"({cache_stats['hit_rate']:.0%}) · {cache_stats['entries']}개 항목, "
+        f"{cache_stats['used_mb']:.1f}/{cache_stats['budget_mb']:.0f} MB"
+    )
 
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown(f"""
-        <div class="kpi-card kpi-1">
-            <div class="kpi-title">전기차 총 화재 건수</div>
-            <div class="kpi-value">{total_count:,} 건</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown("### 🔥 전기차 화재 필터링 분석")
 
-    with col2:
-        st.markdown(f"""
-        <div class="kpi-card kpi-2">
-            <div class="kpi-title">필터 적용 후 건수</div>
-            <div class="kpi-value">{filtered_count:,} 건</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div class="kpi-card kpi-3">
-            <div class="kpi-title">필터데이터/전체 비율</div>
-            <div class="kpi-value">{filter_ratio}%</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # ===== KPI 카드 =====
+    kpi_cards(content.tab2_kpis(tab2_result))
+    charts = content.tab2_charts(tab2_result)
 
     # ===== 발화요인 소분류 =====
     st.markdown("### 🔥 화재별 발화요인")
-
-    ev_fire_subcause_filtered = df_ev_filtered["발화요인소분류"].value_counts().sort_values(ascending=True)
-    if not ev_fire_subcause_filtered.empty:
-        fig_subcause = go.Figure(go.Bar(
-            x=ev_fire_subcause_filtered.values,
-            y=ev_fire_subcause_filtered.index,
-            orientation='h',
-            text=ev_fire_subcause_filtered.values,
-            textposition='auto',
-            marker_color='orange'
-        ))
-        fig_subcause.update_layout(
-            xaxis_title="총량",
-            yaxis_title="발화요인",
-            template="plotly_white",
-            height=600
-        )
-        st.plotly_chart(fig_subcause, use_container_width=True)
+    if charts["subcause"] is not None:
+        plotly_chart("tab2/subcause", *charts["subcause"])
     else:
         st.info("선택된 필터에 해당하는 데이터가 없습니다.")
 
     # ===== 차량상태 (도넛 차트) =====
     st.markdown("### 🚗 차량상태별 비율")
-    status_counts = df_ev_filtered["차량상태"].value_counts()
-
-    fig_status = go.Figure(go.Pie(
-        labels=status_counts.index,
-        values=status_counts.values,
-        hole=0.4,  # 도넛
-        textinfo='percent+label'
-    ))
-    fig_status.update_layout(
-        title="차량상태별 비율 (필터 적용)",
-        template="plotly_white",
-        height=400
-    )
-    st.plotly_chart(fig_status, use_container_width=True)
+    plotly_chart("tab2/status", *charts["status"])
 
     # ===== 연도별 필터 전/후 & 비율 그래프 통합 =====
     st.markdown("### 📊 연도별 화재 건수 및 필터 후 비율")
-
-    total_by_year = df_fire_EV["연도"].value_counts().sort_index() 
-    filtered_by_year = df_ev_filtered["연도"].value_counts().sort_index()
-    compare_df = pd.DataFrame({
-        "연도": total_by_year.index,
-        "필터 전": total_by_year.values,
-        "필터 후": filtered_by_year.reindex(total_by_year.index, fill_value=0).values
-    })
-
-    # 비율 계산
-    ratio_by_year = (compare_df["필터 후"] / compare_df["필터 전"] * 100).round(2)
-
-    # Figure 생성
-    fig_combined = go.Figure()
-
-    # Bar - 필터 전/후
-    fig_combined.add_trace(go.Bar(
-        x=compare_df["연도"], y=compare_df["필터 전"],
-        name="필터 전 (건)",
-        marker_color="lightgray",
-        text=compare_df["필터 전"],
-        textposition='outside',
-        yaxis="y1"
-    ))
-    fig_combined.add_trace(go.Bar(
-        x=compare_df["연도"], y=compare_df["필터 후"],
-        name="필터 후 (건)",
-        marker_color="dodgerblue",
-        text=compare_df["필터 후"],
-        textposition='outside',
-        yaxis="y1"
-    ))
-    # Line - 필터 후 비율
-    fig_combined.add_trace(go.Scatter(
-        x=compare_df["연도"], y=ratio_by_year,
-        mode="lines+markers+text",
-        name="필터 후 비율 (%)",
-        text=ratio_by_year,
-        textposition="top center",
-        line=dict(color="green", width=2),
-        yaxis="y2"
-    ))
-    # Layout 설정 (2축)
-    fig_combined.update_layout(
-        title="필터 전/후 데이터 비교",
-        xaxis=dict(title="연도"),
-        yaxis=dict(title="필터 전/후 화재 (건)", side="left"),
-        yaxis2=dict(title="필터 전/후 비율 (%)", overlaying="y", side="right"),
-        barmode='group',
-        template="plotly_white"
-    )
-    st.plotly_chart(fig_combined, use_container_width=True)
+    plotly_chart("tab2/filter_compare", *charts["filter_compare"])
 
 
 # ==============================
-# Tab3: 지역별 충전소 대비 전기차 화재 비율
+# Tab3: 제조사별 화재, 최초발화점, 해외 비교
 # ==============================
+@st.cache_resource(show_spinner=False, max_entries=4)
+def tab3_content(version):
+    # 해외 비교의 한국 대비 화재율 비는 Tab1 과 같은 연도별 표(집계 큐브 + 등록대수)로 계산한다.
+    counts = query_backend.fire_counts(backend)
+    yearly = analysis.fire_summary(counts, data_loader.load_csv(data_loader.car_info))["yearly"]
+    return content.tab3(vehicle_dim.load_index(), data_loader.load_csv(data_loader.foreign_fire),
+                        data_loader.load_csv(data_loader.manufac_fire), yearly)
 
 
-with tab3:
-    # 시각화용 데이터
-    manufacturer_counts = df_car_maker["제조사"].value_counts()
-    fire_origin_counts = df_car_maker["최초발화점"].value_counts()
-    situation_counts = df_car_maker["상황"].value_counts()
-
-    total_counts = len(df_car_maker)
-    filtered_df = df_car_maker[(df_car_maker["최초발화점"] == "고전압배터리") & (df_car_maker["상황"] != "주행중(충돌)")]
-    filter_count = len(filtered_df)
-    filter_m_ratio = round(filter_count / total_counts * 100, 2)
+def render_tab3():
+    with prof.stage("tab3/aggregate"):
+        tab3 = tab3_content(data_version(data_loader.car_maker, data_loader.foreign_fire, data_loader.manufac_fire,
+                                         data_loader.fire_total, data_loader.fire_EV, data_loader.car_info))
 
     # 추가자료 시각화
     st.markdown("### 🔥 전기차 제조사별 화재")
-
-    fig_subcause = go.Figure(go.Bar(
-        x=manufacturer_counts.index,
-        y=manufacturer_counts.values,
-        text=manufacturer_counts.values,
-        textposition='auto',
-        marker_color='orange'
-    ))
-    fig_subcause.update_layout(
-        xaxis_title="제조사",
-        yaxis_title="건수",
-        template="plotly_white",
-        height=500
-    )
-    st.plotly_chart(fig_subcause, use_container_width=True)
+    plotly_chart("tab3/manufacturer", tab3["fig_manufacturer"])
 
     st.markdown("### 🚗 제조사별 화재 비교")
-
-    fig = go.Figure()
-    # 왼쪽 y축 (10만대당 화재)
-    fig.add_trace(go.Scatter(
-        x=df_manufac_fire["제조사"],
-        y=df_manufac_fire["전기차10만대당"],
-        mode='lines+markers+text',
-        name="전기차 화재 10만대당 (건)",
-        marker=dict(size=10, color='red', symbol='circle'),
-        line=dict(width=2),
-        text=df_manufac_fire["전기차10만대당"],
-        textposition="top center"
-    ))
-    fig.add_trace(go.Scatter(
-        x=df_manufac_fire["제조사"],
-        y=df_manufac_fire["배터리10만대당"],
-        mode='lines+markers+text',
-        name="배터리 화재 10만대당 (건)",
-        marker=dict(size=10, color='green', symbol='triangle-up'),
-        line=dict(width=2),
-        text=df_manufac_fire["배터리10만대당"],
-        textposition="bottom center"
-    ))
-    # 오른쪽 y축 (점유율)
-    fig.add_trace(go.Scatter(
-        x=df_manufac_fire["제조사"],
-        y=df_manufac_fire["점유율"],
-        mode='lines+markers+text',
-        name="제조사 점유율 (%)",
-        marker=dict(size=10, color='orange', symbol='diamond'),
-        line=dict(width=3, dash='dash'),
-        text=df_manufac_fire["점유율"].apply(lambda x: f"{x}%"),
-        textposition="top right",
-        yaxis="y2"
-    ))
-    fig.update_layout(
-        title="제조사별 점유율 & 전기차/배터리 10만대당 화재 비교",
-        xaxis_title="제조사",
-        yaxis=dict(title="10만대당 화재 (건)"),
-        yaxis2=dict(title="점유율 (%)", overlaying="y", side="right"),
-        template="plotly_white",
-        height=600,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        ),
-        margin=dict(t=80)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart("tab3/manufacturer_compare", tab3["fig_manufacturer_compare"])
+    for note in tab3["rate_notes"]:
+        st.caption(note)
 
     st.markdown("### 🚗 최초 발화점 비율")
-
     col4, col5 = st.columns(2)
     with col4:
-        fig_status = go.Figure(go.Pie(
-            labels=fire_origin_counts.index,
-            values=fire_origin_counts.values,
-            hole=0.4,  # 도넛
-            textinfo='percent+label'
-        ))
-        fig_status.update_layout(
-            title="최초발화점",
-            template="plotly_white",
-            height=400
-        )
-        st.plotly_chart(fig_status, use_container_width=True)
-
+        plotly_chart("tab3/origin", tab3["fig_origin"])
     with col5:
-        fig_status = go.Figure(go.Pie(
-            labels=situation_counts.index,
-            values=situation_counts.values,
-            hole=0.4,  # 도넛
-            textinfo='percent+label'
-        ))
-        fig_status.update_layout(
-            title="상황",
-            template="plotly_white",
-            height=400
-        )
-        st.plotly_chart(fig_status, use_container_width=True)
+        plotly_chart("tab3/situation", tab3["fig_situation"])
+
+    st.markdown("### 🏭 제조사별 최초발화점 · 상황")
+    col6, col7 = st.columns(2)
+    with col6:
+        plotly_chart("tab3/maker_origin", tab3["fig_maker_origin"])
+    with col7:
+        plotly_chart("tab3/maker_situation", tab3["fig_maker_situation"])
+    for note in tab3["maker_notes"]:
+        st.caption(note)
 
     st.markdown("### 🚗 전기차 안정성 분석")
+    kpi_cards(tab3["safety_kpis"])
 
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown(f"""
-        <div class="kpi-card kpi-1">
-            <div class="kpi-title">총 화재 건수</div>
-            <div class="kpi-value">{total_counts:,} 건</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown("### 🌎 해외 전기차 화재 비교")
+    plotly_chart("tab3/foreign", tab3["fig_foreign"])
 
+
+# ==============================
+# 지역별: 전국 → 시도 → 시군구 드릴다운
+# ==============================
+def render_regions():
+    # 지역 계층 인덱스에 미리 집계해 둔 건수를 조회만 한다 (사이드바 필터 적용).
+    with prof.stage("preprocess/regional_index") as rec:
+        index = regional_index.load_index()
+        rec["rows"] = int(index.cube[0].flat[-1])
+    sido_names = index.nodes.loc[index.nodes["단계"] == "시도", "시도"].tolist()
+    sido = st.selectbox("지역 선택", [regional_index.NATION] + sido_names, key="region")
+
+    df_region_reg = None
+    if os.path.exists(data_loader.region_registrations):
+        df_region_reg = data_loader.load_csv(data_loader.region_registrations)
+    with prof.stage("regions/aggregate"):
+        summary = analysis.region_summary(index, sido, year_filter, subcause_filter, status_filter, df_region_reg)
+
+    st.markdown(f"### 🗺️ {summary['region']} 전기차 화재")
+    kpi_cards(content.region_kpis(summary))
+    charts = content.region_charts(summary, sido)
+
+    regions = summary["regions"]
+    level = content.region_level(sido)
+    st.markdown(f"### 📍 {level}별 화재 건수" + (" 및 1만대당 화재" if df_region_reg is not None else ""))
+    if len(regions) > render_layer.TOP_N:
+        st.caption(f"화재 건수 상위 {render_layer.TOP_N}개 {level}만 표시합니다 (전체 {len(regions)}개).")
+    plotly_chart("regions/breakdown", *charts["breakdown"])
+
+    st.markdown("### 📈 연도별 추이")
+    plotly_chart("regions/trend", *charts["trend"])
+    for note in content.region_notes(summary):
+        st.caption(note)
+    if df_region_reg is None:
+        st.caption(f"{data_loader.region_registrations} 이 있으면 지역별 1만대당 화재도 함께 표시합니다.")
+
+
+# ==============================
+# 시기별: 기간 필터 + 월/요일/시간대 분포
+# ==============================
+def render_temporal():
+    # 날짜순으로 정렬해 둔 인덱스에서 기간/연도는 이진 탐색으로 행 구간을 찾고, 그 구간만 센다.
+    # 사이드바 연도 선택은 두 데이터 모두, 발화요인/차량상태 선택은 전기차 데이터에만 적용한다.
+    source = st.radio("데이터", list(time_index.SOURCES), horizontal=True, key="temporal_source")
+    with prof.stage("preprocess/time_index") as rec:
+        index = time_index.load_index(source)
+        rec["rows"] = index.n_rows
+    date_range = index.date_range()
+    if date_range is None:
+        st.info("날짜가 있는 화재 데이터가 없습니다.")
+        return
+    first, last = date_range
+    period = st.date_input("기간 선택", value=(first, last), min_value=first, max_value=last,
+                           key=f"period/{source}")
+    # 달력에서 시작일만 고른 상태면 그 하루만
+    start, end = (period[0], period[-1]) if len(period) else (first, last)
+    filters = None
+    if source == "전기차":
+        filters = {"발화요인소분류": list(subcause_filter) or None, "차량상태": list(status_filter) or None}
+    with prof.stage("temporal/aggregate", rows=index.n_rows):
+        summary = analysis.temporal_summary(index, start, end, year_filter, filters)
+
+    st.markdown(f"### ⏰ {source} 화재 시기별 분석")
+    kpi_cards(content.temporal_kpis(summary))
+    if index.n_missing:
+        st.caption(f"날짜가 없는 {index.n_missing:,}건은 제외했습니다.")
+    charts = content.temporal_charts(summary, source)
+    if charts is None:
+        st.info("선택된 기간/필터에 해당하는 데이터가 없습니다.")
+        return
+
+    st.markdown("### 📈 월별 추이")
+    plotly_chart("temporal/monthly", *charts["monthly"])
+    st.markdown("### 📅 월 · 요일 · 시간대별 분포")
+    col1, col2 = st.columns(2)
+    with col1:
+        plotly_chart("temporal/month_of_year", *charts["month_of_year"])
     with col2:
-        st.markdown(f"""
-        <div class="kpi-card kpi-2">
-            <div class="kpi-title">고전압배터리 중 주행중(충돌)이 아닌 것</div>
-            <div class="kpi-value">{filter_count:,} 건</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div class="kpi-card kpi-3">
-            <div class="kpi-title">비율</div>
-            <div class="kpi-value">{filter_m_ratio}%</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("### 🌎 해외 전기차 화재 비교")
+        plotly_chart("temporal/weekday", *charts["weekday"])
+    if charts["hour"] is not None:
+        plotly_chart("temporal/hour", *charts["hour"])
+    else:
+        st.caption("전기차 화재 데이터는 화재발생일만 있어 시간대 분포를 표시하지 않습니다.")
 
-    df_forieign_cleaned = df_foreign_fire.dropna(subset=["전기차(만대당)"])
-    df_selected = df_forieign_cleaned[["연도", "국가", "전기차(만대당)"]]
-    new_row1 = {"연도": 2021, "국가": "한국", "전기차(만대당)": 1.04}
-    new_row2 = {"연도": 2022, "국가": "한국", "전기차(만대당)": 1.1}
-    new_row3 = {"연도": 2023, "국가": "한국", "전기차(만대당)": 1.32}
-    df_selected = pd.concat([df_selected, pd.DataFrame([new_row1])], ignore_index=True)
-    df_selected = pd.concat([df_selected, pd.DataFrame([new_row2])], ignore_index=True)
-    df_selected = pd.concat([df_selected, pd.DataFrame([new_row3])], ignore_index=True)
-    df_selected["연도"] = df_selected["연도"].astype(int)
-    df_selected = df_selected.sort_values(by="연도", ascending=True).reset_index(drop=True)
-
-    # 연도별 그룹 국가별 막대그래프
-    fig_bar = px.bar(
-        df_selected,
-        x="연도",
-        y="전기차(만대당)",
-        color="국가",
-        barmode="group",          # 연도 안에서 국가별 막대 나란히
-        text="전기차(만대당)",
-        labels={"전기차(만대당)": "전기차 1만대당 (대)"},
-        title="국가별 전기차(1만대당) 화재"
-    )
-    fig_bar.update_layout(
-        template="plotly_white",
-        yaxis=dict(title="전기차 1만대당 (건)"),
-        height=500
+
+# ==============================
+# 데이터 품질 검사: 파일별 검사/격리 요약
+# ==============================
+QUALITY_PREVIEW_ROWS = 200
+
+
+def render_quality():
+    # 로더가 집계 전에 걸러 낸 행 (validation.py). 날짜/연번이 없거나 깨진 행, 연번 중복, 등록대수 이상값은
+    # 모든 탭의 수치에서 빠지고 .quarantine/<파일>.csv 에 사유와 함께 남는다.
+    # 허용값 목록 밖의 발화요인/차량상태, 대분류와 맞지 않는 소분류는 경고만 하고 수치에 그대로 포함한다.
+    with prof.stage("quality/aggregate"):
+        summary = analysis.quality_summary(analysis.load_quality_reports())
+
+    st.markdown("### 🧪 데이터 품질 검사")
+    kpi_cards(content.quality_kpis(summary))
+    st.dataframe(summary["files"], width="stretch", hide_index=True)
+    if summary["warned"]:
+        st.markdown("### ⚠️ 검사 경고 (집계 포함)")
+        st.dataframe(summary["warnings"], width="stretch", hide_index=True)
+        st.caption("허용값 목록(data_loader.FIRE_CAUSES, VEHICLE_STATES)에 없는 값입니다. "
+                   "새 코드면 목록에 더하고, 오타면 원본을 고칩니다.")
+    if not summary["quarantined"]:
+        st.info("검사 규칙에 어긋난 행이 없습니다.")
+        return
+
+    st.markdown("### 📋 격리 사유")
+    st.dataframe(summary["reasons"], width="stretch", hide_index=True)
+    st.caption("한 행이 여러 규칙에 걸리면 사유마다 한 번씩 셉니다.")
+
+    files = summary["files"].set_index("파일")
+    name = st.selectbox("격리된 행 보기", files.index[files["격리"] > 0].tolist(), key="quality_file")
+    path = files.loc[name, "격리 파일"]
+    if path is None:
+        st.caption("격리 파일을 쓸 수 없는 폴더라 요약만 표시합니다.")
+        return
+    st.dataframe(validation.read_quarantined(path, QUALITY_PREVIEW_ROWS), width="stretch", hide_index=True)
+    st.caption(f"처음 {QUALITY_PREVIEW_ROWS}행까지 표시 · 전체: {os.path.abspath(path)}")
+
+
+# ===== 탭 구조 =====
+# st.tabs 는 모든 탭을 매번 실행하므로, 선택된 탭 하나만 계산/렌더링한다.
+# EV_DASHBOARD_EAGER_TABS=1 이면 예전처럼 모든 탭을 그린다 (비교 측정용).
+TABS = {
+    "📊 주요 분석": render_tab1,
+    "🔥 전기차 화재 필터링 분석": render_tab2,
+    "📍 추가 참고 분석 데이터": render_tab3,
+    "🗺️ 지역별 화재 분석": render_regions,
+    "⏰ 시기별 화재 분석": render_temporal,
+    "🧪 데이터 품질 검사": render_quality,
+}
+
+if os.environ.get("EV_DASHBOARD_EAGER_TABS") == "1":
+    for tab, render in zip(st.tabs(list(TABS)), TABS.values()):
+        with tab:
+            render()
+else:
+    active_tab = st.radio("탭 선택", list(TABS), horizontal=True, key="active_tab", label_visibility="collapsed")
+    TABS[active_tab]()
+
+# ===== 사이드바 읽기 통계 =====
+read_stats = data_loader.last_read_stats
+if read_stats:
+    read_stats_slot.caption(
+        f"통합 화재 로그: {read_stats['rows_read']:,}행 중 차량 화재 {read_stats['rows_kept']:,}행"
+        + (f" (격리 {read_stats['quarantined']:,}행 제외)" if read_stats.get("quarantined") else "")
+        + (f" · 최대 RSS {read_stats['peak_rss_mb']:.0f} MB" if read_stats["peak_rss_mb"] is not None else "")
     )
-    st.plotly_chart(fig_bar, use_container_width=True)
+
+# ===== SQL 질의 패널 (EV_SQL_PANEL=1, DuckDB) =====
+# 분석가용 임의 SELECT. 표 이름은 query_backend.TABLES (fire_total, fire_ev, car_info ...)
+if query_backend.SQL_PANEL:
+    sql_backend = query_backend.get_backend("duckdb")
+    with st.expander("🧮 SQL 질의 (DuckDB)"):
+        if sql_backend.name != "duckdb":
+            st.info("duckdb 패키지가 설치되어 있지 않습니다.")
+        else:
+            st.caption("표: " + ", ".join(sql_backend.tables)
+                       + f" · SELECT 문 하나만 실행하며 결과는 {query_backend.SQL_MAX_ROWS:,}행까지 표시합니다.")
+            sql = st.text_area("SQL", "SELECT \"연도\", count(*) AS \"화재건수\" FROM fire_ev GROUP BY ALL ORDER BY 1",
+                               key="sql_query")
+            if st.button("실행", key="sql_run"):
+                with prof.stage("sql_panel/query") as rec:
+                    try:
+                        result, truncated = sql_backend.query(sql)
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        rec["rows"] = len(result)
+                        st.dataframe(result, width="stretch", hide_index=True)
+                        if truncated:
+                            st.caption(f"결과가 많아 처음 {query_backend.SQL_MAX_ROWS:,}행만 표시합니다.")
+
+# ===== 진단 패널 =====
+if prof.enabled:
+    prof.write_log()
+    with st.expander("🩺 진단: 단계별 시간/메모리"):
+        shared = data_loader.cache_stats()
+        st.caption(f"이번 rerun ({prof.run_id}) · 로그: {os.path.abspath(profiling.LOG_PATH)} · "
+                   f"세션 공유 데이터 {shared['entries']}개, {shared['mb']:.1f} MB")
+        st.dataframe(prof.table(), width="stretch", hide_index=True)
+        st.caption("최근 rerun 누적 (느린 단계부터)")
+        st.dataframe(profiling.summarize(), width="stretch", hide_index=True)
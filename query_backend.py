@@ -0,0 +1,331 @@
+import argparse
+import os
+import threading
+
+import pandas as pd
+
+import analysis
+import data_loader
+import filter_index
+import ingest
+import parquet_store
+
+# ===== 집계 질의 백엔드 (pandas / DuckDB) =====
+# 대시보드의 핵심 집계를 같은 결과 형태로 돌려주는 두 구현.
+#   pandas : 로더가 캐시한 프레임에서 계산하는 기존 경로 (ingest.count_fires, filter_index 비트맵)
+#   duckdb : 서버 없이 프로세스 안에서 도는 DuckDB 가 Parquet 사이드카를 직접 질의한다.
+#            사이드카는 품질 검사(validation)를 통과한 행만 담으므로 pandas 로더와 같은 행을 본다.
+#            사이드카를 쓸 수 없는 폴더면 로더가 검사해 읽은 프레임을 등록한다 (원본 CSV 를 바로 읽지 않는다).
+#            필요한 컬럼과 조건만 읽고 (projection/filter pushdown), 스캔과 집계는 여러 스레드로 나눠 돈다.
+#            원시 행을 프레임으로 올려 두지 않으므로 캐시 메모리도 들지 않는다.
+# EV_QUERY_BACKEND=duckdb 로 고른다 (기본 pandas). duckdb 패키지가 없으면 pandas 로 돌아간다.
+# EV_SQL_PANEL=1 이면 대시보드에 분석가용 SQL 질의 패널을 띄운다 (DuckDB 필요, SELECT 한 문장만).
+# 사용법: python query_backend.py [--data-dir .] "SELECT 시도, count(*) FROM fire_ev GROUP BY ALL"
+#         python query_backend.py [--data-dir .] --check   # 두 백엔드 결과 비교, 다르면 종료 코드 1
+BACKEND = os.environ.get("EV_QUERY_BACKEND", "pandas")
+SQL_PANEL = os.environ.get("EV_SQL_PANEL") == "1"
+# 질의 패널이 돌려주는 최대 행 수
+SQL_MAX_ROWS = 1000
+
+# SQL 에서 쓰는 표 이름 -> 파일 (모두 검사를 거친 Parquet 사이드카로 읽는다)
+TABLES = {
+    "fire_total": data_loader.fire_total,
+    "fire_ev": data_loader.fire_EV,
+    "car_info": data_loader.car_info,
+    "car_maker": data_loader.car_maker,
+    "foreign_fire": data_loader.foreign_fire,
+    "manufac_fire": data_loader.manufac_fire,
+    "region_registrations": data_loader.region_registrations,
+}
+
+
+def place_list():
+    return ", ".join("'" + place.replace("'", "''") + "'" for place in data_loader.VEHICLE_PLACES)
+
+
+# ==============================
+# pandas: 기존 경로
+# ==============================
+class PandasBackend:
+    name = "pandas"
+
+    def __init__(self, data_dir="."):
+        self.data_dir = data_dir
+
+    def path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def fire_counts(self):
+        # ingest 큐브의 (연도, 차종, 전기차) 화재건수
+        return ingest.merge_counts(
+            ingest.count_fires(data_loader.load_vehicle_fires(self.path(data_loader.fire_total)), is_ev=False),
+            ingest.count_fires(data_loader.load_csv(self.path(data_loader.fire_EV), ["연도"]), is_ev=True),
+        )
+
+    def filtered_breakdown(self, year_filter, subcause_filter=(), status_filter=()):
+        index = filter_index.load_index(self.path(data_loader.fire_EV))
+        return analysis.filtered_breakdown(index, year_filter, subcause_filter, status_filter)
+
+
+# ==============================
+# DuckDB: 원본 파일 직접 질의
+# ==============================
+class DuckDBBackend:
+    name = "duckdb"
+
+    def __init__(self, data_dir="."):
+        import duckdb
+
+        self.data_dir = data_dir
+        self.con = duckdb.connect()
+        self.lock = threading.Lock()
+        self.tables = {}
+        self.refresh()
+        # 질의 패널의 SQL 이 원본 파일(과 사이드카) 밖을 읽거나 설정을 바꾸지 못하게 잠근다.
+        self.con.execute("SET allowed_paths = ?", [self.allowed_paths()])
+        self.con.execute("SET enable_external_access = false")
+        self.con.execute("SET lock_configuration = true")
+
+    def allowed_paths(self):
+        paths = []
+        for table, name in TABLES.items():
+            path = os.path.abspath(os.path.join(self.data_dir, name))
+            paths += [path, parquet_store.sidecar_path(path)]
+        return paths
+
+    def refresh(self):
+        # 원본이 바뀌었으면 Parquet 사이드카를 다시 만들고, 표(view)를 (다시) 정의한다.
+        with self.lock:
+            for table, name in TABLES.items():
+                path = os.path.join(self.data_dir, name)
+                if not os.path.exists(path):
+                    continue
+                try:
+                    source = data_loader.ensure_parquet(path)
+                except OSError:
+                    # 사이드카를 쓸 수 없으면 검사를 거친 프레임을 등록한다 (원본이 바뀌면 다시 등록).
+                    source = data_loader.file_signature(path)
+                previous = self.tables.get(table)
+                if previous == source:
+                    continue
+                if previous is not None:
+                    self.con.execute(f"DROP {'VIEW' if isinstance(previous, str) else 'TABLE'} {table}")
+                if isinstance(source, str):
+                    quoted = os.path.abspath(source).replace("'", "''")
+                    self.con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{quoted}')")
+                else:
+                    # 등록한 프레임은 이 연결에서만 보이므로 표로 복사해 두고 등록은 푼다 (세션 커서에서도 보이게).
+                    self.con.register("checked_frame", data_loader.load_parquet(path))
+                    self.con.execute(f"CREATE TABLE {table} AS SELECT * FROM checked_frame")
+                    self.con.unregister("checked_frame")
+                self.tables[table] = source
+
+    def execute(self, sql, params=None):
+        # 세션(스레드)마다 커서를 따로 쓴다.
+        self.refresh()
+        return self.con.cursor().execute(sql, params or []).df()
+
+    def fire_counts(self):
+        counts = self.execute(f"""
+            SELECT "연도", "장소소분류" AS "차종", false AS "전기차", count(*) AS "화재건수"
+            FROM fire_total WHERE "장소소분류" IN ({place_list()}) GROUP BY ALL
+            UNION ALL
+            SELECT "연도", '전체', true, count(*) FROM fire_ev GROUP BY ALL
+            ORDER BY "연도" NULLS LAST, "차종", "전기차"
+        """)
+        return counts.astype({"화재건수": "int64"})
+
+    def filtered_breakdown(self, year_filter, subcause_filter=(), status_filter=()):
+        # 연도/발화요인/차량상태별 필터 전·후 건수를 GROUPING SETS 한 번의 스캔으로 센다.
+        # 빈 발화요인/차량상태 선택 = 조건 없음, 빈 연도 선택 = 0건 (사이드바와 동일)
+        conditions = ['list_contains(?::INTEGER[], CAST("연도" AS INTEGER))']
+        params = [[int(y) for y in year_filter]]
+        for col, values in [("발화요인소분류", subcause_filter), ("차량상태", status_filter)]:
+            if values:
+                conditions.append(f'list_contains(?::VARCHAR[], "{col}")')
+                params.append([str(v) for v in values])
+        table = self.execute(f"""
+            SELECT "연도", "발화요인소분류", "차량상태",
+                   count(*) AS "필터 전",
+                   count(*) FILTER (WHERE {" AND ".join(conditions)}) AS "필터 후",
+                   grouping("연도", "발화요인소분류", "차량상태") AS "집합"
+            FROM fire_ev
+            GROUP BY GROUPING SETS (("연도"), ("발화요인소분류"), ("차량상태"))
+        """, params)
+
+        def grouped(col, bit):
+            # grouping() 비트: 연도 4, 발화요인소분류 2, 차량상태 1 (묶지 않은 컬럼이 1)
+            rows = table[table["집합"] == 7 - bit].set_index(col)
+            return rows[rows.index.notna()]
+
+        def histogram(col, bit):
+            # BitmapIndex.histogram 과 같은 형태: 0건 제외, 내림차순 (동률은 값 순)
+            counts = grouped(col, bit)["필터 후"].astype("int64")
+            counts = counts[counts > 0].sort_index().sort_values(ascending=False, kind="stable")
+            counts.index = counts.index.astype(object)
+            counts.index.name = col
+            counts.name = "count"
+            return counts
+
+        by_year = grouped("연도", 4).sort_index()
+        return analysis.with_filter_ratio({
+            "filtered_count": int(table.loc[table["집합"] == 3, "필터 후"].sum()),
+            "total_count": int(table.loc[table["집합"] == 3, "필터 전"].sum()),
+            "subcause_counts": histogram("발화요인소분류", 2).sort_values(ascending=True),
+            "status_counts": histogram("차량상태", 1),
+            "compare_df": pd.DataFrame({
+                "연도": by_year.index.astype("int64"),
+                "필터 전": by_year["필터 전"].to_numpy(dtype="int64"),
+                "필터 후": by_year["필터 후"].to_numpy(dtype="int64"),
+            }),
+        })
+
+    def schema(self):
+        # 질의 패널에 보여 줄 표별 컬럼 목록
+        return {table: self.execute(f"DESCRIBE {table}")[["column_name", "column_type"]]
+                for table in self.tables}
+
+    def query(self, sql, max_rows=SQL_MAX_ROWS):
+        # 분석가용 임의 질의. SELECT(WITH ... SELECT 포함) 한 문장만 받고, 결과는 max_rows 행까지.
+        # (결과, 잘렸는지). 문법/권한/실행 오류는 ValueError
+        import duckdb
+
+        try:
+            statements = duckdb.extract_statements(sql)
+            if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+                raise ValueError("SELECT 문 하나만 실행할 수 있습니다.")
+            self.refresh()
+            cursor = self.con.cursor().execute(statements[0].query)
+            columns = [d[0] for d in cursor.description]
+            rows = cursor.fetchmany(max_rows + 1)
+        except duckdb.Error as e:
+            raise ValueError(str(e)) from e
+        return pd.DataFrame(rows[:max_rows], columns=columns), len(rows) > max_rows
+
+
+BACKENDS = {"pandas": PandasBackend, "duckdb": DuckDBBackend}
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name=None, data_dir="."):
+    # 프로세스당 (백엔드, 데이터 폴더) 별로 하나. duckdb 가 없으면 pandas
+    name = name or BACKEND
+    with _backends_lock:
+        key = (name, os.path.abspath(data_dir))
+        if key not in _backends:
+            try:
+                _backends[key] = BACKENDS[name](data_dir)
+            except ImportError:
+                _backends[key] = PandasBackend(data_dir)
+        return _backends[key]
+
+
+# ==============================
+# 두 백엔드 결과 비교
+# ==============================
+def parity_selections(years, subcauses, statuses):
+    # 사이드바 선택 조합: 기본, 빈 선택, 연도/발화요인/차량상태 하나씩, 여러 조건을 함께
+    yield years, [], []
+    yield [], [], []
+    for year in years:
+        yield [year], [], []
+    for subcause in subcauses:
+        yield years, [subcause], []
+    for status in statuses:
+        yield years, [], [status]
+    yield years[-2:], subcauses[:3], statuses[:2]
+    yield years, ["없는 값"], []
+
+
+def same_breakdown(a, b):
+    # 동률 값의 표시 순서는 백엔드마다 다를 수 있어 값별 건수로 비교한다.
+    for key, value in a.items():
+        other = b[key]
+        if isinstance(value, pd.Series):
+            same = (value.sort_index().to_dict() == other.sort_index().to_dict()
+                    and value.index.name == other.index.name and value.name == other.name)
+        elif isinstance(value, pd.DataFrame):
+            same = list(value.columns) == list(other.columns) and value.shape == other.shape \
+                and (value.to_numpy() == other.to_numpy()).all()
+        else:
+            same = value == other
+        if not same:
+            return False
+    return True
+
+
+def parity_cases(years, subcauses, statuses):
+    # (비교 이름, 사이드바 선택). 선택이 None 이면 fire_counts 비교
+    yield "fire_counts", None
+    for selection in parity_selections(years, subcauses, statuses):
+        yield "filtered_breakdown " + " / ".join(",".join(map(str, values)) or "-" for values in selection), selection
+
+
+def same_result(reference, candidate, selection):
+    if selection is not None:
+        return same_breakdown(reference.filtered_breakdown(*selection), candidate.filtered_breakdown(*selection))
+    try:
+        pd.testing.assert_frame_equal(reference.fire_counts().reset_index(drop=True), candidate.fire_counts(),
+                                      check_dtype=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def check(data_dir="."):
+    # {비교 이름: 일치 여부}
+    reference, candidate = PandasBackend(data_dir), DuckDBBackend(data_dir)
+    df_ev = data_loader.load_csv(os.path.join(data_dir, data_loader.fire_EV), filter_index.FILTER_COLUMNS)
+    years = sorted(int(y) for y in df_ev["연도"].dropna().unique())
+    subcauses = df_ev["발화요인소분류"].dropna().unique().tolist()
+    statuses = df_ev["차량상태"].dropna().unique().tolist()
+    return {label: same_result(reference, candidate, selection)
+            for label, selection in parity_cases(years, subcauses, statuses)}
+
+
+def fire_counts(backend):
+    # 대시보드와 API 가 쓰는 (연도, 차종, 전기차) 화재건수. pandas 는 추가분 적재 저장소(.ingest)의 누적 큐브,
+    # duckdb 는 원본(Parquet 사이드카)을 바로 집계한다.
+    if backend.name == "duckdb":
+        return backend.fire_counts()
+    return ingest.load_store().counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="화재 데이터에 DuckDB SQL 질의를 실행한다.")
+    parser.add_argument("sql", nargs="?", help="없으면 표와 컬럼 목록을 출력")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--max-rows", type=int, default=SQL_MAX_ROWS)
+    parser.add_argument("--check", action="store_true", help="pandas 와 duckdb 백엔드 결과 비교")
+    args = parser.parse_args(argv)
+
+    backend = get_backend("duckdb", args.data_dir)
+    if backend.name != "duckdb":
+        raise SystemExit("duckdb 패키지가 필요합니다.")
+    pd.set_option("display.width", 200)
+    if args.check:
+        results = check(args.data_dir)
+        for label, same in results.items():
+            print(f"{label}: {'일치' if same else '불일치'}")
+        print(f"{sum(results.values())}/{len(results)} 일치")
+        if not all(results.values()):
+            raise SystemExit(1)
+        return
+    if args.sql is None:
+        for table, columns in backend.schema().items():
+            print(f"\n[{table}]")
+            print(columns.to_string(index=False))
+        return
+    try:
+        result, truncated = backend.query(args.sql, args.max_rows)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(result.to_string(index=False))
+    if truncated:
+        print(f"... {args.max_rows:,}행까지만 표시")
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
@@ -0,0 +1,127 @@
+import numpy as np
+from scipy import special
+
+# ===== 화재율 신뢰구간 / 화재율 비 / 추세 검정 =====
+# 전기차 화재는 연도·지역·필터별로 수십 건 이하라, 1만대당 화재를 점 추정값만으로 비교하면 오해하기 쉽다.
+# 모든 함수는 배열(연도 × 그룹 격자 전체)을 한 번에 받아 NumPy/SciPy 벡터 연산으로 계산한다.
+# 분포 함수는 scipy.stats 대신 같은 계산을 하는 scipy.special 의 함수를 직접 쓴다 (import 가 훨씬 가볍다).
+#   gamma.ppf -> gammaincinv, beta.ppf -> betaincinv, binom.cdf/sf -> bdtr/bdtrc, norm.sf/ppf -> ndtr/ndtri
+# 결측(NaN) 건수나 0 이하 노출(등록대수)은 결과도 NaN 이다.
+#   poisson_ci     : 건수의 정확(Garwood) 포아송 신뢰구간
+#   rate_ci        : 노출 대비 화재율과 신뢰구간 (per 대당)
+#   rate_ratio     : 두 화재율의 비, 정확 조건부(이항) 신뢰구간과 양측 p값
+#   trend_test     : 연도별 화재율의 로그선형 추세 (연간 변화율과 신뢰구간, 점수 검정 p값)
+#   year_over_year : 인접 연도 화재율 비
+ALPHA = 0.05
+# 추세 기울기(연간 로그 변화) 상한. 이보다 크면 발산으로 보고 추정하지 않는다.
+SLOPE_LIMIT = 5.0
+
+
+def poisson_ci(counts, alpha=ALPHA):
+    k = np.asarray(counts, dtype=float)
+    missing = np.isnan(k)
+    lower = np.where(k > 0, special.gammaincinv(np.where(missing, 1.0, np.maximum(k, 1.0)), alpha / 2), 0.0)
+    upper = special.gammaincinv(np.where(missing, 1.0, k + 1), 1 - alpha / 2)
+    return np.where(missing, np.nan, lower), np.where(missing, np.nan, upper)
+
+
+def rate_ci(counts, exposure, per=10000, alpha=ALPHA):
+    # (화재율, 하한, 상한). 예: rate_ci(EV 화재건수, 전기차등록대수) -> 1만대당
+    k = np.asarray(counts, dtype=float)
+    n = np.asarray(exposure, dtype=float)
+    n = np.where(n > 0, n, np.nan)
+    lower, upper = poisson_ci(k, alpha)
+    return k / n * per, lower / n * per, upper / n * per
+
+
+def rate_ratio(counts1, exposure1, counts2, exposure2, alpha=ALPHA):
+    # (화재율1 / 화재율2) 와 신뢰구간, H0: 비 = 1 의 양측 p값.
+    # 두 건수의 합이 주어지면 counts1 ~ 이항(합, n1·RR / (n1·RR + n2)) 이므로
+    # 이항 비율의 Clopper-Pearson 구간을 화재율 비로 바꾼다.
+    k1, n1, k2, n2 = (np.asarray(v, dtype=float) for v in (counts1, exposure1, counts2, exposure2))
+    n1 = np.where(n1 > 0, n1, np.nan)
+    n2 = np.where(n2 > 0, n2, np.nan)
+    total = k1 + k2
+    valid = total > 0
+    a = np.where(valid, k1, 1.0)
+    b = np.where(valid, k2, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_low = np.where(a > 0, special.betaincinv(np.maximum(a, 1e-12), b + 1, alpha / 2), 0.0)
+        p_high = np.where(b > 0, special.betaincinv(a + 1, np.maximum(b, 1e-12), 1 - alpha / 2), 1.0)
+        scale = n2 / n1
+        ratio = (k1 / n1) / (k2 / n2)
+        lower = p_low / (1 - p_low) * scale
+        upper = np.where(p_high < 1, p_high / (1 - p_high), np.inf) * scale
+
+        p0 = n1 / (n1 + n2)
+        trials = np.where(valid, total, 0).astype(np.int64)
+        successes = np.where(valid, k1, 0)
+        tail = np.minimum(special.bdtr(successes, trials, p0), special.bdtrc(successes - 1, trials, p0))
+        pvalue = np.minimum(1.0, 2 * tail)
+    return tuple(np.where(valid, values, np.nan) for values in (ratio, lower, upper, pvalue))
+
+
+def trend_test(counts, exposure, years, alpha=ALPHA, iterations=30):
+    # counts/exposure: (연도,) 또는 (연도, 그룹 ...) 배열. 그룹마다 log(화재율) = a + b·연도 포아송 회귀.
+    # annual_change = e^b - 1 (연간 변화율), p 는 추세 없음(b=0)에 대한 점수 검정 (건수 0 인 해가 있어도 안정적).
+    k = np.asarray(counts, dtype=float)
+    n = np.broadcast_to(np.asarray(exposure, dtype=float), k.shape)
+    x = np.asarray(years, dtype=float)
+    x = (x - x.mean()).reshape((-1,) + (1,) * (k.ndim - 1))
+    use = ~np.isnan(k) & (n > 0)
+    k = np.where(use, k, 0.0)
+    n = np.where(use, n, 0.0)
+    total = k.sum(axis=0)
+
+    def weighted_moments(mu):
+        w = mu / mu.sum(axis=0)
+        mean_x = (w * x).sum(axis=0)
+        return mean_x, (w * x * x).sum(axis=0) - mean_x ** 2
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # 점수 검정: 추세가 없으면 연도별 기대 건수는 노출에 비례한다.
+        mean_x, var_x = weighted_moments(n)
+        z = ((x * k).sum(axis=0) - total * mean_x) / np.sqrt(total * var_x)
+        pvalue = 2 * special.ndtr(-np.abs(z))
+
+        # 기울기: a 를 소거한 프로파일 우도의 뉴턴 반복
+        slope = np.zeros_like(total)
+        for _ in range(iterations):
+            mean_x, var_x = weighted_moments(n * np.exp(slope * x))
+            step = ((x * k).sum(axis=0) - total * mean_x) / (total * var_x)
+            slope = np.clip(slope + np.nan_to_num(step), -SLOPE_LIMIT, SLOPE_LIMIT)
+        margin = special.ndtri(1 - alpha / 2) / np.sqrt(total * var_x)
+
+    # 건수가 없거나, 모든 건수가 한 해에 몰려 기울기가 발산하면 추정하지 않는다.
+    undefined = (total <= 0) | ~np.isfinite(z)
+    diverged = undefined | (np.abs(slope) >= SLOPE_LIMIT)
+    return {
+        "annual_change": np.where(diverged, np.nan, np.expm1(slope)),
+        "lower": np.where(diverged, np.nan, np.expm1(slope - margin)),
+        "upper": np.where(diverged, np.nan, np.expm1(slope + margin)),
+        "z": np.where(undefined, np.nan, z),
+        "p": np.where(undefined, np.nan, pvalue),
+    }
+
+
+def year_over_year(counts, exposure, alpha=ALPHA):
+    # 연도 축(0번) 인접 연도 화재율 비: t 년 / t-1 년. 결과 길이는 연도 수 - 1
+    k = np.asarray(counts, dtype=float)
+    n = np.broadcast_to(np.asarray(exposure, dtype=float), k.shape)
+    return rate_ratio(k[1:], n[1:], k[:-1], n[:-1], alpha)
+
+
+# ===== 표시용 문자열 =====
+def format_p(p):
+    if p is None or np.isnan(p):
+        return "p=-"
+    return "p<0.001" if p < 0.001 else f"p={p:.3f}"
+
+
+def format_interval(value, lower, upper, digits=2, unit="", signed=False):
+    # 1.23배 (95% CI 0.80–1.90배), signed=True 면 +14.3% (95% CI -8.5–+42.8%)
+    if value is None or np.isnan(value):
+        return "-"
+    spec = f"{'+' if signed else ''}.{digits}f"
+    upper_text = "∞" if np.isinf(upper) else format(upper, spec)
+    return f"{value:{spec}}{unit} (95% CI {lower:{spec}}–{upper_text}{unit})"
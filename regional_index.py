@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+# ===== 지역 계층 집계 인덱스 =====
+# 전국 → 시도 → 시군구 노드 × 연도 × 차량상태 × 발화요인소분류 건수를 한 번에 밀집 배열로 만든다.
+# 각 차원에는 "전체" 칸(마지막 위치)을 두고, 시도/전국 노드는 하위 노드 합으로 미리 채워 둔다.
+# 따라서 지역 하나 + 값 하나씩의 조합은 배열 원소 하나를 읽는 O(1) 조회이고,
+# 여러 값을 고르면 고른 칸들만 더한다 (원시 행은 다시 보지 않는다).
+REGION_COLUMNS = ["시도", "시군구"]
+DIMENSIONS = ["연도", "차량상태", "발화요인소분류"]
+NATION = "전국"
+UNKNOWN = "미상"
+
+
+class RegionalIndex:
+    def __init__(self, df):
+        sido = df["시도"].astype(object).fillna(UNKNOWN)
+        sigungu = df["시군구"].astype(object).fillna(UNKNOWN)
+        leaf_codes, leaves = pd.factorize(pd.MultiIndex.from_arrays([sido, sigungu]), sort=True)
+        sido_names = sorted(set(leaves.get_level_values(0)))
+
+        # 노드 순서: 전국(0), 시도들, 시군구들
+        self.nodes = pd.DataFrame(
+            [(NATION, None, "전국")] + [(s, None, "시도") for s in sido_names]
+            + [(s, g, "시군구") for s, g in leaves],
+            columns=["시도", "시군구", "단계"],
+        )
+        self.node_ids = {(row.시도, row.시군구): i for i, row in enumerate(self.nodes.itertuples())}
+        first_leaf = 1 + len(sido_names)
+
+        # 차원별 값 목록과 위치. 결측도 하나의 값으로 센다.
+        self.values = {}
+        self.positions = {}
+        codes = []
+        for col in DIMENSIONS:
+            dim_codes, uniques = pd.factorize(df[col], sort=True, use_na_sentinel=False)
+            self.values[col] = list(uniques)
+            self.positions[col] = {value: i for i, value in enumerate(uniques)}
+            codes.append(dim_codes)
+
+        # 시군구 × 차원 건수 (각 차원 마지막 칸 = 전체)
+        shape = (len(leaves), *(len(self.values[col]) + 1 for col in DIMENSIONS))
+        flat = np.ravel_multi_index((leaf_codes, *codes), shape)
+        leaf = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+        for axis in range(1, leaf.ndim):
+            body = [slice(None)] * leaf.ndim
+            body[axis] = slice(0, -1)
+            total = [slice(None)] * leaf.ndim
+            total[axis] = -1
+            leaf[tuple(total)] = leaf[tuple(body)].sum(axis=axis)
+
+        # 시도/전국 노드는 하위 시군구 합
+        self.cube = np.zeros((len(self.nodes), *shape[1:]), dtype=np.int64)
+        self.cube[first_leaf:] = leaf
+        leaf_parent = np.array([self.node_ids[(s, None)] for s in leaves.get_level_values(0)])
+        np.add.at(self.cube, leaf_parent, leaf)
+        self.cube[0] = self.cube[1:first_leaf].sum(axis=0)
+        # 세션 간 공유되므로 읽기 전용으로 고정한다.
+        self.cube.flags.writeable = False
+
+    @property
+    def nbytes(self):
+        return self.cube.nbytes
+
+    def node(self, sido=None, sigungu=None):
+        if sido is None or sido == NATION:
+            return 0
+        return self.node_ids[(sido, sigungu)]
+
+    def children(self, sido=None):
+        # 전국 -> 시도 노드들, 시도 -> 그 시도의 시군구 노드들
+        if sido is None or sido == NATION:
+            mask = self.nodes["단계"] == "시도"
+        else:
+            mask = (self.nodes["단계"] == "시군구") & (self.nodes["시도"] == sido)
+        return np.flatnonzero(mask.to_numpy())
+
+    def axis_positions(self, col, values):
+        # None -> 전체 칸 하나, 목록 -> 각 값의 칸 (없는 값은 무시, 빈 목록이면 0건)
+        if values is None:
+            return [len(self.values[col])]
+        if np.isscalar(values):
+            values = [values]
+        return [self.positions[col][v] for v in values if v in self.positions[col]]
+
+    def selection(self, filters):
+        return [self.axis_positions(col, filters.get(col)) for col in DIMENSIONS]
+
+    def count(self, sido=None, sigungu=None, **filters):
+        # count("경기도", "화성시", 연도=2023, 차량상태=["주차", "충전중"])
+        idx = self.selection(filters)
+        if not all(idx):
+            return 0
+        return int(self.cube[np.ix_([self.node(sido, sigungu)], *idx)].sum())
+
+    def breakdown(self, sido=None, **filters):
+        # 한 단계 아래 지역별 건수 (전국이면 시도별, 시도면 시군구별)
+        nodes = self.children(sido)
+        idx = self.selection(filters)
+        counts = (self.cube[np.ix_(nodes, *idx)].sum(axis=(1, 2, 3)) if all(idx)
+                  else np.zeros(len(nodes), dtype=np.int64))
+        table = self.nodes.iloc[nodes][REGION_COLUMNS].reset_index(drop=True)
+        table["지역"] = table["시군구"].fillna(table["시도"])
+        table["화재건수"] = counts
+        return table
+
+    def by_year(self, sido=None, sigungu=None, **filters):
+        if filters.get("연도") is None:
+            filters = {**filters, "연도": self.values["연도"]}
+        idx = self.selection(filters)
+        years = [self.values["연도"][i] for i in idx[0]]
+        counts = (self.cube[np.ix_([self.node(sido, sigungu)], *idx)].sum(axis=(0, 2, 3)) if all(idx)
+                  else np.zeros(len(years), dtype=np.int64))
+        return pd.Series(counts, index=pd.Index(years, name="연도"), name="화재건수")
+
+
+def load_index(path=data_loader.fire_EV):
+    # 전기차 화재 데이터가 바뀌지 않았으면 프로세스 내에서 인덱스를 재사용한다.
+    signature = data_loader.file_signature(path)
+    return data_loader.memoized(
+        (signature[0], "regional_index"), signature,
+        lambda: RegionalIndex(data_loader.load_csv(path, REGION_COLUMNS + DIMENSIONS)),
+    )
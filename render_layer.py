@@ -0,0 +1,175 @@
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# ===== 집계 결과 → 브라우저 전송 전 축약 =====
+# 세밀한 데이터(일별, 시군구별)를 그대로 그리면 Figure JSON 이 수 MB 가 되어 브라우저가 멈춘다.
+#   범주형 : 상위 N 개 + "기타"
+#   시계열 : 기간 단위 합계(aggregate_series) 또는 LTTB 로 모양을 유지하며 점 수 축소
+#   큰 trace : Scatter → Scattergl (WebGL)
+#   Figure : 크기 예산(KB)을 넘으면 텍스트 라벨 제거, LTTB 축소 순서로 줄인다.
+TOP_N = int(os.environ.get("EV_CHART_TOP_N", 20))
+DONUT_TOP_N = int(os.environ.get("EV_CHART_DONUT_TOP_N", 8))
+WEBGL_ROWS = int(os.environ.get("EV_CHART_WEBGL_ROWS", 5000))
+BUDGET_KB = float(os.environ.get("EV_CHART_BUDGET_KB", 512))
+OTHER_LABEL = "기타"
+# Scatter → Scattergl 로 옮길 수 있는 속성
+SCATTERGL_PROPS = frozenset(go.Scattergl()._valid_props)
+
+# 촘촘한 것부터 성긴 순서. 점 수가 max_points 이하가 되는 첫 단위를 쓴다.
+RESAMPLE_RULES = ["D", "W", "MS", "QS", "YS"]
+
+
+def top_n(counts, n=TOP_N, other=OTHER_LABEL):
+    # 값이 큰 n 개만 남기고 나머지는 "기타" 하나로 합친다. 원래 정렬 방향(오름/내림)은 유지하고
+    # "기타" 는 작은 쪽 끝에 둔다.
+    if len(counts) <= n + 1:
+        return counts
+    ascending = len(counts) > 1 and counts.iloc[0] <= counts.iloc[-1]
+    kept = counts.nlargest(n)
+    rest = pd.Series({other: counts.drop(kept.index).sum()})
+    kept = kept.sort_values(ascending=ascending)
+    return pd.concat([rest, kept] if ascending else [kept, rest]).rename(counts.name)
+
+
+def aggregate_series(series, max_points, how="sum"):
+    # 날짜 인덱스 시계열을 점 수가 max_points 이하가 되는 가장 촘촘한 기간 단위로 묶는다.
+    if len(series) <= max_points:
+        return series
+    for rule in RESAMPLE_RULES:
+        resampled = series.resample(rule).agg(how)
+        if len(resampled) <= max_points:
+            return resampled
+    return resampled
+
+
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: 각 구간에서 앞뒤 점과 만드는 삼각형 넓이가 가장 큰 점을 고른다.
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    every = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype="int64")
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        indices[i + 1] = a
+    return indices
+
+
+def lttb_series(series, n_out):
+    return series.iloc[lttb_indices(numeric_axis(series.index), series.to_numpy(), n_out)]
+
+
+def numeric_axis(values):
+    # LTTB 의 x 좌표. 숫자/날짜는 그대로, 범주형 문자열은 위치(0, 1, 2, ...)로 쓴다.
+    values = pd.Index(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.asi8.astype("float64")
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype="float64")
+    return np.arange(len(values), dtype="float64")
+
+
+def payload_bytes(fig):
+    return len(fig.to_json().encode("utf-8"))
+
+
+def trace_points(trace):
+    values = getattr(trace, "y", None)
+    if values is None:
+        values = getattr(trace, "values", None)
+    return 0 if values is None else len(values)
+
+
+def to_webgl(fig, threshold=WEBGL_ROWS):
+    # 점이 많은 Scatter trace 를 WebGL(Scattergl) 로 바꾼다. 바꾼 trace 수를 돌려준다.
+    # Scattergl 에 없는 속성(stackgroup, cliponaxis ...)을 쓰는 trace 는 모양이 달라지므로 그대로 둔다.
+    converted = 0
+    traces = []
+    for trace in fig.data:
+        props = trace.to_plotly_json() if trace.type == "scatter" else {}
+        if props and trace_points(trace) > threshold and set(props) - {"type"} <= SCATTERGL_PROPS:
+            traces.append(go.Scattergl(props))
+            converted += 1
+        else:
+            traces.append(trace)
+    if converted:
+        fig.data = []
+        fig.add_traces(traces)
+    return converted
+
+
+def drop_text(fig, threshold):
+    # 점마다 붙는 텍스트 라벨은 값을 한 번 더 보내므로, 큰 trace 에서는 빼고 hover 로만 보여준다.
+    dropped = 0
+    for trace in fig.data:
+        if trace_points(trace) > threshold and getattr(trace, "text", None) is not None:
+            trace.text = None
+            dropped += 1
+    return dropped
+
+
+def decimate(fig, n_out):
+    # x/y 가 있는 선 trace 를 LTTB 로 n_out 점까지 줄인다. 막대/파이는 범주 의미가 있어 건드리지 않는다.
+    reduced = 0
+    for trace in fig.data:
+        if trace.type not in ("scatter", "scattergl") or trace.x is None or trace.y is None:
+            continue
+        if len(trace.y) <= n_out:
+            continue
+        idx = lttb_indices(numeric_axis(trace.x), pd.to_numeric(pd.Series(trace.y), errors="coerce"), n_out)
+        trace.x = np.asarray(trace.x)[idx]
+        trace.y = np.asarray(trace.y)[idx]
+        if trace.text is not None and not isinstance(trace.text, str):
+            trace.text = np.asarray(trace.text)[idx]
+        # 신뢰구간 오차 막대도 같은 점만 남긴다.
+        for key in ("array", "arrayminus"):
+            if trace.error_y[key] is not None:
+                trace.error_y[key] = np.asarray(trace.error_y[key])[idx]
+        reduced += 1
+    return reduced
+
+
+def fit(fig, budget_kb=BUDGET_KB, webgl_threshold=WEBGL_ROWS):
+    # Figure 를 예산 안으로 줄인다. 바꿀 것이 있으면 복사본을 고치므로 캐시된 Figure 를 넘겨도 된다.
+    # 반환: (Figure, {"before_bytes", "after_bytes", "saved_bytes", "budget_bytes", "steps", "over_budget"})
+    budget = int(budget_kb * 1024)
+    before = size = payload_bytes(fig)
+    steps = []
+    if size > budget or any(trace_points(t) > webgl_threshold for t in fig.data):
+        fig = go.Figure(fig)
+        if to_webgl(fig, webgl_threshold):
+            steps.append("webgl")
+        if size > budget and drop_text(fig, webgl_threshold // 10):
+            steps.append("drop_text")
+            size = payload_bytes(fig)
+        n_out = max((trace_points(t) for t in fig.data), default=0)
+        while size > budget and n_out > 100:
+            # 크기는 점 수에 거의 비례하므로 예산 비율만큼 한 번에 줄이고, 모자라면 반복한다.
+            n_out = max(min(int(n_out * budget / size * 0.9), n_out // 2), 100)
+            if not decimate(fig, n_out):
+                break
+            steps.append(f"lttb:{n_out}")
+            size = payload_bytes(fig)
+        if steps and steps[-1] == "webgl":
+            size = payload_bytes(fig)
+    return fig, {
+        "before_bytes": before,
+        "after_bytes": size,
+        "saved_bytes": before - size,
+        "budget_bytes": budget,
+        "steps": steps,
+        "over_budget": size > budget,
+    }
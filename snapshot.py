@@ -0,0 +1,446 @@
+import argparse
+import datetime
+import html
+import json
+import os
+import shutil
+import time
+from urllib.parse import quote
+
+import plotly.io as pio
+import plotly.offline
+
+import analysis
+import content
+import data_loader
+import filter_index
+import ingest
+import parquet_store
+import regional_index
+import render_layer
+import time_index
+import validation
+import vehicle_dim
+
+# ===== 정적 스냅샷 내보내기 =====
+# 대부분의 방문자는 사이드바를 건드리지 않는데도, 방문마다 읽기/집계/Figure 생성을 다시 한다.
+# 모든 탭의 기본 상태 KPI 카드와 그래프, 자주 쓰는 필터 조합(PRESETS)을 미리 만들어
+# HTML + Figure JSON 묶음으로 저장해 두면, 읽기 전용 트래픽은 웹 서버가 파일만 내보내면 된다.
+#   snapshot/index.html                     기본 상태 (모든 탭)
+#   snapshot/presets/<이름>.html             필터 조합별 Tab2 + 지역별 + 시기별(전기차)
+#   snapshot/regions/<시도>.html             시도별 드릴다운 (기본 필터)
+#   snapshot/figures/<페이지>/<차트>.json     Figure JSON (render_layer 로 축약한 것)
+#   snapshot/plotly.min.js, manifest.json
+# 입력 파일의 크기/수정시각/해시, 파일별 검사 규칙 버전과 표시 옵션을 manifest.json 에 기록해 두고,
+# 바뀐 것이 없으면 다시 만들지 않는다.
+# 입력이 바뀔 수 있는 작업(ingest 등) 뒤에 실행한다.
+# 사용법: python snapshot.py [--data-dir .] [--out snapshot] [--force]
+SNAPSHOT_DIR = os.environ.get("EV_SNAPSHOT_DIR", "snapshot")
+
+# 이름: (표시 이름, 조건). recent_years=N 은 데이터의 마지막 N 개 연도, status/subcause 는 사이드바 선택과 같다.
+PRESETS = {
+    "all": ("전체 (기본)", {}),
+    "recent3": ("최근 3년", {"recent_years": 3}),
+    "latest": ("최근 1년", {"recent_years": 1}),
+    "charging": ("충전중", {"status": ["충전중"]}),
+    "parked": ("주차", {"status": ["주차"]}),
+    "driving": ("운행중", {"status": ["운행중"]}),
+}
+
+TAB_TITLES = ["📊 주요 분석", "🔥 전기차 화재 필터링 분석", "📍 추가 참고 분석 데이터", "🗺️ 지역별 화재 분석",
+              "⏰ 시기별 화재 분석"]
+
+PAGE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{root}plotly.min.js"></script>
+{kpi_style}
+<style>
+body {{ font-family: sans-serif; margin: 24px 48px; }}
+nav a {{ margin-right: 12px; }}
+.kpi-row {{ display: flex; }}
+.kpi-row > div {{ flex: 1; }}
+.meta {{ color: gray; font-size: 13px; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+<p class="meta">{meta}</p>
+{body}
+</body>
+</html>
+"""
+
+
+# ==============================
+# 입력 변경 확인
+# ==============================
+def input_files(data_dir):
+    return [os.path.join(data_dir, name) for name in [*data_loader.DATA_FILES, data_loader.region_registrations]]
+
+
+def input_signature(data_dir):
+    # 파일 이름 -> {size, mtime_ns, sha256}. 없는 선택 파일은 None
+    inputs = {}
+    for path in input_files(data_dir):
+        if not os.path.exists(path):
+            inputs[os.path.basename(path)] = None
+            continue
+        stat = os.stat(path)
+        inputs[os.path.basename(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return inputs
+
+
+def rule_versions(data_dir):
+    # 파일별 품질 검사 규칙(validation.rules_version). 규칙이 바뀌면 격리되는 행이 달라지므로 입력이 같아도 다시 만든다.
+    return {os.path.basename(path): validation.rules_version(data_loader.schema_for(path))
+            for path in input_files(data_dir)}
+
+
+def options():
+    # 결과 모양을 바꾸는 설정. 바뀌면 입력이 같아도 다시 만든다.
+    return {"top_n": render_layer.TOP_N, "donut_top_n": render_layer.DONUT_TOP_N,
+            "budget_kb": render_layer.BUDGET_KB, "presets": PRESETS}
+
+
+def read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(data_dir, out_dir):
+    # 크기/수정시각이 같으면 해시 계산 없이 통과, 다르면 해시로 실제 변경 여부 확인 (parquet_store 와 같은 규칙)
+    manifest = read_manifest(out_dir)
+    if manifest is None or manifest.get("options") != json.loads(json.dumps(options())):
+        return False
+    if manifest.get("rules") != rule_versions(data_dir):
+        return False
+    current = input_signature(data_dir)
+    if set(current) != set(manifest["inputs"]):
+        return False
+    for name, stat in current.items():
+        recorded = manifest["inputs"][name]
+        if stat is None or recorded is None:
+            if stat != recorded:
+                return False
+            continue
+        if stat["size"] == recorded["size"] and stat["mtime_ns"] == recorded["mtime_ns"]:
+            continue
+        if stat["size"] != recorded["size"]:
+            return False
+        if parquet_store.source_hash(os.path.join(data_dir, name)) != recorded["sha256"]:
+            return False
+    return True
+
+
+def hashed_signature(data_dir):
+    inputs = input_signature(data_dir)
+    for name, stat in inputs.items():
+        if stat is not None:
+            stat["sha256"] = parquet_store.source_hash(os.path.join(data_dir, name))
+    return inputs
+
+
+# ==============================
+# 페이지 조립
+# ==============================
+class Page:
+    def __init__(self, name, title):
+        # name: 묶음 안의 경로 (확장자 제외). 예: "index", "presets/recent3", "regions/경기도"
+        self.name = name
+        self.title = title
+        self.parts = []
+        self.figures = {}
+
+    @property
+    def root(self):
+        return "../" * self.name.count("/")
+
+    def heading(self, text, level=3):
+        self.parts.append(f"<h{level}>{html.escape(text)}</h{level}>")
+
+    def note(self, text):
+        self.parts.append(f'<p class="meta">{html.escape(text)}</p>')
+
+    def kpis(self, cards):
+        self.parts.append('<div class="kpi-row">'
+                          + "".join(content.kpi_card_html(i, html.escape(title), html.escape(value))
+                                    for i, (title, value) in enumerate(cards, start=1))
+                          + "</div>")
+
+    def chart(self, name, fig, *args):
+        # project.py 의 plotly_chart 와 같이 생성 함수(+인자)도 받고, 같은 예산으로 축약한다.
+        if callable(fig):
+            fig = fig(*args)
+        fig, _ = render_layer.fit(fig, render_layer.BUDGET_KB)
+        self.figures[name] = fig
+        div_id = f"{self.name}/{name}".replace("/", "-")
+        self.parts.append(pio.to_html(fig, include_plotlyjs=False, full_html=False, div_id=div_id,
+                                      config={"responsive": True}))
+
+    def columns(self, charts):
+        # 한 줄에 나란히 배치 (Tab3 최초발화점/상황 등). charts: [(이름, Figure 또는 생성 함수, 인자...), ...]
+        start = len(self.parts)
+        for name, fig, *args in charts:
+            self.chart(name, fig, *args)
+        cells = "".join(f'<div style="flex: 1">{part}</div>' for part in self.parts[start:])
+        self.parts[start:] = [f'<div class="kpi-row">{cells}</div>']
+
+    def html(self, nav, meta):
+        return PAGE.format(title=html.escape(self.title), root=self.root, kpi_style=content.KPI_STYLE,
+                           nav=nav, meta=html.escape(meta), body="\n".join(self.parts))
+
+
+def tab1_section(page, tab1):
+    page.heading("🔥 전기차 화재 분석")
+    page.kpis(tab1["fire_kpis"])
+    page.chart("tab1_fire", tab1["fig_fire"])
+    page.heading("🚗 자동차 등록 대수 분석")
+    page.kpis(tab1["car_kpis"])
+    page.chart("tab1_car", tab1["fig_car"])
+    page.heading("🔥 1만대당 화재 건수 비교")
+    page.chart("tab1_ev", tab1["fig_ev"])
+    page.chart("tab1_ice", tab1["fig_ice"])
+    for note in tab1["rate_notes"]:
+        page.note(note)
+
+
+def tab2_section(page, result):
+    page.heading("🔥 전기차 화재 필터링 분석")
+    page.kpis(content.tab2_kpis(result))
+    charts = content.tab2_charts(result)
+    page.heading("🔥 화재별 발화요인")
+    if charts["subcause"] is not None:
+        page.chart("tab2_subcause", *charts["subcause"])
+    else:
+        page.note("선택된 필터에 해당하는 데이터가 없습니다.")
+    page.heading("🚗 차량상태별 비율")
+    page.chart("tab2_status", *charts["status"])
+    page.heading("📊 연도별 화재 건수 및 필터 후 비율")
+    page.chart("tab2_filter_compare", *charts["filter_compare"])
+
+
+def tab3_section(page, tab3):
+    page.heading("🔥 전기차 제조사별 화재")
+    page.chart("tab3_manufacturer", tab3["fig_manufacturer"])
+    page.heading("🚗 제조사별 화재 비교")
+    page.chart("tab3_manufacturer_compare", tab3["fig_manufacturer_compare"])
+    for note in tab3["rate_notes"]:
+        page.note(note)
+    page.heading("🚗 최초 발화점 비율")
+    page.columns([("tab3_origin", tab3["fig_origin"]), ("tab3_situation", tab3["fig_situation"])])
+    page.heading("🏭 제조사별 최초발화점 · 상황")
+    page.columns([("tab3_maker_origin", tab3["fig_maker_origin"]),
+                  ("tab3_maker_situation", tab3["fig_maker_situation"])])
+    for note in tab3["maker_notes"]:
+        page.note(note)
+    page.heading("🚗 전기차 안정성 분석")
+    page.kpis(tab3["safety_kpis"])
+    page.heading("🌎 해외 전기차 화재 비교")
+    page.chart("tab3_foreign", tab3["fig_foreign"])
+
+
+def region_section(page, summary, sido, has_registrations):
+    level = content.region_level(sido)
+    charts = content.region_charts(summary, sido)
+    page.heading(f"🗺️ {summary['region']} 전기차 화재")
+    page.kpis(content.region_kpis(summary))
+    page.heading(f"📍 {level}별 화재 건수" + (" 및 1만대당 화재" if has_registrations else ""))
+    if len(summary["regions"]) > render_layer.TOP_N:
+        page.note(f"화재 건수 상위 {render_layer.TOP_N}개 {level}만 표시합니다 (전체 {len(summary['regions'])}개).")
+    page.chart("regions_breakdown", *charts["breakdown"])
+    page.heading("📈 연도별 추이")
+    page.chart("regions_trend", *charts["trend"])
+    for note in content.region_notes(summary):
+        page.note(note)
+
+
+def temporal_section(page, summary, label):
+    name = time_index.SOURCES[label]["key"]
+    page.heading(f"⏰ {label} 화재 시기별 분석")
+    page.kpis(content.temporal_kpis(summary))
+    charts = content.temporal_charts(summary, label)
+    if charts is None:
+        page.note("선택된 기간/필터에 해당하는 데이터가 없습니다.")
+        return
+    page.chart(f"temporal_{name}_monthly", *charts["monthly"])
+    page.columns([(f"temporal_{name}_month_of_year", *charts["month_of_year"]),
+                  (f"temporal_{name}_weekday", *charts["weekday"])])
+    if charts["hour"] is not None:
+        page.chart(f"temporal_{name}_hour", *charts["hour"])
+
+
+def resolve_preset(conditions, years):
+    # 프리셋 조건 -> (연도, 발화요인, 차량상태) 사이드바 선택
+    recent = conditions.get("recent_years")
+    year_filter = list(years[-recent:]) if recent else list(years)
+    return year_filter, list(conditions.get("subcause", [])), list(conditions.get("status", []))
+
+
+def link(page, target, label):
+    return f'<a href="{page.root}{quote(target)}.html">{html.escape(label)}</a>'
+
+
+def navigation(page, sido_names):
+    presets = " ".join(link(page, f"presets/{name}", label) for name, (label, _) in PRESETS.items())
+    regions = " ".join(link(page, f"regions/{sido}", sido) for sido in sido_names)
+    return (link(page, "index", "🏠 기본 화면") + f"<br>필터 프리셋: {presets}"
+            + f"<br>지역: {regions}")
+
+
+# ==============================
+# 묶음 만들기
+# ==============================
+def build_pages(data_dir):
+    frames = analysis.load_frames(data_dir, extra_total_columns=["일시"])
+    df_ev = frames["fire_EV"]
+    df_region_reg = frames["region_registrations"]
+    has_registrations = df_region_reg is not None
+    counts = ingest.merge_counts(
+        ingest.count_fires(frames["fire_total"], is_ev=False),
+        ingest.count_fires(df_ev, is_ev=True),
+    )
+    ev_index = filter_index.BitmapIndex(df_ev[filter_index.FILTER_COLUMNS])
+    region_index = regional_index.RegionalIndex(df_ev)
+    vehicles = vehicle_dim.VehicleIndex(frames["car_maker"], frames["manufac_fire"])
+    years = sorted(df_ev["연도"].dropna().unique())
+    sido_names = region_index.nodes.loc[region_index.nodes["단계"] == "시도", "시도"].tolist()
+    time_indexes = {name: time_index.TimeIndex(frames["fire_total" if source.get("vehicle") else "fire_EV"],
+                                               source["column"], source["filters"])
+                    for name, source in time_index.SOURCES.items()}
+
+    def filtered(year_filter, subcause_filter, status_filter, sido=None):
+        return (analysis.filtered_breakdown(ev_index, year_filter, subcause_filter, status_filter),
+                analysis.region_summary(region_index, sido, year_filter, subcause_filter, status_filter,
+                                        df_region_reg))
+
+    def temporal(page, year_filter, subcause_filter, status_filter, labels):
+        # 사이드바와 같이 발화요인/차량상태 선택은 전기차 데이터에만 적용한다.
+        for label in labels:
+            filters = None
+            if label == "전기차":
+                filters = {"발화요인소분류": subcause_filter or None, "차량상태": status_filter or None}
+            summary = analysis.temporal_summary(time_indexes[label], year_filter=year_filter, filters=filters)
+            temporal_section(page, summary, label)
+
+    # 기본 화면: 모든 탭 (사이드바 기본값 = 모든 연도, 발화요인/차량상태 선택 없음)
+    index = Page("index", "전기차 화재 분석")
+    result, summary = filtered(years, [], [])
+    for title, section in zip(TAB_TITLES, [
+        lambda: tab1_section(index, content.tab1(counts, frames["car_info"])),
+        lambda: tab2_section(index, result),
+        lambda: tab3_section(index, content.tab3(vehicles, frames["foreign_fire"], frames["manufac_fire"],
+                                                 analysis.fire_summary(counts, frames["car_info"])["yearly"])),
+        lambda: region_section(index, summary, regional_index.NATION, has_registrations),
+        lambda: temporal(index, years, [], [], list(time_index.SOURCES)),
+    ]):
+        index.heading(title, level=2)
+        section()
+    pages = [index]
+
+    # 필터 프리셋: 필터에 따라 바뀌는 Tab2, 지역별(전국), 시기별(전기차)
+    for name, (label, conditions) in PRESETS.items():
+        page = Page(f"presets/{name}", f"전기차 화재 분석 - {label}")
+        year_filter, subcause_filter, status_filter = resolve_preset(conditions, years)
+        page.heading(f"필터 프리셋: {label}", level=2)
+        page.note(f"연도 {', '.join(map(str, year_filter))}"
+                  + (f" · 발화요인 {', '.join(subcause_filter)}" if subcause_filter else "")
+                  + (f" · 차량상태 {', '.join(status_filter)}" if status_filter else ""))
+        result, summary = filtered(year_filter, subcause_filter, status_filter)
+        tab2_section(page, result)
+        region_section(page, summary, regional_index.NATION, has_registrations)
+        temporal(page, year_filter, subcause_filter, status_filter, ["전기차"])
+        pages.append(page)
+
+    # 시도별 드릴다운 (기본 필터)
+    for sido in sido_names:
+        page = Page(f"regions/{sido}", f"전기차 화재 분석 - {sido}")
+        _, summary = filtered(years, [], [], sido)
+        region_section(page, summary, sido, has_registrations)
+        pages.append(page)
+    return pages, sido_names
+
+
+def write_bundle(pages, sido_names, out_dir, meta):
+    written = {}
+    with open(os.path.join(out_dir, "plotly.min.js"), "w", encoding="utf-8") as f:
+        f.write(plotly.offline.get_plotlyjs())
+    for page in pages:
+        path = os.path.join(out_dir, f"{page.name}.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page.html(navigation(page, sido_names), meta))
+        written[page.name] = []
+        for name, fig in page.figures.items():
+            fig_path = os.path.join(out_dir, "figures", page.name, f"{name}.json")
+            os.makedirs(os.path.dirname(fig_path), exist_ok=True)
+            with open(fig_path, "w", encoding="utf-8") as f:
+                f.write(fig.to_json())
+            written[page.name].append(os.path.relpath(fig_path, out_dir))
+    return written
+
+
+def bundle_bytes(out_dir):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(out_dir) for name in names)
+
+
+def build(data_dir=".", out_dir=SNAPSHOT_DIR, force=False):
+    # 입력이 바뀌었을 때만 새로 만든다. 만들었으면 manifest, 최신 상태라 건너뛰었으면 None
+    if not force and is_fresh(data_dir, out_dir):
+        return None
+    start = time.perf_counter()
+    inputs = hashed_signature(data_dir)
+    pages, sido_names = build_pages(data_dir)
+    generated_at = datetime.datetime.now().isoformat(timespec="seconds")
+
+    # 임시 폴더에 모두 쓴 뒤 교체해, 만드는 도중에도 이전 묶음이 그대로 서비스되게 한다.
+    tmp_dir = out_dir.rstrip("/") + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    written = write_bundle(pages, sido_names, tmp_dir, f"정적 스냅샷 · 생성 {generated_at}")
+    manifest = {
+        "generated_at": generated_at,
+        "seconds": round(time.perf_counter() - start, 3),
+        "inputs": inputs,
+        "rules": rule_versions(data_dir),
+        "options": options(),
+        "pages": written,
+    }
+    manifest["bytes"] = bundle_bytes(tmp_dir)
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    old_dir = out_dir.rstrip("/") + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 기본 화면과 필터 프리셋을 정적 HTML/JSON 으로 내보낸다.")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--out", default=SNAPSHOT_DIR)
+    parser.add_argument("--force", action="store_true", help="입력이 바뀌지 않았어도 다시 만든다")
+    args = parser.parse_args(argv)
+
+    manifest = build(args.data_dir, args.out, args.force)
+    if manifest is None:
+        print(f"{args.out}: 입력이 바뀌지 않아 다시 만들지 않았습니다.")
+        return
+    n_figures = sum(len(figs) for figs in manifest["pages"].values())
+    print(f"{args.out}: 페이지 {len(manifest['pages'])}개, 그래프 {n_figures}개, "
+          f"{manifest['bytes'] / 1024 / 1024:.1f} MB, {manifest['seconds']:.1f}초")
+
+
+if __name__ == "__main__":
+    data_loader.enable_copy_on_write()
+    main()
@@ -0,0 +1,264 @@
+import argparse
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+# ===== 합성 화재 데이터 생성기 =====
+# 실제 파일과 같은 컬럼/인코딩(utf-8-sig)의 데이터를 임의 규모로 만든다. 같은 seed 면 항상 같은 결과.
+# 범주 값과 비율은 배포된 전기차_화재_통계.csv / 차종별_전기차_화재.csv 의 분포를 따른다.
+# 사용법: python synthetic.py 출력폴더 [--total-rows 1000000] [--ev-rows 10000] [--maker-rows 1000]
+#                            [--start 2019-01-01] [--end 2024-12-31] [--seed 0]
+REGIONS = {
+    "서울특별시": ["강남구", "송파구", "구로구", "영등포구", "양천구", "성동구", "금천구", "강서구", "중구", "노원구"],
+    "부산광역시": ["해운대구", "부산진구", "동래구", "연제구", "기장군", "강서구", "북구", "남구"],
+    "대구광역시": ["달서구", "달성군", "북구", "수성구", "동구"],
+    "인천광역시": ["부평구", "미추홀구", "강화군", "서구", "연수구", "남동구"],
+    "광주광역시": ["광산구", "북구", "서구", "남구"],
+    "대전광역시": ["유성구", "서구", "중구", "대덕구"],
+    "울산광역시": ["남구", "울주군", "북구", "중구"],
+    "세종특별자치시": ["세종"],
+    "경기도": ["수원시영통구", "수원시권선구", "성남시분당구", "고양시덕양구", "화성시", "평택시", "파주시",
+            "김포시", "시흥시", "부천시", "안산시단원구", "용인시기흥구", "의정부시", "하남시", "광주시"],
+    "강원특별자치도": ["원주시", "춘천시", "강릉시", "평창군"],
+    "충청북도": ["충주시", "청주시흥덕구", "제천시"],
+    "충청남도": ["아산시", "천안시서북구", "서산시", "보령시", "태안군", "서천군"],
+    "전라북도": ["전주시덕진구", "익산시", "군산시", "완주군", "임실군", "무주군"],
+    "전라남도": ["여수시", "목포시", "무안군", "영암군", "장성군", "신안군"],
+    "경상북도": ["포항시남구", "구미시", "경주시", "김천시", "안동시", "영천시", "칠곡군", "의성군"],
+    "경상남도": ["창원시 성산구", "창원시 진해구", "김해시", "진주시", "거제시", "양산시"],
+    "제주특별자치도": ["제주시", "서귀포시"],
+}
+REGION_WEIGHTS = {"서울특별시": 16, "경기도": 26, "부산광역시": 7, "인천광역시": 6, "경상남도": 6, "경상북도": 5}
+
+# 발화요인대분류 -> (비율, 소분류 목록)
+CAUSES = {
+    "미상": (41, ["미상"]),
+    "전기적 요인": (35, ["접촉불량에 의한 단락", "기타(전기적요인)", "미확인단락", "과부하/과전류",
+                     "절연열화에 의한 단락", "압착,손상에 의한 단락", "반단선", "트래킹에 의한 단락"]),
+    "부주의": (26, ["담배꽁초", "용접, 절단, 연마", "불씨,불꽃,화원방치", "쓰레기 소각",
+                 "기기(전기, 기계 등) 사용.설치부주의", "가연물 근접방치"]),
+    "교통사고": (18, ["교통사고"]),
+    "기타": (6, ["기타"]),
+    "기계적 요인": (6, ["자동제어 실패", "과열, 과부하", "기타(기계적요인)"]),
+    "제품결함": (4, ["기타(제품결함)", "제조상결함", "설계상결함"]),
+    "화학적 요인": (2, ["자연발화", "화학적 폭발"]),
+    "방화": (1, ["방화"]),
+}
+EV_CATEGORIES = {
+    "차량장소": {"일반도로": 57, "주차장": 48, "고속도로": 14, "공지": 13, "기타 도로": 7},
+    "장소소분류": {"지상1층": 122, "지하1층": 12, "지하3층": 2, "지상3층": 2, "지하2층": 1},
+    "차량상태": {"운행중": 68, "주차": 38, "충전중": 27, "정차": 5, "견인중": 1},
+    "차량발화지점": {"기타차량위치": 62, "적재함": 27, "미상": 18, "엔진룸": 15, "트렁크": 6,
+                 "앞좌석": 6, "뒷좌석": 4, "바퀴": 1},
+}
+# 배포된 표본에는 없지만 실제 코드표에 있는 값. 허용값 목록(data_loader.FIRE_CAUSES, VEHICLE_STATES) 밖 값을
+# 로더가 경고만 하고 집계에 남기는지 확인할 수 있도록 전기차 화재 로그에 드물게(UNSEEN_RATIO) 섞는다.
+UNSEEN = {
+    "발화요인소분류": {"전기적 요인": ["누전, 지락"], "기계적 요인": ["정비불량"], "부주의": ["음식물 조리중"]},
+    "차량상태": ["세차중"],
+}
+UNSEEN_RATIO = 0.002
+# 통합 화재 로그의 장소 (대분류, 중분류, 소분류) -> 비율. 차량 화재는 전체의 약 12%
+PLACES = {
+    ("자동차,철도차량", "자동차", "승용자동차"): 7,
+    ("자동차,철도차량", "자동차", "화물자동차"): 4,
+    ("자동차,철도차량", "자동차", "버스"): 1,
+    ("자동차,철도차량", "자동차", "특수작업차"): 1,
+    ("주거", "단독주택", "단독주택"): 18,
+    ("주거", "공동주택", "아파트"): 16,
+    ("산업시설", "공장시설", "일반공업시설"): 10,
+    ("판매,업무시설", "판매시설", "상점"): 8,
+    ("생활서비스", "음식점", "한식"): 9,
+    ("임야", "산불", "산림"): 6,
+    ("기타", "기타", "쓰레기 등"): 20,
+}
+MAKERS = {
+    "현대자동차": (37, ["코나 EV", "일렉시티", "포터2 EV", "카운티 일렉시티", "아이오닉 EV", "아이오닉5", "G80 EV"]),
+    "기아": (19, ["봉고3 EV", "EV6", "레이 EV", "쏘울 EV", "니로 EV"]),
+    "한국지엠": (9, ["볼트 EV"]),
+    "르노코리아": (8, ["SM3 ZE"]),
+    "폭스바겐그룹": (8, ["E-tron", "Q4 e-tron", "e-Tron Sportback 55 qu"]),
+    "테슬라": (5, ["모델3", "모델X", "모델Y"]),
+    "대창모터스": (2, ["다니고밴 EV", "다니고1"]),
+    "비바모빌리티": (2, ["브이버스60"]),
+    "KG모빌리티": (1, ["토레스 EVX"]),
+    "쎄보모빌리티": (1, ["CEVO-C"]),
+}
+MAKER_CATEGORIES = {
+    "최초발화점": {"고전압배터리": 50, "차량기타부품": 25, "외부요인": 20, "미상": 1},
+    "상황": {"주차중": 34, "주행중": 24, "충전중": 24, "주행중(충돌)": 13, "정차중": 1},
+}
+
+
+def weighted_choice(rng, weights, size):
+    values = list(weights)
+    p = np.array([weights[v] for v in values], dtype=float)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=p / p.sum())]
+
+
+def nested_choice(rng, groups, size):
+    # groups: {상위값: (비율, [하위값...])} -> (상위, 하위) 배열
+    parents = weighted_choice(rng, {k: w for k, (w, _) in groups.items()}, size)
+    children = np.empty(size, dtype=object)
+    for parent, (_, values) in groups.items():
+        idx = np.flatnonzero(parents == parent)
+        children[idx] = np.asarray(values, dtype=object)[rng.integers(0, len(values), len(idx))]
+    return parents, children
+
+
+def regions(rng, size, fixed_region=None):
+    if fixed_region is not None:
+        sido = np.full(size, fixed_region, dtype=object)
+    else:
+        sido = weighted_choice(rng, {r: REGION_WEIGHTS.get(r, 2) for r in REGIONS}, size)
+    sigungu = np.empty(size, dtype=object)
+    for region in np.unique(sido):
+        idx = np.flatnonzero(sido == region)
+        sigungu[idx] = np.asarray(REGIONS[region], dtype=object)[rng.integers(0, len(REGIONS[region]), len(idx))]
+    return sido, sigungu
+
+
+def random_times(rng, size, start, end, growth=0.0):
+    # growth > 0 이면 뒤쪽 날짜일수록 많이 나온다 (전기차 화재 증가 추세)
+    start, end = pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1)
+    span = (end - start) / pd.Timedelta(minutes=1)
+    u = rng.random(size)
+    if growth > 0:
+        u = np.log1p(u * np.expm1(growth)) / growth
+    return start + pd.to_timedelta(np.sort(u) * span, unit="min")
+
+
+def fire_ev_frame(rows, start="2019-01-01", end="2024-12-31", seed=0, region=None, first_serial=1,
+                  unseen_ratio=UNSEEN_RATIO):
+    rng = np.random.default_rng(seed)
+    sido, sigungu = regions(rng, rows, region)
+    cause, subcause = nested_choice(rng, CAUSES, rows)
+    place = weighted_choice(rng, EV_CATEGORIES["장소소분류"], rows)
+    df = pd.DataFrame({
+        "연번": np.arange(first_serial, first_serial + rows),
+        "화재발생일": random_times(rng, rows, start, end, growth=2.0).strftime("%Y-%m-%d"),
+        "시도": sido,
+        "시군구": sigungu,
+        "발화요인대분류": cause,
+        "발화요인소분류": subcause,
+        "차량장소": weighted_choice(rng, EV_CATEGORIES["차량장소"], rows),
+        "장소소분류": place,
+        "지상_지하여부": np.where(pd.Series(place).str.startswith("지하"), "지하", "지상"),
+        "차량상태": weighted_choice(rng, EV_CATEGORIES["차량상태"], rows),
+        "차량발화지점": weighted_choice(rng, EV_CATEGORIES["차량발화지점"], rows),
+    })
+    return with_unseen(df, unseen_ratio, seed)
+
+
+def with_unseen(df, ratio, seed=0):
+    # 일부 행의 소분류(같은 대분류 안)와 차량상태를 UNSEEN 값으로 바꾼다. 다른 컬럼의 난수 흐름은 그대로 둔다.
+    if not ratio:
+        return df
+    rng = np.random.default_rng(seed + 4)
+    for cause, values in UNSEEN["발화요인소분류"].items():
+        idx = np.flatnonzero((df["발화요인대분류"] == cause).to_numpy() & (rng.random(len(df)) < ratio))
+        df.iloc[idx, df.columns.get_loc("발화요인소분류")] = np.asarray(values, dtype=object)[
+            rng.integers(0, len(values), len(idx))]
+    idx = np.flatnonzero(rng.random(len(df)) < ratio)
+    df.iloc[idx, df.columns.get_loc("차량상태")] = np.asarray(UNSEEN["차량상태"], dtype=object)[
+        rng.integers(0, len(UNSEEN["차량상태"]), len(idx))]
+    return df
+
+
+def fire_total_frame(rows, start="2019-01-01", end="2024-12-31", seed=0, region=None):
+    rng = np.random.default_rng(seed + 1)
+    sido, sigungu = regions(rng, rows, region)
+    cause, subcause = nested_choice(rng, CAUSES, rows)
+    places = weighted_choice(rng, {i: w for i, w in enumerate(PLACES.values())}, rows).astype(int)
+    place_table = np.asarray(list(PLACES), dtype=object)
+    times = random_times(rng, rows, start, end)
+    return pd.DataFrame({
+        "일시": times.strftime("%Y-%m-%d %H:%M"),
+        "시도": sido,
+        "시군구": sigungu,
+        "장소대분류": place_table[places, 0],
+        "장소중분류": place_table[places, 1],
+        "장소소분류": place_table[places, 2],
+        "발화요인대분류": cause,
+        "발화요인소분류": subcause,
+        "인명피해": rng.poisson(0.05, rows),
+        "재산피해": rng.integers(0, 50_000, rows) * 1000,
+    })
+
+
+def car_info_frame(start="2019-01-01", end="2024-12-31"):
+    years = np.arange(pd.Timestamp(start).year, pd.Timestamp(end).year + 1)
+    offset = years - 2021
+    return pd.DataFrame({
+        "연도": years,
+        "전체차량등록대수": (24_911_101 + offset * 550_000).astype("int64"),
+        "전기차등록대수": (231_443 * 1.5 ** offset).round().astype("int64"),
+    })
+
+
+def region_registrations_frame(start="2019-01-01", end="2024-12-31", seed=0):
+    # 시군구별 전기차 등록대수. 시도 몫은 REGION_WEIGHTS 비율, 시군구는 시도 몫을 무작위로 나눈다.
+    rng = np.random.default_rng(seed + 3)
+    national = car_info_frame(start, end).set_index("연도")["전기차등록대수"]
+    weights = pd.Series({r: REGION_WEIGHTS.get(r, 2) for r in REGIONS}, dtype="float64")
+    weights /= weights.sum()
+    rows = []
+    for sido, sigungu in REGIONS.items():
+        split = rng.dirichlet(np.full(len(sigungu), 4.0))
+        for year, total in national.items():
+            for name, share in zip(sigungu, split):
+                rows.append((year, sido, name, int(round(total * weights[sido] * share))))
+    return pd.DataFrame(rows, columns=["연도", "시도", "시군구", "전기차등록대수"])
+
+
+def car_maker_frame(rows, start="2019-01-01", end="2024-12-31", seed=0):
+    rng = np.random.default_rng(seed + 2)
+    maker, model = nested_choice(rng, MAKERS, rows)
+    return pd.DataFrame({
+        "연도": random_times(rng, rows, start, end, growth=2.0).year,
+        "제조사": maker,
+        "차명": model,
+        "최초발화점": weighted_choice(rng, MAKER_CATEGORIES["최초발화점"], rows),
+        "상황": weighted_choice(rng, MAKER_CATEGORIES["상황"], rows),
+    })
+
+
+def write_csv(df, path):
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def write_dataset(out_dir, total_rows, ev_rows, maker_rows=None, start="2019-01-01", end="2024-12-31",
+                  seed=0, reference_dir=None):
+    # 대시보드가 읽는 여섯 파일을 모두 만든다. 해외/제조사 점유율 표는 규모와 무관하므로 원본을 복사한다.
+    os.makedirs(out_dir, exist_ok=True)
+    path = lambda name: os.path.join(out_dir, name)
+    write_csv(fire_total_frame(total_rows, start, end, seed), path(data_loader.fire_total))
+    write_csv(fire_ev_frame(ev_rows, start, end, seed), path(data_loader.fire_EV))
+    write_csv(car_info_frame(start, end), path(data_loader.car_info))
+    write_csv(car_maker_frame(maker_rows or max(ev_rows // 2, 1), start, end, seed), path(data_loader.car_maker))
+    write_csv(region_registrations_frame(start, end, seed), path(data_loader.region_registrations))
+    reference_dir = reference_dir or os.path.dirname(os.path.abspath(__file__))
+    for name in [data_loader.foreign_fire, data_loader.manufac_fire]:
+        if os.path.exists(os.path.join(reference_dir, name)):
+            shutil.copy(os.path.join(reference_dir, name), path(name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스키마가 같은 합성 화재 데이터를 만든다.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--total-rows", type=int, default=1_000_000)
+    parser.add_argument("--ev-rows", type=int, default=10_000)
+    parser.add_argument("--maker-rows", type=int)
+    parser.add_argument("--start", default="2019-01-01")
+    parser.add_argument("--end", default="2024-12-31")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    write_dataset(args.out_dir, args.total_rows, args.ev_rows, args.maker_rows, args.start, args.end, args.seed)
+
+
+if __name__ == "__main__":
+    main()
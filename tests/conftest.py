@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+# ===== 테스트 공통 설정 =====
+# 모듈은 저장소 최상위에 평평하게 있으므로 경로에 올리고, 데이터는 합성 데이터셋(synthetic.py)을 한 번 만들어 같이 쓴다.
+# 오래 걸리는 테스트(세션 부하, 콜드 스타트)는 slow 로 표시한다: python -m pytest -m "not slow"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import data_loader  # noqa: E402
+import synthetic  # noqa: E402
+
+TOTAL_ROWS = int(os.environ.get("EV_TEST_TOTAL_ROWS", 20_000))
+EV_ROWS = int(os.environ.get("EV_TEST_EV_ROWS", 2_000))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: 세션 부하/콜드 스타트처럼 오래 걸리는 테스트")
+
+
+@pytest.fixture(scope="session")
+def dataset(tmp_path_factory):
+    data_loader.enable_copy_on_write()
+    out = str(tmp_path_factory.mktemp("data"))
+    synthetic.write_dataset(out, TOTAL_ROWS, EV_ROWS, reference_dir=ROOT)
+    return out
+
+
+@pytest.fixture
+def in_dataset(dataset, monkeypatch):
+    # 대시보드와 CLI 는 현재 폴더의 CSV 를 읽는다.
+    monkeypatch.chdir(dataset)
+    return dataset
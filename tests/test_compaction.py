@@ -0,0 +1,28 @@
+import pandas as pd
+
+import compaction
+import data_loader
+
+
+def test_same_folder_shares_codes(in_dataset):
+    ev = data_loader.load_csv(data_loader.fire_EV, ["시도"])
+    total = data_loader.load_csv(data_loader.fire_total, ["시도"])
+    # 같은 폴더의 두 파일은 같은 어휘(같은 범주 순서)를 써서 코드가 그대로 통한다.
+    assert ev["시도"].cat.categories.equals(total["시도"].cat.categories)
+    region = ev["시도"].iloc[0]
+    code = ev["시도"].cat.categories.get_loc(region)
+    assert (total["시도"].cat.codes[total["시도"] == region] == code).all()
+
+
+def test_vocabularies_are_scoped(tmp_path):
+    first, second = compaction.Vocabularies(), compaction.Vocabularies()
+    schema = {"dtype": {"시도": "category"}}
+    a = compaction.compact(pd.DataFrame({"시도": ["서울특별시", "경기도"]}), schema, first)
+    b = compaction.compact(pd.DataFrame({"시도": ["부산광역시", "경기도"]}), schema, second)
+    # 어휘가 다르면 값이 섞이지 않는다.
+    assert list(a["시도"].cat.categories) == ["서울특별시", "경기도"]
+    assert list(b["시도"].cat.categories) == ["부산광역시", "경기도"]
+    # 같은 어휘에는 새 값만 끝에 붙고, 이미 만든 코드는 그대로다.
+    c = compaction.compact(pd.DataFrame({"시도": ["부산광역시", "서울특별시"]}), schema, first)
+    assert list(c["시도"].cat.categories) == ["서울특별시", "경기도", "부산광역시"]
+    assert list(c["시도"].cat.codes) == [2, 0]
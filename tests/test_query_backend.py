@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+import pytest
+
+import data_loader
+import query_backend
+import synthetic
+
+pytest.importorskip("duckdb")
+
+# 합성 데이터의 어휘로 만든 사이드바 선택마다 pandas 와 DuckDB 결과를 비교한다 (query_backend.py --check 와 같은 비교).
+YEARS = list(range(2019, 2025))
+# 허용값 목록 밖 값(synthetic.UNSEEN)도 집계에 남으므로 함께 비교한다.
+SUBCAUSES = [sub for _, subs in synthetic.CAUSES.values() for sub in subs] + \
+    [sub for subs in synthetic.UNSEEN["발화요인소분류"].values() for sub in subs]
+STATUSES = list(synthetic.EV_CATEGORIES["차량상태"]) + synthetic.UNSEEN["차량상태"]
+CASES = list(query_backend.parity_cases(YEARS, SUBCAUSES, STATUSES))
+
+
+@pytest.fixture(scope="module")
+def backends(dataset):
+    return query_backend.PandasBackend(dataset), query_backend.DuckDBBackend(dataset)
+
+
+@pytest.mark.parametrize("selection", [selection for _, selection in CASES], ids=[label for label, _ in CASES])
+def test_parity(backends, selection):
+    assert query_backend.same_result(*backends, selection)
+
+
+def test_small_tables_are_validated(tmp_path):
+    # 품질 검사에 걸리는 행(전기차 등록대수 < 0)은 DuckDB 표에도 없다.
+    data_dir = str(tmp_path)
+    path = os.path.join(data_dir, data_loader.car_info)
+    synthetic.write_csv(synthetic.car_info_frame("2019-01-01", "2024-12-31"), path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("2099,100,-5\n")
+    backend = query_backend.DuckDBBackend(data_dir)
+    table = backend.execute("SELECT * FROM car_info ORDER BY 연도")
+    pd.testing.assert_frame_equal(table, data_loader.load_csv(path).reset_index(drop=True), check_dtype=False)
+    assert 2099 not in table["연도"].tolist()
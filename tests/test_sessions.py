@@ -0,0 +1,64 @@
+import gc
+import os
+import random
+import statistics
+
+import numpy as np
+import pytest
+
+import bench_sessions
+import data_loader
+import profiling
+from conftest import ROOT
+
+# ===== 동시 세션: 공유 캐시 / 세션당 메모리 / rerun 지연 =====
+# benchmarks/bench_sessions.py 와 같은 방식(한 프로세스에 AppTest 세션 N 개)으로 돌리고 결과를 단언한다.
+# 예산은 EV_TEST_MB_PER_SESSION / EV_TEST_RERUN_P95_S 로 바꾼다.
+SESSIONS = 4
+RERUNS = 3
+MB_PER_SESSION = float(os.environ.get("EV_TEST_MB_PER_SESSION", 50))
+RERUN_P95_S = float(os.environ.get("EV_TEST_RERUN_P95_S", 5.0))
+
+
+def test_sessions_share_cached_frames(in_dataset):
+    first = data_loader.load_csv(data_loader.fire_EV)
+    second = data_loader.load_csv(data_loader.fire_EV)
+    assert first is not second
+    assert np.shares_memory(first["연번"].to_numpy(), second["연번"].to_numpy())
+    # 한 세션이 고쳐도 다른 세션과 캐시 원본은 그대로다 (Copy-on-Write)
+    before = second["연번"].iloc[0]
+    first.loc[first.index[0], "연번"] = -1
+    first["추가"] = 1
+    assert second["연번"].iloc[0] == before
+    assert "추가" not in data_loader.load_csv(data_loader.fire_EV).columns
+
+
+@pytest.mark.slow
+def test_concurrent_sessions(in_dataset, monkeypatch):
+    monkeypatch.setattr(bench_sessions, "open_session", open_session)
+    # 세션 1개로 모든 탭을 한 번씩 열어 공유 데이터를 올려 둔다.
+    warmup = open_session(in_dataset, random.Random(0))
+    for tab in bench_sessions.TABS:
+        warmup.radio(key="active_tab").set_value(tab).run()
+    assert not warmup.exception
+    del warmup
+    gc.collect()
+    shared = data_loader.cache_stats()
+    baseline = profiling.rss_mb()
+
+    sessions, latencies = bench_sessions.run_sessions(in_dataset, SESSIONS, RERUNS, seed=SESSIONS)
+    assert len(latencies) == SESSIONS * RERUNS
+    assert not any(at.exception for at in sessions)
+    # 세션이 늘어도 공유 캐시는 늘지 않는다 (세션마다 데이터를 따로 올리지 않음)
+    assert data_loader.cache_stats()["entries"] == shared["entries"]
+    assert data_loader.cache_stats()["mb"] == pytest.approx(shared["mb"], rel=0.01)
+    assert (profiling.rss_mb() - baseline) / SESSIONS < MB_PER_SESSION
+    assert statistics.quantiles(latencies, n=20)[-1] < RERUN_P95_S
+
+
+def open_session(workdir, rng):
+    # 저장소의 project.py 를 그대로 띄운다 (데이터는 현재 폴더).
+    at = bench_sessions.AppTest.from_file(os.path.join(ROOT, "project.py"), default_timeout=600)
+    at.run()
+    at.radio(key="active_tab").set_value(rng.choice(bench_sessions.TABS)).run()
+    return at
@@ -0,0 +1,11 @@
+import snapshot
+import validation
+
+
+def test_rule_change_rebuilds(in_dataset, tmp_path, monkeypatch):
+    out = str(tmp_path / "snapshot")
+    assert snapshot.build(".", out) is not None
+    assert snapshot.is_fresh(".", out)
+    # 입력 파일은 그대로여도 검사 규칙이 바뀌면 다시 만든다.
+    monkeypatch.setattr(validation, "ENGINE_VERSION", validation.ENGINE_VERSION + 1)
+    assert not snapshot.is_fresh(".", out)
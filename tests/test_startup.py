@@ -0,0 +1,30 @@
+import glob
+import os
+import shutil
+import statistics
+
+import pytest
+
+import bench_startup
+from conftest import ROOT
+
+# ===== 시작 시간 예산 =====
+# benchmarks/bench_startup.py 와 같은 방식으로 새 프로세스의 import / 첫 화면 시간을 재고 예산과 비교한다.
+# 예산은 EV_STARTUP_IMPORT_BUDGET_S / EV_STARTUP_RENDER_BUDGET_S 로 바꾼다.
+REPEAT = 3
+
+
+@pytest.mark.slow
+def test_startup_within_budget(dataset, tmp_path):
+    workdir = str(tmp_path)
+    for path in glob.glob(os.path.join(dataset, "*.csv")) + glob.glob(os.path.join(ROOT, "*.py")):
+        shutil.copy(path, workdir)
+    # 준비 실행에서 사이드카/적재 상태를 만들고, 그 뒤 콜드 스타트만 잰다.
+    prepare = bench_startup.measure(workdir)
+    assert prepare["error"] is None
+    runs = [bench_startup.measure(workdir) for _ in range(REPEAT)]
+    assert not any(run["error"] for run in runs)
+    assert statistics.median(run["import_s"] for run in runs) <= bench_startup.IMPORT_BUDGET_S
+    assert statistics.median(run["render_s"] for run in runs) <= bench_startup.RENDER_BUDGET_S
+    # 첫 화면에 필요 없는 무거운 모듈(DEFERRED)은 올라오지 않는다.
+    assert sorted({name for run in runs for name in run["loaded"]}) == []
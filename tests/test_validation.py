@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+
+import data_loader
+import synthetic
+import validation
+
+
+def write_ev(data_dir, rows):
+    path = os.path.join(data_dir, data_loader.fire_EV)
+    df = synthetic.fire_ev_frame(len(rows) + 3, unseen_ratio=0)
+    for i, row in enumerate(rows):
+        for col, value in row.items():
+            df[col] = df[col].astype(object)
+            df.iloc[i, df.columns.get_loc(col)] = value
+    synthetic.write_csv(df, path)
+    return path, df
+
+
+def test_unknown_values_warn_and_stay_counted(tmp_path):
+    path, df = write_ev(str(tmp_path), [
+        {"차량상태": "세차중"},                                    # 목록 밖 값: 경고
+        {"발화요인대분류": "방화", "발화요인소분류": "담배꽁초"},     # 대분류와 맞지 않는 소분류: 경고
+        {"연번": None},                                            # 연번 없음: 격리
+        {"연번": "12a"},                                           # 연번 형식 오류: 격리
+        {"연번": 1},                                               # 연번 중복 (첫 행과): 격리
+        {"화재발생일": "2023-02-30"},                               # 날짜 형식 오류: 격리
+    ])
+    quarantine = validation.Quarantine(path, data_loader.schema_for(path))
+    kept = pd.concat(data_loader.iter_csv_chunks(path, quarantine=quarantine), ignore_index=True)
+    report = quarantine.report()
+
+    assert report["quarantined"] == 4 and len(kept) == len(df) - 4
+    assert report["reasons"] == {"연번 없음": 1, "연번 형식 오류": 1, "연번 중복": 1, "화재발생일 형식 오류": 1}
+    assert report["warned"] == 2
+    assert report["warnings"] == {"차량상태 허용값 아님": 1, "발화요인소분류-발화요인대분류 짝 아님": 1}
+    assert report["warning_values"]["차량상태 허용값 아님"] == ["세차중"]
+    assert kept["연번"].dtype == "int32"
+    # 경고 행은 캐시 프레임(category 압축 후)에도 값 그대로 남는다.
+    assert (data_loader.load_csv(path)["차량상태"] == "세차중").sum() == 1
+
+
+def test_synthetic_unseen_values_are_counted(in_dataset):
+    report = data_loader.load_quality_report(data_loader.fire_EV)
+    df = data_loader.load_csv(data_loader.fire_EV, ["차량상태"])
+    unseen = df["차량상태"].isin(synthetic.UNSEEN["차량상태"]).sum()
+    assert unseen > 0
+    assert report["warnings"]["차량상태 허용값 아님"] == unseen
+    assert report["quarantined"] == 0 and len(df) == report["rows"]
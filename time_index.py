@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+import compaction
+import data_loader
+
+# ===== 날짜 정렬 인덱스: 기간 필터 + 월/요일/시간대 분포 =====
+# 화재 로그를 날짜 순으로 한 번 정렬해 두고, 같은 순서로 (월 번호, 요일, 시간대) 칸 번호와 필터 컬럼 코드를 정수 배열로 들고 있는다.
+# 기간과 연도 선택은 정렬된 날짜에 대한 이진 탐색(np.searchsorted)으로 [시작, 끝) 행 구간이 되므로
+# 행 전체를 훑지 않고, 분포는 그 구간 조각의 칸 번호를 np.bincount 한 번으로 세어 축별로 더한다.
+# 날짜는 로더가 압축해 둔 1970-01-01 기준 정수(compaction.DATE_UNITS: 일/분 단위)를 그대로 정렬한다.
+# 전기차 로그(화재발생일)는 날짜만 있으므로 시간대 분포가 없다.
+# 표시 이름: key (파일/차트 이름용), 파일, 날짜 컬럼, 필터 컬럼, vehicle (통합 로그의 차량 화재만)
+SOURCES = {
+    "전기차": {"key": "ev", "path": data_loader.fire_EV, "column": "화재발생일",
+            "filters": ["차량상태", "발화요인소분류"]},
+    "전체 차량": {"key": "total", "path": data_loader.fire_total, "column": "일시", "filters": ["장소소분류"],
+              "vehicle": True},
+}
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+# 1970-01-01 은 목요일 (월요일 = 0)
+EPOCH_WEEKDAY = 3
+
+
+class TimeIndex:
+    def __init__(self, df, column, filter_columns=()):
+        self.column = column
+        self.unit = compaction.DATE_UNITS.get(column, "D")
+        numbers = df[column]
+        if not pd.api.types.is_integer_dtype(numbers):
+            numbers = compaction.to_numbers(numbers, self.unit)
+        valid = numbers.notna().to_numpy()
+        values = numbers.to_numpy(dtype=np.int64, na_value=0)[valid]
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        # 날짜가 없는(NaT) 행은 기간 조회에서 빠진다.
+        self.n_missing = int((~valid).sum())
+        self.n_rows = len(values)
+
+        # 정렬된 날짜와, 같은 순서의 칸 번호 = (첫 달 기준 월 번호 × 7 + 요일) × 24 + 시간대
+        stamps = values.astype(f"datetime64[{self.unit}]")
+        months = stamps.astype("datetime64[M]").astype(np.int64)
+        self.first_month = int(months[0]) if len(months) else 0
+        self.n_months = int(months[-1]) - self.first_month + 1 if len(months) else 0
+        self.has_hour = self.unit == "m"
+        weekday = (stamps.astype("datetime64[D]").astype(np.int64) + EPOCH_WEEKDAY) % 7
+        hour = values // 60 % 24 if self.has_hour else 0
+        self.dates = values.astype(np.int32)
+        self.slots = (((months - self.first_month) * 7 + weekday) * 24 + hour).astype(np.int32)
+
+        # 필터 컬럼: 값 목록과 정렬 순서의 코드 (결측은 -1)
+        self.values = {}
+        self.positions = {}
+        self.codes = {}
+        for col in filter_columns:
+            codes, uniques = pd.factorize(df[col], sort=False)
+            self.values[col] = list(uniques)
+            self.positions[col] = {value: i for i, value in enumerate(uniques)}
+            self.codes[col] = codes[valid][order].astype(np.int16)
+        # 세션 간 공유되므로 읽기 전용으로 고정한다.
+        for array in [self.dates, self.slots, *self.codes.values()]:
+            array.flags.writeable = False
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in [self.dates, self.slots, *self.codes.values()])
+
+    def date_range(self):
+        # (첫 날짜, 마지막 날짜). 날짜가 있는 행이 없으면 None
+        if not self.n_rows:
+            return None
+        first, last = self.dates[[0, -1]].astype(np.int64).astype(f"datetime64[{self.unit}]")
+        return pd.Timestamp(first).date(), pd.Timestamp(last).date()
+
+    def to_number(self, date):
+        return int(np.datetime64(pd.Timestamp(date).to_datetime64(), self.unit).astype(np.int64))
+
+    def span(self, start=None, end=None):
+        # 날짜 [start, end] (end 날짜 하루 전체 포함) -> 정렬 순서의 행 구간 [lo, hi)
+        lo = 0 if start is None else int(np.searchsorted(self.dates, self.to_number(start), "left"))
+        if end is None:
+            hi = self.n_rows
+        else:
+            after = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            hi = int(np.searchsorted(self.dates, self.to_number(after), "left"))
+        return lo, max(lo, hi)
+
+    def spans(self, start=None, end=None, years=None):
+        # 기간과 선택 연도가 겹치는 행 구간들 (이어지는 연도는 한 구간으로). years=None 은 연도 조건 없음
+        lo, hi = self.span(start, end)
+        if years is None:
+            return [(lo, hi)] if hi > lo else []
+        result = []
+        for year in sorted({int(y) for y in years}):
+            year_lo, year_hi = self.span(f"{year}-01-01", f"{year}-12-31")
+            a, b = max(lo, year_lo), min(hi, year_hi)
+            if b <= a:
+                continue
+            if result and result[-1][1] == a:
+                result[-1] = (result[-1][0], b)
+            else:
+                result.append((a, b))
+        return result
+
+    def mask(self, lo, hi, filters):
+        # filters: {컬럼: 선택값 목록 또는 None}. None 은 조건 없음, 빈 목록은 0건 (BitmapIndex.mask 와 동일).
+        # 조건이 없으면 None (구간 전체)
+        keep = None
+        for col, values in (filters or {}).items():
+            if values is None:
+                continue
+            # 코드 -> 선택 여부 표 (마지막 칸은 결측 코드 -1)
+            lookup = np.zeros(len(self.values[col]) + 1, dtype=bool)
+            lookup[[self.positions[col][v] for v in values if v in self.positions[col]]] = True
+            hit = lookup[self.codes[col][lo:hi]]
+            keep = hit if keep is None else keep & hit
+        return keep
+
+    def summary(self, start=None, end=None, years=None, filters=None):
+        # 선택 구간의 월별 건수(빈 달은 0), 월/요일/시간대 분포
+        spans = self.spans(start, end, years)
+        counts = np.zeros(self.n_months * 7 * 24, dtype=np.int64)
+        for lo, hi in spans:
+            keep = self.mask(lo, hi, filters)
+            slots = self.slots[lo:hi] if keep is None else self.slots[lo:hi][keep]
+            counts += np.bincount(slots, minlength=len(counts))
+        counts = counts.reshape(self.n_months, 7, 24)
+        monthly = counts.sum(axis=(1, 2))
+
+        # 월별 시계열은 선택 구간들에 걸친 달만 (선택하지 않은 연도는 0건이 아니라 빠진다)
+        month_of = lambda row: int(self.slots[row]) // (7 * 24)
+        months = np.unique(np.concatenate(
+            [np.arange(month_of(lo), month_of(hi - 1) + 1) for lo, hi in spans] or [np.zeros(0, np.int64)]))
+        month_numbers = months + self.first_month
+        by_month = pd.Series(monthly[months], name="화재건수",
+                             index=pd.DatetimeIndex(month_numbers.astype("datetime64[M]"), name="월"))
+        month_of_year = np.bincount(month_numbers % 12, weights=by_month.to_numpy(), minlength=12)
+        return {
+            "count": int(monthly.sum()),
+            "monthly": by_month,
+            "month_of_year": pd.Series(month_of_year.astype(np.int64), index=pd.Index(range(1, 13), name="월"),
+                                       name="화재건수"),
+            "weekday": pd.Series(counts.sum(axis=(0, 2)), index=pd.Index(WEEKDAYS, name="요일"), name="화재건수"),
+            "hour": (pd.Series(counts.sum(axis=(0, 1)), index=pd.Index(range(24), name="시간대"), name="화재건수")
+                     if self.has_hour else None),
+        }
+
+
+def read_frame(name):
+    source = SOURCES[name]
+    columns = [source["column"], *source["filters"]]
+    if source.get("vehicle"):
+        # 통합 로그는 차량 화재(승용/화물/버스)만
+        return data_loader.load_vehicle_fires(source["path"], columns=columns)
+    return data_loader.load_csv(source["path"], columns)
+
+
+def load_index(name):
+    # 화재 로그가 바뀌지 않았으면 프로세스 내에서 인덱스를 재사용한다.
+    source = SOURCES[name]
+    signature = data_loader.file_signature(source["path"])
+    return data_loader.memoized(
+        (signature[0], "time_index"), signature,
+        lambda: TimeIndex(read_frame(name), source["column"], source["filters"]),
+    )
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# ===== 데이터 품질 검사 / 격리 =====
+# 로더가 CSV 를 청크로 읽을 때마다 파일 스키마(data_loader.SCHEMAS)의 규칙으로 검사한다.
+# 행마다 파이썬을 돌지 않고 규칙마다 컬럼 전체의 불리언 마스크를 만든다.
+# 읽을 수 없는 행(날짜/키가 없거나 깨진 행, 중복 키, 불가능한 수치)은 집계에서 빼고 사유와 함께 격리한다.
+#   dates   : 날짜 없음 / 형식 오류 (파싱하면 NaT) / 미래 날짜
+#   numbers : 숫자 키 없음 / 형식 오류 (숫자가 아니거나 정수가 아니거나 타입 범위 밖)
+#   unique  : 앞에서 이미 나온 키 (처음 나온 행만 남긴다, 청크를 넘어서도)
+#   ranges  : (최소, 최대) 밖의 값 (None 은 제한 없음)
+#   at_most : 다른 컬럼보다 큰 값 (예: 전기차등록대수 <= 전체차량등록대수)
+# 값 목록 규칙은 목록이 실제 코드표보다 좁을 수 있어 경고로만 센다. 행은 집계에 그대로 남는다.
+#   enums   : 허용값 목록에 없는 값 (새 코드이거나 오타). 빈 값은 통과
+#   pairs   : 상위 분류와 맞지 않는 하위 분류 (둘 다 목록에 있는 값일 때만)
+# 격리 결과는 원본 CSV 폴더의 .quarantine/ 에 남긴다.
+#   <파일이름>.csv  : 격리된 원본 행 + 행번호(헤더 제외, 1부터) + 격리사유
+#   <파일이름>.json : 검사 행 수, 사유별 격리/경고 건수, 목록 밖 값, 원본 시그니처, 규칙 버전 (대시보드 요약)
+# 파일은 Parquet 사이드카를 만들 때(원본이나 규칙이 바뀔 때 한 번) 같이 기록한다 (data_loader.ensure_parquet).
+QUARANTINE_DIR = os.environ.get("EV_QUARANTINE_DIR", ".quarantine")
+RULE_KEYS = ["dates", "numbers", "enums", "pairs", "unique", "ranges", "at_most"]
+# 검사 방식이 바뀌면 올린다 (규칙 버전에 들어가 사이드카/격리 파일을 다시 만든다)
+ENGINE_VERSION = 2
+# 경고 사유별로 요약에 남기는 목록 밖 값 수
+WARNING_VALUES = 20
+# 미래 날짜 판단 여유 (시간대 차이)
+FUTURE_SLACK = pd.Timedelta(days=1)
+
+
+def rules_version(schema):
+    rules = {key: schema[key] for key in RULE_KEYS if key in schema}
+    raw = json.dumps([ENGINE_VERSION, rules], ensure_ascii=False, sort_keys=True, default=list)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def rule_columns(schema):
+    # 검사에 필요한 컬럼. 일부 컬럼만 읽을 때도 이 컬럼들은 함께 읽어야 어느 경로로 읽든 같은 행이 남는다.
+    columns = [*schema.get("dates", []), *schema.get("numbers", {}), *schema.get("enums", {}),
+               *schema.get("ranges", {})]
+    for col, other in schema.get("at_most", {}).items():
+        columns += [col, other]
+    for col, (parent, _) in schema.get("pairs", {}).items():
+        columns += [parent, col]
+    if schema.get("unique"):
+        columns.append(schema["unique"])
+    return list(dict.fromkeys(columns))
+
+
+def quarantine_path(path, ext=".csv"):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.normpath(os.path.join(os.path.dirname(path), QUARANTINE_DIR, name + ext))
+
+
+def read_report(path):
+    try:
+        with open(quarantine_path(path, ".json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_quarantined(csv_path, nrows=None):
+    # 격리 CSV 미리보기 (대시보드)
+    return pd.read_csv(csv_path, encoding="utf-8-sig", nrows=nrows, dtype=str)
+
+
+def outside_enum(series, allowed):
+    # category 는 범주 목록만 검사하고, 허용값 밖의 범주가 있을 때만 코드 배열에서 해당 행을 찾는다.
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        bad = np.flatnonzero(~series.cat.categories.isin(allowed))
+        if not len(bad):
+            return np.zeros(len(series), dtype=bool)
+        return np.isin(series.cat.codes.to_numpy(), bad)
+    return (series.notna() & ~series.isin(allowed)).to_numpy()
+
+
+def mismatched_pair(child, parent, table):
+    # table: {상위값: [하위값...]}. 하위값은 상위값 하나에만 속한다. 목록 밖 값은 enums 경고로 센다.
+    parent_of = {sub: major for major, subs in table.items() for sub in subs}
+    known = np.flatnonzero((child.isin(list(parent_of)) & parent.isin(list(table))).to_numpy())
+    mismatch = np.zeros(len(child), dtype=bool)
+    expected = child.iloc[known].astype(object).map(parent_of).to_numpy()
+    mismatch[known] = expected != parent.iloc[known].astype(object).to_numpy()
+    return mismatch
+
+
+def unparsed(parsed, raw):
+    # 파싱 결과가 NaT/NaN 인 행을 (원본도 비어 있음, 원본은 있는데 형식 오류) 로 나눈다.
+    nat = parsed.isna().to_numpy()
+    missing = np.zeros(len(parsed), dtype=bool)
+    # 문자열 컬럼 전체의 isna 는 비싸므로 NaT 가 된 행만 원본을 본다.
+    positions = np.flatnonzero(nat)
+    missing[positions] = raw.iloc[positions].isna().to_numpy()
+    return missing, nat & ~missing
+
+
+class Quarantine:
+    # 파일 하나를 처음부터 끝까지 읽는 동안의 검사 상태 (청크를 넘는 중복 키, 사유별 건수, 격리 행)
+    def __init__(self, path, schema):
+        self.path = path
+        self.schema = schema
+        self.version = rules_version(schema)
+        self.columns = rule_columns(schema)
+        self.rows = 0
+        self.counts = {}
+        self.warning_counts = {}
+        self.warning_values = {}
+        self.warned = 0
+        self.parts = []
+        self.keys = []
+        self.top = None
+        self.now = pd.Timestamp.now() + FUTURE_SLACK
+
+    def seen_keys(self):
+        # 지금까지 나온 키 (정렬된 고유값). 순서가 뒤섞인 파일에서만 필요하므로 그때 한 번에 합친다.
+        if len(self.keys) > 1:
+            self.keys = [np.unique(np.concatenate(self.keys))]
+        return self.keys[0] if self.keys else np.array([])
+
+    def duplicated(self, series):
+        values = series.to_numpy()
+        dup = series.duplicated().to_numpy()
+        # 키가 계속 커지는(연번) 보통의 경우는 최댓값 비교만으로 앞 청크와의 중복이 없음을 안다.
+        if len(values) and self.top is not None and values.min() <= self.top:
+            dup |= np.isin(values, self.seen_keys())
+        if len(values):
+            self.keys.append(values)
+            self.top = values.max() if self.top is None else max(self.top, values.max())
+        return dup
+
+    def masks(self, chunk, raw):
+        # 격리 사유 -> 행별 불리언 배열. raw 는 파싱 전 날짜/숫자 문자열 (없음과 형식 오류를 구분한다)
+        masks = {}
+        for col in self.schema.get("dates", []):
+            if col in chunk.columns:
+                missing, invalid = unparsed(chunk[col], raw[col])
+                masks[f"{col} 없음"] = missing
+                masks[f"{col} 형식 오류"] = invalid
+                masks[f"{col} 미래 날짜"] = (chunk[col] > self.now).to_numpy()
+        for col, kind in self.schema.get("numbers", {}).items():
+            if col in chunk.columns:
+                missing, invalid = unparsed(chunk[col], raw[col])
+                limits = np.iinfo(kind)
+                values = chunk[col].to_numpy(dtype="float64")
+                with np.errstate(invalid="ignore"):
+                    invalid |= (values % 1 != 0) | (values < limits.min) | (values > limits.max)
+                masks[f"{col} 없음"] = missing
+                masks[f"{col} 형식 오류"] = invalid & ~missing
+        col = self.schema.get("unique")
+        if col in chunk.columns:
+            # 없거나 깨진 키(NaN)는 위에서 격리하므로 중복 검사에서 뺀다.
+            present = chunk[col].notna().to_numpy()
+            duplicated = np.zeros(len(chunk), dtype=bool)
+            duplicated[present] = self.duplicated(chunk[col][present])
+            masks[f"{col} 중복"] = duplicated
+        for col, (low, high) in self.schema.get("ranges", {}).items():
+            if col in chunk.columns:
+                outside = np.zeros(len(chunk), dtype=bool)
+                if low is not None:
+                    outside |= (chunk[col] < low).to_numpy()
+                if high is not None:
+                    outside |= (chunk[col] > high).to_numpy()
+                masks[f"{col} 범위 밖"] = outside
+        for col, other in self.schema.get("at_most", {}).items():
+            if col in chunk.columns and other in chunk.columns:
+                masks[f"{col} > {other}"] = (chunk[col] > chunk[other]).to_numpy()
+        return masks
+
+    def warnings(self, chunk):
+        # 경고 사유 -> (행별 불리언 배열, 요약에 보여 줄 컬럼들)
+        warnings = {}
+        for col, allowed in self.schema.get("enums", {}).items():
+            if col in chunk.columns:
+                warnings[f"{col} 허용값 아님"] = (outside_enum(chunk[col], allowed), [col])
+        for col, (parent, table) in self.schema.get("pairs", {}).items():
+            if col in chunk.columns and parent in chunk.columns:
+                warnings[f"{col}-{parent} 짝 아님"] = (mismatched_pair(chunk[col], chunk[parent], table), [parent, col])
+        return warnings
+
+    def warn(self, chunk, kept):
+        # 집계에 남는 행(kept)의 경고만 센다. 목록 밖 값은 사유별로 WARNING_VALUES 개까지 기록한다.
+        warned = np.zeros(len(chunk), dtype=bool)
+        for reason, (mask, columns) in self.warnings(chunk).items():
+            hit = np.flatnonzero(mask & kept)
+            if not len(hit):
+                continue
+            warned[hit] = True
+            self.warning_counts[reason] = self.warning_counts.get(reason, 0) + len(hit)
+            values = self.warning_values.setdefault(reason, [])
+            if len(values) < WARNING_VALUES:
+                found = chunk[columns].iloc[hit].astype(str).agg(" / ".join, axis=1).unique()
+                values += [v for v in found if v not in values][:WARNING_VALUES - len(values)]
+        self.warned += int(warned.sum())
+
+    def split(self, chunk, raw):
+        # 검사를 통과한 행만 돌려주고, 나머지는 원본 값(날짜는 파싱 전 문자열)과 사유를 붙여 모아 둔다.
+        masks = self.masks(chunk, raw)
+        start = self.rows
+        self.rows += len(chunk)
+        failed = np.zeros(len(chunk), dtype=bool)
+        for mask in masks.values():
+            failed |= mask
+        self.warn(chunk, ~failed)
+        if not failed.any():
+            return chunk
+        positions = np.flatnonzero(failed)
+        reasons = np.full(len(positions), "", dtype=object)
+        for reason, mask in masks.items():
+            hit = mask[positions]
+            if hit.any():
+                self.counts[reason] = self.counts.get(reason, 0) + int(hit.sum())
+                reasons[hit] = np.where(reasons[hit] == "", reason, reasons[hit] + ", " + reason)
+        rejected = chunk.iloc[positions].drop(columns=["연도"] if self.schema.get("year_from") else [])
+        rejected = rejected.astype({col: object for col in rejected.columns
+                                    if isinstance(rejected[col].dtype, pd.CategoricalDtype)})
+        for col in raw.columns:
+            rejected[col] = raw[col].to_numpy()[positions]
+        rejected.insert(0, "행번호", start + positions + 1)
+        rejected["격리사유"] = reasons
+        self.parts.append(rejected)
+        return chunk[~failed]
+
+    def report(self):
+        quarantined = sum(len(part) for part in self.parts)
+        return {
+            "file": os.path.basename(self.path),
+            "version": self.version,
+            "rows": self.rows,
+            "passed": self.rows - quarantined,
+            "quarantined": quarantined,
+            "reasons": dict(sorted(self.counts.items(), key=lambda item: -item[1])),
+            "warned": self.warned,
+            "warnings": dict(sorted(self.warning_counts.items(), key=lambda item: -item[1])),
+            "warning_values": self.warning_values,
+            "quarantine_file": quarantine_path(self.path) if quarantined else None,
+        }
+
+    def save(self, source):
+        # source: 원본 시그니처 (parquet_store.convert 가 돌려준 크기/수정시각/해시)
+        # 격리 행이 없으면 예전 격리 CSV 를 지운다. 요약(json)은 마지막에 바꿔치기한다.
+        csv_path = quarantine_path(self.path)
+        os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+        if self.parts:
+            pd.concat(self.parts, ignore_index=True).to_csv(csv_path + ".tmp", index=False, encoding="utf-8-sig")
+            os.replace(csv_path + ".tmp", csv_path)
+        elif os.path.exists(csv_path):
+            os.remove(csv_path)
+        report = {**self.report(), "source": source}
+        json_path = quarantine_path(self.path, ".json")
+        with open(json_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(json_path + ".tmp", json_path)
+        return report
@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+
+import data_loader
+
+# ===== 제조사/차명 차원 표 =====
+# 차종별 화재(차종별_전기차_화재.csv)와 제조사 점유율(전기차_제조사_점유율_화재.csv)은 제조사 표기가 달라
+# ("현대자동차" vs "현대") 이름으로는 이어지지 않는다. 이름을 비교용으로 정규화하고 별칭 사전으로 대표 이름에
+# 모은 뒤, 대표 이름마다 정수 키(제조사키, 차명키)를 붙인다. 차명은 제조사별로 따로 키를 붙인다.
+# 정규화/별칭 처리는 행이 아니라 고유 이름 단위의 벡터 연산이라 전국 차명 목록 규모에서도 고유 이름 수만큼만 일한다.
+# 화재 행은 (제조사키, 차명키, 최초발화점 코드, 상황 코드) 정수 배열로 들고 있고, 제조사별 최초발화점/상황 건수와
+# 판매 10만대당 화재는 키 배열의 bincount 와 제조사키로 바로 찾는 판매 배열(인덱스 조인)로 계산한다.
+
+# 별칭 -> 대표 이름. 대표 이름은 점유율 표의 표기를 따른다. (비교는 정규화한 이름으로 하므로
+# 띄어쓰기/대소문자/하이픈만 다른 표기는 적지 않아도 된다.)
+MAKER_ALIASES = {
+    "현대자동차": "현대", "현대차": "현대", "HYUNDAI": "현대",
+    "기아자동차": "기아", "기아차": "기아", "KIA": "기아",
+    "한국GM": "한국지엠", "GM코리아": "한국지엠", "쉐보레": "한국지엠", "CHEVROLET": "한국지엠",
+    "르노삼성": "르노코리아", "르노삼성자동차": "르노코리아", "르노": "르노코리아",
+    "쌍용": "KG모빌리티", "쌍용자동차": "KG모빌리티", "KGM": "KG모빌리티",
+    "TESLA": "테슬라",
+    "BMW코리아": "BMW",
+    "메르세데스벤츠": "벤츠", "MERCEDES-BENZ": "벤츠",
+    "폭스바겐": "폭스바겐그룹", "아우디": "폭스바겐그룹", "VOLKSWAGEN": "폭스바겐그룹", "AUDI": "폭스바겐그룹",
+    "볼보": "폴스타/볼보", "폴스타": "폴스타/볼보", "VOLVO": "폴스타/볼보", "POLESTAR": "폴스타/볼보",
+    "PEUGEOT": "푸조",
+}
+MODEL_ALIASES = {
+    "코나 일렉트릭": "코나 EV",
+    "아이오닉 일렉트릭": "아이오닉 EV",
+    "IONIQ 5": "아이오닉5",
+    "봉고 EV": "봉고3 EV",
+    "포터 EV": "포터2 EV", "포터 일렉트릭": "포터2 EV",
+    "MODEL 3": "모델3", "MODEL Y": "모델Y", "MODEL X": "모델X", "MODEL S": "모델S",
+    "SM3 Z.E.": "SM3 ZE",
+}
+CATEGORY_COLUMNS = ["최초발화점", "상황"]
+
+
+def match_keys(names):
+    # 비교용 이름: 유니코드 NFKC, 대문자, 공백/하이픈/점/밑줄 제거 (결측은 <NA>)
+    return (pd.Series(names, dtype=object).str.normalize("NFKC").str.upper()
+            .str.replace(r"[\s\-_.·]", "", regex=True).reset_index(drop=True))
+
+
+class Vocabulary:
+    # 정규화 이름 -> 정수 키 (처음 본 순서), 키 -> 대표 이름
+    def __init__(self, aliases=None):
+        aliases = aliases or {}
+        self.aliases = pd.Series(list(aliases.values()), index=match_keys(list(aliases)), dtype=object)
+        self.index = pd.Index([], dtype=object)
+        self.names = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def canonical(self, names):
+        # 고유 이름들 -> (정규화 이름, 대표 이름). 별칭이면 대표 이름으로 바꾼다.
+        names = pd.Series(names, dtype=object).reset_index(drop=True)
+        match = match_keys(names)
+        alias = match.map(self.aliases)
+        has_alias = alias.notna().to_numpy()
+        if has_alias.any():
+            match[has_alias] = match_keys(alias[has_alias]).to_numpy()
+            names[has_alias] = alias[has_alias].to_numpy()
+        return match, names
+
+    def register(self, match, names):
+        # 처음 보는 정규화 이름에 새 키를 붙이고, 각 이름의 키를 돌려준다 (결측은 -1).
+        valid = match.notna()
+        new = valid & ~match.isin(self.index) & ~match.duplicated()
+        if new.any():
+            self.index = self.index.append(pd.Index(match[new], dtype=object))
+            self.names += names[new].tolist()
+        keys = np.full(len(match), -1, dtype=np.int32)
+        keys[valid.to_numpy()] = self.index.get_indexer(match[valid])
+        return keys
+
+    def encode(self, values):
+        # 행별 이름 -> 행별 키. 고유 이름만 정규화한다.
+        codes, uniques = pd.factorize(values)
+        keys = self.register(*self.canonical(np.asarray(uniques, dtype=object)))
+        return np.where(codes >= 0, keys[codes], -1).astype(np.int32)
+
+
+class VehicleDim:
+    # 제조사/차명 차원. 차명은 (제조사키, 정규화 차명) 으로 구분한다.
+    def __init__(self, maker_aliases=MAKER_ALIASES, model_aliases=MODEL_ALIASES):
+        self.makers = Vocabulary(maker_aliases)
+        self.models = Vocabulary(model_aliases)
+        self.model_maker = np.zeros(0, dtype=np.int32)  # 차명키 -> 제조사키
+
+    def maker_keys(self, names):
+        return self.makers.encode(names)
+
+    def model_keys(self, maker_keys, names):
+        # 고유 차명만 정규화하고, (제조사키, 정규화 차명) 쌍을 정수 하나로 묶어 고유 쌍에만 키를 붙인다.
+        name_codes, name_uniques = pd.factorize(names)
+        match, display = self.models.canonical(np.asarray(name_uniques, dtype=object))
+        match_codes, match_uniques = pd.factorize(match)
+        # 정규화 이름별 대표 표기 (처음 나온 표기)
+        firsts = np.unique(match_codes[match_codes >= 0], return_index=True)[1]
+        match_display = display.to_numpy()[match_codes >= 0][firsts]
+        width = max(len(match_uniques), 1)
+        row_match = np.where(name_codes >= 0, match_codes[name_codes], -1)
+        pairs = np.where((row_match >= 0) & (maker_keys >= 0), maker_keys.astype(np.int64) * width + row_match, -1)
+        pair_codes, pair_uniques = pd.factorize(pairs)
+        known = pair_uniques >= 0
+        pair_makers = np.where(known, pair_uniques // width, -1)
+        pair_match = np.where(known, pair_uniques % width, 0)
+        scoped = pd.Series(pair_makers.astype(str), dtype=object) + ":" + pd.Series(
+            np.asarray(match_uniques, dtype=object)[pair_match], dtype=object)
+        keys = self.models.register(scoped.where(known), pd.Series(match_display[pair_match], dtype=object))
+        n_models = len(self.models)
+        if n_models > len(self.model_maker):
+            model_maker = np.full(n_models, -1, dtype=np.int32)
+            model_maker[:len(self.model_maker)] = self.model_maker
+            model_maker[keys[keys >= 0]] = pair_makers[keys >= 0]
+            self.model_maker = model_maker
+        return np.where(pair_codes >= 0, keys[pair_codes], -1).astype(np.int32)
+
+    def maker_table(self):
+        return pd.DataFrame({"제조사키": np.arange(len(self.makers), dtype=np.int32), "제조사": self.makers.names})
+
+    def model_table(self):
+        makers = np.asarray(self.makers.names, dtype=object)
+        return pd.DataFrame({
+            "차명키": np.arange(len(self.models), dtype=np.int32),
+            "제조사키": self.model_maker,
+            "제조사": makers[self.model_maker] if len(makers) else [],
+            "차명": self.models.names,
+        })
+
+
+class VehicleIndex:
+    # 차종별 화재 행의 정수 배열 + 제조사키로 찾는 판매/화재 배열 (점유율 표)
+    def __init__(self, df_car_maker, df_manufac_fire=None, dim=None):
+        self.dim = dim or VehicleDim()
+        # 점유율 표 제조사를 먼저 등록해 제조사키가 점유율 표 순서를 따르게 한다.
+        sales_keys = None
+        if df_manufac_fire is not None:
+            sales_keys = self.dim.maker_keys(df_manufac_fire["제조사"])
+        self.maker = self.dim.maker_keys(df_car_maker["제조사"])
+        self.model = self.dim.model_keys(self.maker, df_car_maker["차명"])
+        self.n_rows = len(df_car_maker)
+        self.n_makers = len(self.dim.makers)
+        self.n_models = len(self.dim.models)
+
+        self.values = {}
+        self.codes = {}
+        for col in CATEGORY_COLUMNS:
+            codes, uniques = pd.factorize(df_car_maker[col], sort=False)
+            self.values[col] = list(uniques)
+            self.codes[col] = codes.astype(np.int16)
+
+        # 제조사키 -> 누적판매/전기차화재 (같은 대표 이름으로 모인 행은 합친다, 점유율 표에 없으면 NaN)
+        self.sales = np.full(self.n_makers, np.nan)
+        self.reported_fires = np.full(self.n_makers, np.nan)
+        if sales_keys is not None:
+            known = sales_keys >= 0
+            has_sales = np.bincount(sales_keys[known], minlength=self.n_makers) > 0
+            for target, col in [(self.sales, "누적판매"), (self.reported_fires, "전기차화재")]:
+                summed = np.bincount(sales_keys[known], weights=df_manufac_fire[col].to_numpy(dtype=float)[known],
+                                     minlength=self.n_makers)
+                target[has_sales] = summed[has_sales]
+        for array in [self.maker, self.model, self.sales, self.reported_fires, *self.codes.values()]:
+            array.flags.writeable = False
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in [self.maker, self.model, self.sales, self.reported_fires, *self.codes.values()])
+
+    def is_value(self, col, values):
+        # 행별 col 값이 values 중 하나인지 (코드 -> 선택 여부 표, 마지막 칸은 결측 코드 -1)
+        lookup = np.zeros(len(self.values[col]) + 1, dtype=bool)
+        lookup[[self.values[col].index(v) for v in values if v in self.values[col]]] = True
+        return lookup[self.codes[col]]
+
+    def maker_counts(self, rows=None):
+        # 제조사키별 화재 건수. rows: 행 선택 (bool 배열)
+        maker = self.maker if rows is None else self.maker[rows]
+        return np.bincount(maker[maker >= 0], minlength=self.n_makers)
+
+    def counts(self, col):
+        # col 값별 건수 (value_counts 와 같은 내림차순)
+        codes = self.codes[col]
+        counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(self.values[col])),
+                           index=pd.Index(self.values[col], name=col), name="count")
+        return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+    def crosstab(self, col):
+        # 제조사 × col 건수 표: (제조사키, 코드) 를 정수 하나로 묶어 bincount 한 번
+        codes = self.codes[col]
+        width = len(self.values[col])
+        valid = (self.maker >= 0) & (codes >= 0)
+        grid = np.bincount(self.maker[valid].astype(np.int64) * width + codes[valid],
+                           minlength=self.n_makers * width).reshape(self.n_makers, width)
+        return pd.DataFrame(grid, index=pd.Index(self.dim.makers.names[:self.n_makers], name="제조사"),
+                            columns=pd.Index(self.values[col], name=col))
+
+    def maker_table(self):
+        # 제조사별 화재 건수(차종별 화재)와 점유율 표의 판매/화재를 제조사키로 이은 표, 판매 10만대당 화재
+        table = self.dim.maker_table().iloc[:self.n_makers]
+        fires = self.maker_counts()
+        table = table.assign(
+            화재건수=fires,
+            고전압배터리=self.maker_counts(self.is_value("최초발화점", ["고전압배터리"])),
+            누적판매=self.sales,
+            전기차화재=self.reported_fires,
+        )
+        table["화재_10만대당"] = (fires / self.sales * 100000).round(2)
+        return table
+
+    def model_table(self):
+        # 차명별 화재 건수 (0건 제외, 많은 순)
+        table = self.dim.model_table().iloc[:self.n_models]
+        table["화재건수"] = np.bincount(self.model[self.model >= 0], minlength=self.n_models)
+        table = table[table["화재건수"] > 0]
+        return table.sort_values("화재건수", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def load_index(path=data_loader.car_maker, sales_path=data_loader.manufac_fire):
+    # 두 표가 바뀌지 않았으면 프로세스 내에서 차원/인덱스를 재사용한다.
+    signature = (data_loader.file_signature(path), data_loader.file_signature(sales_path))
+    return data_loader.memoized(
+        (signature[0][0], "vehicle_index"), signature,
+        lambda: VehicleIndex(data_loader.load_csv(path), data_loader.load_csv(sales_path)),
+    )